@@ -0,0 +1,47 @@
+import sys
+import time
+
+import numpy as np
+
+from Solver_Backends import BACKENDS, get_backend
+from Solver_Model import OPTIMAL, Scenario
+
+# Cubo de preços de MathPlotSolver_Demonstracao_Precificacao.py (passo configurável)
+step = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+demand_scenario = Scenario(
+    process=(1, 1, 1),
+    drive=(1, 1, 1),
+    infrastructure_budget=None,
+    lower_bounds=(0, 0, 0),
+    net_profit=False,
+)
+scenarios = []
+for xb_price in np.arange(50, 201, step):
+    for xp_price in np.arange(60, 301, step):
+        if xp_price <= xb_price:
+            continue
+        for xg_price in np.arange(70, 401, step):
+            if xg_price <= xp_price:
+                continue
+            scenarios.append(demand_scenario.replace(
+                prices=(xb_price, xp_price, xg_price),
+                upper_bounds=(
+                    max(100 - 0.5 * xb_price, 0),
+                    max(80 - 0.3 * xp_price, 0),
+                    max(50 - 0.2 * xg_price, 0),
+                ),
+            ))
+
+print(f"Combinações de preços: {len(scenarios)}")
+print(f"{'Backend':<10}{'tempo (s)':>12}{'resoluções/s':>16}{'divergências':>14}")
+reference = None
+for name in BACKENDS:
+    backend = get_backend(name, fallback=None)
+    start = time.perf_counter()
+    results = backend.solve_batch(scenarios)
+    elapsed = time.perf_counter() - start
+    profits = np.where(results.status == OPTIMAL, results.objectives, np.nan)
+    if reference is None:
+        reference = profits
+    mismatches = int(np.sum(~np.isclose(profits, reference, equal_nan=True)))
+    print(f"{name:<10}{elapsed:>12.3f}{len(scenarios) / elapsed:>16.1f}{mismatches:>14}")
@@ -0,0 +1,85 @@
+"""Tempo de partida a frio dos scripts, com e sem o matplotlib.
+
+Cada script roda num processo novo (como na linha de comando) em três modos:
+``--no-plot`` (só o cálculo, sem importar o matplotlib), ``--output`` (cálculo
+e gráfico gravado com o backend Agg) e a importação do matplotlib sozinha, que
+é o custo que o modo sem gráfico deixa de pagar. O cache de cenários e os
+resultados gravados ficam num diretório temporário para que as execuções não
+se beneficiem de rodadas anteriores.
+
+Uso::
+
+    python Benchmark_Cold_Start.py                    # todos os scripts, 3 repetições
+    python Benchmark_Cold_Start.py Find_Best_Solution_Plot.py --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS = (
+    "Find_Best_Solution_BF.py",
+    "Find_Best_Solution_Plot.py",
+    "Find_Best_Solution_Multiplot_cost.py",
+    "Find_Best_Solution_Multiplot_Infra.py",
+    "Find_Best_Solution_Multiplot_compare.py",
+    "MathPlotSolver_Demonstracao_Precificacao.py",
+    "MathPlotSolver_Demonstracao_Processamento.py",
+    "MathPlotSolver_Demonstracao_Restricao.py",
+)
+PLOTLESS = {"Find_Best_Solution_BF.py"}
+
+
+def run(args, directory):
+    """Executa ``python args...`` num processo novo, com cache isolado; retorna o tempo de parede."""
+    env = dict(os.environ)
+    env["SOLVER_CACHE_PATH"] = os.path.join(directory, "cache.sqlite")
+    env["SWEEP_RESULTS_DIR"] = os.path.join(directory, "sweeps")
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable] + args, env=env, check=True,
+        stdout=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return time.perf_counter() - start
+
+
+def cold_start(script, repeat=3):
+    """Menor tempo (de ``repeat`` execuções) de ``--no-plot`` e de ``--output`` para ``script``."""
+    times = {"no_plot": [], "output": []}
+    for _ in range(repeat):
+        # Diretório novo a cada repetição: nada é lido do cache de uma rodada anterior
+        with tempfile.TemporaryDirectory() as directory:
+            times["no_plot"].append(run([script, "--no-plot"], directory))
+        if script in PLOTLESS:
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            times["output"].append(run([script, "--output", os.path.join(directory, "grafico.png")], directory))
+    return {mode: min(values) if values else None for mode, values in times.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS, help="scripts a medir (padrão: todos)")
+    parser.add_argument("--repeat", type=int, default=3, help="repetições por modo (vale o menor tempo)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = min(run(["-c", "pass"], directory) for _ in range(args.repeat))
+        matplotlib = min(run(["-c", "import matplotlib.pyplot"], directory) for _ in range(args.repeat))
+    print(f"Interpretador vazio: {baseline:.3f} s, importação do matplotlib.pyplot: {matplotlib - baseline:.3f} s")
+    print(f"{'Script':<46}{'--no-plot (s)':>15}{'--output (s)':>15}{'diferença (s)':>15}")
+    for script in args.scripts:
+        times = cold_start(script, args.repeat)
+        if times["output"] is None:
+            print(f"{script:<46}{times['no_plot']:>15.3f}{'-':>15}{'-':>15}")
+        else:
+            print(
+                f"{script:<46}{times['no_plot']:>15.3f}{times['output']:>15.3f}"
+                f"{times['output'] - times['no_plot']:>15.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Escalabilidade do modelo matricial de 3 a 1000 pacotes.
+
+Para cada número de pacotes gera uma instância aleatória (semente fixa) com
+quatro recursos (processamento, armazenamento, banda e orçamento), consumo
+esparso e limites superiores por pacote, e mede:
+
+- montagem escalar: ``sum(a * q ...)`` por recurso, como nos scripts;
+- montagem matricial: ``build_matrix_model`` a partir da matriz CSR;
+- resolução com o CBC (PuLP) e com o HiGHS (SciPy, matriz esparsa), com limite de tempo.
+
+Uso::
+
+    python Benchmark_Matrix_Scaling.py                     # 3, 10, 30, 100, 300 e 1000 pacotes
+    python Benchmark_Matrix_Scaling.py --tiers 3,100 --density 0.1 --time-limit 5
+"""
+import argparse
+import time
+
+import numpy as np
+from pulp import LpMaximize, LpProblem, LpVariable
+
+from Solver_Matrix import MatrixScenario, build_matrix_model, milp, solve_matrix
+
+RESOURCES = ("processing", "storage", "bandwidth", "infrastructure_budget")
+
+
+def random_scenario(tiers, density=0.3, seed=0):
+    """Instância aleatória com ``tiers`` pacotes; cada pacote consome pelo menos um recurso."""
+    rng = np.random.default_rng(seed)
+    prices = rng.uniform(50, 500, tiers).round()
+    costs = (prices * rng.uniform(0.3, 0.8, tiers)).round()
+    consumption = np.where(rng.random((len(RESOURCES), tiers)) < density, rng.integers(1, 11, (len(RESOURCES), tiers)), 0)
+    consumption[rng.integers(0, len(RESOURCES), tiers), np.arange(tiers)] = rng.integers(1, 11, tiers)
+    consumption[-1] = costs  # O orçamento consome o custo de infraestrutura de cada pacote
+    upper = rng.integers(5, 50, tiers)
+    # Capacidades para cerca de 30% das quantidades máximas: as restrições ficam ativas
+    capacities = 0.3 * consumption @ upper
+    return MatrixScenario(
+        prices, consumption, capacities, infrastructure_costs=costs, upper_bounds=upper,
+        tier_names=[f"{j}" for j in range(tiers)], resource_names=RESOURCES,
+    )
+
+
+def build_scalar(scenario):
+    """Montagem com expressões escalares, termo a termo (padrão dos scripts)."""
+    model = LpProblem(name="maximize-profit", sense=LpMaximize)
+    dense = scenario.consumption.toarray() if hasattr(scenario.consumption, "toarray") else scenario.consumption
+    variables = [
+        LpVariable(f"q_{name}", lowBound=0, upBound=float(up), cat="Integer")
+        for name, up in zip(scenario.tier_names, scenario.upper_bounds)
+    ]
+    model += sum(c * q for c, q in zip(scenario.objective_coefficients(), variables))
+    for name, row, capacity in zip(scenario.resource_names, dense, scenario.capacities):
+        if row.any():
+            model += sum(a * q for a, q in zip(row, variables) if a) <= float(capacity), name
+    return model
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escalabilidade do modelo matricial")
+    parser.add_argument("--tiers", default="3,10,30,100,300,1000", help="números de pacotes, separados por vírgula")
+    parser.add_argument("--density", type=float, default=0.3, help="fração de consumos não nulos")
+    parser.add_argument("--time-limit", type=float, default=10, help="limite de cada resolução (s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'pacotes':>8}{'não nulos':>11}{'escalar (s)':>13}{'matricial (s)':>15}"
+          f"{'CBC (s)':>10}{'HiGHS (s)':>11}{'lucro CBC':>14}{'lucro HiGHS':>14}")
+    for tiers in (int(value) for value in args.tiers.split(",")):
+        scenario = random_scenario(tiers, args.density)
+        scalar, _ = timed(build_scalar, scenario)
+        matrix, _ = timed(build_matrix_model, scenario)
+        cbc_time, cbc = timed(solve_matrix, scenario, "cbc", args.time_limit)
+        if milp is not None:
+            highs_time, highs = timed(solve_matrix, scenario, "highs", args.time_limit)
+        else:
+            highs_time, highs = float("nan"), None
+        nonzero = scenario.consumption.nnz if hasattr(scenario.consumption, "nnz") else np.count_nonzero(scenario.consumption)
+        print(f"{tiers:>8}{nonzero:>11}{scalar:>13.4f}{matrix:>15.4f}{cbc_time:>10.3f}{highs_time:>11.3f}"
+              f"{(cbc.objective if cbc.objective is not None else float('nan')):>14.1f}"
+              f"{(highs.objective if highs is not None and highs.objective is not None else float('nan')):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
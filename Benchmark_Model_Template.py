@@ -0,0 +1,54 @@
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from Solver_Model import PricingModel, Scenario, build_model, solve_rebuild
+
+# Pontos da grade preço base x custo de infraestrutura base (Find_Best_Solution_Multiplot_compare.py)
+step = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+scenarios = [
+    Scenario.from_base(base_price, base_infrastructure_cost)
+    for base_price in np.arange(50, 201, step)
+    for base_infrastructure_cost in np.arange(50, 201, step)
+]
+
+
+def per_point(function):
+    latencies = []
+    results = []
+    for scenario in scenarios:
+        start = time.perf_counter()
+        results.append(function(scenario))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+# Custo de montar as expressões do PuLP (sem resolver)
+build_latencies = []
+template = PricingModel()
+update_latencies = []
+for scenario in scenarios:
+    start = time.perf_counter()
+    build_model(scenario)
+    build_latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    template.update(scenario)
+    update_latencies.append(time.perf_counter() - start)
+
+rebuild_latencies, rebuild_results = per_point(solve_rebuild)
+template = PricingModel()
+template_latencies, template_results = per_point(template.solve)
+
+assert [r.objective for r in rebuild_results] == [r.objective for r in template_results]
+
+print(f"Pontos: {len(scenarios)}")
+print(f"{'Etapa':<32}{'média (ms)':>12}{'mediana (ms)':>14}")
+for label, latencies in [
+    ("Montar modelo do zero", build_latencies),
+    ("Atualizar coeficientes", update_latencies),
+    ("Reconstruir + resolver", rebuild_latencies),
+    ("Template + resolver", template_latencies),
+]:
+    print(f"{label:<32}{1000 * statistics.mean(latencies):>12.3f}{1000 * statistics.median(latencies):>14.3f}")
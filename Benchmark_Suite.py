@@ -0,0 +1,261 @@
+"""Suíte de benchmarks com as cargas de todos os scripts de varredura.
+
+Cada carga reproduz os cenários de um script (sem gráficos) numa resolução
+configurável: o divisor ``size`` divide o passo original (``size=1`` é a grade
+dos scripts, ``size=2`` tem o dobro de pontos por eixo). Para cada carga e
+tamanho são medidos: resoluções por segundo, tempo de montagem (criação dos
+cenários e troca dos coeficientes do modelo), tempo do solver, pico de memória
+alocada pelo Python (tracemalloc, numa execução separada para não distorcer
+os tempos; o subprocesso do CBC não entra) e tempo total.
+
+Uso::
+
+    python Benchmark_Suite.py                          # todas as cargas na grade dos scripts, CBC
+    python Benchmark_Suite.py --backend highs --sizes 1,2,4 --save baseline.json
+    python Benchmark_Suite.py --compare baseline.json  # aponta regressões (código de saída 1)
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pulp
+
+from Solver_Backends import BACKENDS, get_backend
+from Solver_Model import PricingModel, Scenario
+
+
+def _steps(start, stop, step, size):
+    return np.arange(start, stop + 1e-9, step / size)
+
+
+def bf(size):
+    # Find_Best_Solution_BF.py: um único modelo (receita, com orçamento), repetido ``size`` vezes
+    return [Scenario(net_profit=False)] * size
+
+
+def plot(size):
+    # Find_Best_Solution_Plot.py: custo de infraestrutura e preço base variando separadamente
+    values = _steps(50, 200, 10, size)
+    return [Scenario.from_base(100, cost) for cost in values] + [Scenario.from_base(price, 100) for price in values]
+
+
+def multiplot_cost(size):
+    # Find_Best_Solution_Multiplot_cost.py: preço de cada pacote variando
+    fixed = Scenario.from_base(100, 100)
+    values = _steps(50, 200, 10, size)
+    return (
+        [fixed.replace(prices=(price, 200, 300)) for price in values]
+        + [fixed.replace(prices=(100, 2 * price, 300)) for price in values]
+        + [fixed.replace(prices=(100, 200, 3 * price)) for price in values]
+    )
+
+
+def multiplot_infra(size):
+    # Find_Best_Solution_Multiplot_Infra.py: custo de infraestrutura de cada pacote variando
+    fixed = Scenario.from_base(100, 100)
+    values = _steps(50, 200, 10, size)
+    return (
+        [fixed.replace(infrastructure_costs=(cost, 150.0, 200)) for cost in values]
+        + [fixed.replace(infrastructure_costs=(100, cost, 200)) for cost in values]
+        + [fixed.replace(infrastructure_costs=(100, 150.0, cost)) for cost in values]
+    )
+
+
+def multiplot_compare(size):
+    # Find_Best_Solution_Multiplot_compare.py: grade preço base x custo de infraestrutura base
+    values = _steps(50, 200, 10, size)
+    return [Scenario.from_base(price, cost) for price in values for cost in values]
+
+
+def precificacao(size):
+    # MathPlotSolver_Demonstracao_Precificacao.py: cubo de preços com demanda linear
+    demand_scenario = Scenario(
+        process=(1, 1, 1), drive=(1, 1, 1), infrastructure_budget=None, lower_bounds=(0, 0, 0), net_profit=False
+    )
+    scenarios = []
+    for xb_price in _steps(50, 200, 10, size):
+        for xp_price in _steps(60, 300, 10, size):
+            if xp_price <= xb_price:
+                continue
+            for xg_price in _steps(70, 400, 10, size):
+                if xg_price <= xp_price:
+                    continue
+                scenarios.append(demand_scenario.replace(
+                    prices=(xb_price, xp_price, xg_price),
+                    upper_bounds=(
+                        max(100 - 0.5 * xb_price, 0), max(80 - 0.3 * xp_price, 0), max(50 - 0.2 * xg_price, 0)
+                    ),
+                ))
+    return scenarios
+
+
+def processamento(size):
+    # MathPlotSolver_Demonstracao_Processamento.py: cubo de horas de processamento
+    processing_scenario = Scenario(
+        prices=(1000, 2000, 3000), drive=(1, 1, 1), infrastructure_budget=None, net_profit=False
+    )
+    scenarios = []
+    for xb_process in _steps(1, 10, 1, size):
+        for xp_process in _steps(2, 20, 1, size):
+            if xp_process <= xb_process:
+                continue
+            for xg_process in _steps(3, 30, 1, size):
+                if xg_process <= xp_process:
+                    continue
+                scenarios.append(processing_scenario.replace(process=(xb_process, xp_process, xg_process)))
+    return scenarios
+
+
+def restricao(size):
+    # MathPlotSolver_Demonstracao_Restricao.py: horas de processamento 1x/2x/3x variando
+    restriction_scenario = Scenario.from_base(100, 100, infrastructure_budget=None, net_profit=False)
+    return [restriction_scenario.replace(process=(h, 2 * h, 3 * h)) for h in _steps(1, 10, 1, size)]
+
+
+WORKLOADS = {
+    "bf": bf,
+    "plot": plot,
+    "multiplot_cost": multiplot_cost,
+    "multiplot_infra": multiplot_infra,
+    "multiplot_compare": multiplot_compare,
+    "precificacao": precificacao,
+    "processamento": processamento,
+    "restricao": restricao,
+}
+
+
+def run_workload(workload, size, backend="cbc"):
+    """Executa uma carga e retorna (pontos, montagem, solver, total) em segundos."""
+    start = time.perf_counter()
+    scenarios = WORKLOADS[workload](size)
+    build = time.perf_counter() - start
+    solve = 0.0
+    if backend == "cbc":
+        # Mesmo caminho dos scripts: um PricingModel reaproveitado, coeficientes trocados a cada ponto
+        model = PricingModel()
+        for scenario in scenarios:
+            started = time.perf_counter()
+            model.update(scenario)
+            updated = time.perf_counter()
+            model.solve(scenario)
+            build += updated - started
+            solve += time.perf_counter() - updated
+    else:
+        started = time.perf_counter()
+        get_backend(backend, fallback=None).solve_batch(scenarios)
+        solve = time.perf_counter() - started
+    return len(scenarios), build, solve, time.perf_counter() - start
+
+
+def measure(workload, size, backend="cbc", repeat=1):
+    """Mede uma carga: melhor tempo em ``repeat`` execuções e pico de memória numa execução à parte."""
+    runs = [run_workload(workload, size, backend) for _ in range(repeat)]
+    points, build, solve, wall = min(runs, key=lambda run: run[3])
+    tracemalloc.start()
+    run_workload(workload, size, backend)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "workload": workload,
+        "size": size,
+        "points": points,
+        "solves_per_second": points / wall if wall > 0 else float("inf"),
+        "build_seconds": build,
+        "solve_seconds": solve,
+        "peak_memory_mb": peak / 2**20,
+        "wall_seconds": wall,
+    }
+
+
+def environment(backend):
+    return {
+        "backend": backend,
+        "python": platform.python_version(),
+        "pulp": pulp.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def print_table(results, baseline=None):
+    reference = {(row["workload"], row["size"]): row for row in (baseline or [])}
+    header = (f"{'Carga':<19}{'tam.':>5}{'pontos':>8}{'res./s':>10}{'montagem':>10}"
+              f"{'solver':>10}{'mem. MB':>9}{'total (s)':>11}")
+    if baseline is not None:
+        header += f"{'vs base':>9}"
+    print(header)
+    for row in results:
+        line = (f"{row['workload']:<19}{row['size']:>5}{row['points']:>8}{row['solves_per_second']:>10.1f}"
+                f"{row['build_seconds']:>10.3f}{row['solve_seconds']:>10.3f}{row['peak_memory_mb']:>9.1f}"
+                f"{row['wall_seconds']:>11.3f}")
+        base = reference.get((row["workload"], row["size"]))
+        if base is not None:
+            line += f"{row['wall_seconds'] / base['wall_seconds']:>8.2f}x"
+        print(line)
+
+
+def regressions(results, baseline, threshold, min_seconds=0.05):
+    """Cargas cujo tempo total piorou mais que ``threshold`` (fração) em relação à linha de base.
+
+    Diferenças menores que ``min_seconds`` são ignoradas (ruído das cargas muito curtas).
+    """
+    reference = {(row["workload"], row["size"]): row for row in baseline}
+    slower = []
+    for row in results:
+        base = reference.get((row["workload"], row["size"]))
+        if base is None or row["wall_seconds"] - base["wall_seconds"] < min_seconds:
+            continue
+        if row["wall_seconds"] > base["wall_seconds"] * (1 + threshold):
+            slower.append((row["workload"], row["size"], row["wall_seconds"] / base["wall_seconds"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="cargas separadas por vírgula")
+    parser.add_argument("--sizes", default="1", help="divisores do passo original, separados por vírgula")
+    parser.add_argument("--backend", default="cbc", choices=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=1, help="execuções por medida (vale a mais rápida)")
+    parser.add_argument("--save", help="grava os resultados como linha de base (JSON)")
+    parser.add_argument("--compare", help="compara com uma linha de base gravada com --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="piora tolerada no tempo total (fração)")
+    args = parser.parse_args(argv)
+
+    workloads = args.workloads.split(",")
+    for workload in workloads:
+        if workload not in WORKLOADS:
+            parser.error(f"carga desconhecida: {workload!r} (opções: {', '.join(WORKLOADS)})")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            saved = json.load(file)
+        if saved["environment"]["backend"] != args.backend:
+            print(f"Aviso: linha de base gravada com o backend {saved['environment']['backend']}")
+        baseline = saved["results"]
+
+    results = [measure(workload, size, args.backend, args.repeat) for workload in workloads for size in sizes]
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"environment": environment(args.backend), "results": results}, file, indent=2)
+        print(f"Linha de base gravada em {args.save}")
+
+    if baseline is not None:
+        slower = regressions(results, baseline, args.threshold)
+        for workload, size, ratio in slower:
+            print(f"Regressão: {workload} (tamanho {size}) {ratio:.2f}x mais lento")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from pulp import LpMaximize, LpProblem, LpVariable, lpSum
+from Solver_Cache import ScenarioCache
+from Solver_Model import OPTIMAL, PricingModel, Scenario
 
 # Variáveis de configuração
 base_price = 100  # Preço base para o Pacote Básico
@@ -20,41 +21,46 @@ xb_infrastructure_cost = base_infrastructure_cost
 xp_infrastructure_cost = 1.5 * base_infrastructure_cost  # Pacote Padrão custa 1.5x o Pacote Básico
 xg_infrastructure_cost = 2 * base_infrastructure_cost    # Pacote Premium custa 2x o Pacote Básico
 
-# Definir o problema de maximização do lucro
-model = LpProblem(name="maximize-profit", sense=LpMaximize)
+# Modelo de maximização do lucro total (receita), com as restrições de capacidade
+# (300 horas de processamento, 450 de armazenamento) e orçamento de infraestrutura de 150000
+scenario = Scenario(
+    prices=(xb_price, xp_price, xg_price),
+    infrastructure_costs=(xb_infrastructure_cost, xp_infrastructure_cost, xg_infrastructure_cost),
+    process=(xb_process, xp_process, xg_process),
+    drive=(xb_drive, xp_drive, xg_drive),
+    processing_capacity=300,
+    storage_capacity=450,
+    infrastructure_budget=150000,
+    lower_bounds=(30, 0, 0),  # Demanda mínima de 30 pacotes básicos
+    upper_bounds=(None, None, 15),  # Máximo de 15 pacotes premium
+    net_profit=False,
+)
 
-# Variáveis de decisão para as quantidades de pacotes vendidas
-q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")  # Demanda mínima de 30 pacotes básicos
-q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")  # Máximo de 15 pacotes premium
 
-# Definir a função objetivo (Maximizar o lucro total com as quantidades e preços)
-model += q_basic * xb_price + q_standard * xp_price + q_premium * xg_price, "Total Profit"
+def compute(model=None):
+    """Resolve o cenário (cenários já resolvidos são lidos do cache em disco)."""
+    model = model if model is not None else PricingModel(cache=ScenarioCache())
+    return {"solution": model.solve(scenario)}
 
-# Restrições de capacidade
-model += (xb_process * q_basic + xp_process * q_standard + xg_process * q_premium) <= 300  # Horas de processamento
-model += (xb_drive * q_basic + xp_drive * q_standard + xg_drive * q_premium) <= 450  # Capacidade de armazenamento
 
-# Restrição de custo de infraestrutura total
-total_infrastructure_cost = (
-    q_basic * xb_infrastructure_cost +
-    q_standard * xp_infrastructure_cost +
-    q_premium * xg_infrastructure_cost
-)
-model += total_infrastructure_cost <= 150000
-
-# Resolver o problema
-model.solve()
-
-# Exibir os melhores resultados encontrados
-if model.status == 1:  # Status 1 significa que foi encontrada uma solução ótima
-    print("Lucro Máximo:", model.objective.value())
-    print("Melhor Configuração de Preços e Quantidades:")
-    print("Preço do Pacote Básico (xb):", xb_price)
-    print("Preço do Pacote Padrão (xp):", xp_price)
-    print("Preço do Pacote Premium (xg):", xg_price)
-    print("Quantidades Vendidas - Básico:", q_basic.value(), 
-          "Padrão:", q_standard.value(), 
-          "Premium:", q_premium.value())
-else:
-    print("Não foi encontrada uma solução que satisfaça todas as restrições.")
+def report(results):
+    solution = results["solution"]
+
+    # Exibir os melhores resultados encontrados
+    if solution.status == OPTIMAL:  # Status 1 significa que foi encontrada uma solução ótima
+        q_basic, q_standard, q_premium = solution.quantities
+        print("Lucro Máximo:", solution.objective)
+        print("Melhor Configuração de Preços e Quantidades:")
+        print("Preço do Pacote Básico (xb):", xb_price)
+        print("Preço do Pacote Padrão (xp):", xp_price)
+        print("Preço do Pacote Premium (xg):", xg_price)
+        print("Quantidades Vendidas - Básico:", q_basic, 
+              "Padrão:", q_standard, 
+              "Premium:", q_premium)
+    else:
+        print("Não foi encontrada uma solução que satisfaça todas as restrições.")
+
+
+if __name__ == "__main__":
+    # Sem gráfico: apenas calcula e imprime
+    report(compute())
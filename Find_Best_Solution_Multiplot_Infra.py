@@ -1,115 +1,80 @@
-import matplotlib.pyplot as plt
-from pulp import LpMaximize, LpProblem, LpVariable, value
+from Solver_Cache import ScenarioCache
+from Solver_Model import PricingModel, Scenario
+from Solver_Plotting import finish, main, pyplot
+from Solver_Profiling import PhaseTimer, instrument
+from Solver_Sweep import sweep
 
 # Configurações de faixa para o custo de infraestrutura base
 base_infrastructure_costs = range(50, 201, 10)  # Intervalo de custos base de infraestrutura de 50 a 200 com passo de 10
 
-# Listas para armazenar os lucros para cada tipo de produto
-profits_infrastructure_basic = []
-profits_infrastructure_standard = []
-profits_infrastructure_premium = []
-
-# Análise de sensibilidade: variando o custo de infraestrutura do Pacote Básico
+# Preços dos pacotes fixos (1x, 2x e 3x do preço base)
 fixed_base_price = 100
-for base_infrastructure_cost in base_infrastructure_costs:
-    # Preços dos pacotes fixos
-    xb_price = fixed_base_price
-    xp_price = 2 * fixed_base_price
-    xg_price = 3 * fixed_base_price
-
-    # Custos de infraestrutura variando apenas para o Pacote Básico
-    xb_infrastructure_cost = base_infrastructure_cost
-    xp_infrastructure_cost = 1.5 * 100  # Fixando o custo de infraestrutura do Padrão
-    xg_infrastructure_cost = 2 * 100  # Fixando o custo de infraestrutura do Premium
-
-    # Definir o problema de maximização do lucro
-    model = LpProblem(name="maximize-profit", sense=LpMaximize)
-
-    # Variáveis de decisão para as quantidades de pacotes vendidas
-    q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")
-    q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-    q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")
-
-    # Cálculo do custo total de infraestrutura com as variáveis de quantidade
-    total_infrastructure_cost = (
-        q_basic * xb_infrastructure_cost +
-        q_standard * xp_infrastructure_cost +
-        q_premium * xg_infrastructure_cost
+fixed_scenario = Scenario.from_base(fixed_base_price, 100)
+
+# Com SOLVER_PROFILE=1 o tempo de cada fase das resoluções e do gráfico é medido
+timer = PhaseTimer.from_environment()
+
+
+def compute(model=None):
+    """Lucros com o custo de infraestrutura de cada pacote variando (os demais fixos)."""
+    # Modelo construído uma única vez e reaproveitado em todas as análises;
+    # pontos já resolvidos em execuções anteriores vêm do cache em disco
+    template = instrument(model if model is not None else PricingModel(cache=ScenarioCache()), timer)
+
+    # Análise de sensibilidade: variando o custo de infraestrutura do Pacote Básico
+    # (Padrão fixo em 1.5 * 100 e Premium em 2 * 100); cada varredura parte da solução
+    # dos pontos vizinhos e só chama o solver onde ela pode mudar
+    basic_sweep = sweep(
+        [fixed_scenario.replace(infrastructure_costs=(cost, 1.5 * 100, 2 * 100)) for cost in base_infrastructure_costs],
+        template,
     )
 
-    # Definir a função objetivo (Maximizar o lucro líquido: lucro total - custo de infraestrutura)
-    model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price) - total_infrastructure_cost, "Net Profit"
-
-    # Restrições de capacidade
-    model += (1 * q_basic + 2 * q_standard + 3 * q_premium) <= 300  # Horas de processamento
-    model += (2 * q_basic + 3 * q_standard + 4 * q_premium) <= 450  # Capacidade de armazenamento
-
-    # Limite para o custo de infraestrutura total (restrição de orçamento)
-    model += total_infrastructure_cost <= 150000
-
-    # Resolver o problema
-    model.solve()
-
-    # Armazenar o lucro para esta configuração
-    profits_infrastructure_basic.append(value(model.objective) if model.status == 1 else 0)
-
-# Repetir a análise de sensibilidade para o custo de infraestrutura do Pacote Padrão
-for base_infrastructure_cost in base_infrastructure_costs:
-    xb_infrastructure_cost = 100  # Fixando o custo de infraestrutura do Básico
-    xp_infrastructure_cost = base_infrastructure_cost
-    xg_infrastructure_cost = 2 * 100  # Fixando o custo de infraestrutura do Premium
-
-    model = LpProblem(name="maximize-profit", sense=LpMaximize)
-    q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")
-    q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-    q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")
-    
-    total_infrastructure_cost = (
-        q_basic * xb_infrastructure_cost +
-        q_standard * xp_infrastructure_cost +
-        q_premium * xg_infrastructure_cost
+    # Repetir a análise de sensibilidade para o custo de infraestrutura do Pacote Padrão
+    standard_sweep = sweep(
+        [fixed_scenario.replace(infrastructure_costs=(100, cost, 2 * 100)) for cost in base_infrastructure_costs],
+        template,
     )
 
-    model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price) - total_infrastructure_cost, "Net Profit"
-    model += (1 * q_basic + 2 * q_standard + 3 * q_premium) <= 300
-    model += (2 * q_basic + 3 * q_standard + 4 * q_premium) <= 450
-    model += total_infrastructure_cost <= 150000
-
-    model.solve()
-    profits_infrastructure_standard.append(value(model.objective) if model.status == 1 else 0)
-
-# Repetir a análise de sensibilidade para o custo de infraestrutura do Pacote Premium
-for base_infrastructure_cost in base_infrastructure_costs:
-    xb_infrastructure_cost = 100  # Fixando o custo de infraestrutura do Básico
-    xp_infrastructure_cost = 1.5 * 100  # Fixando o custo de infraestrutura do Padrão
-    xg_infrastructure_cost = base_infrastructure_cost
-
-    model = LpProblem(name="maximize-profit", sense=LpMaximize)
-    q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")
-    q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-    q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")
-    
-    total_infrastructure_cost = (
-        q_basic * xb_infrastructure_cost +
-        q_standard * xp_infrastructure_cost +
-        q_premium * xg_infrastructure_cost
+    # Repetir a análise de sensibilidade para o custo de infraestrutura do Pacote Premium
+    premium_sweep = sweep(
+        [fixed_scenario.replace(infrastructure_costs=(100, 1.5 * 100, cost)) for cost in base_infrastructure_costs],
+        template,
     )
 
-    model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price) - total_infrastructure_cost, "Net Profit"
-    model += (1 * q_basic + 2 * q_standard + 3 * q_premium) <= 300
-    model += (2 * q_basic + 3 * q_standard + 4 * q_premium) <= 450
-    model += total_infrastructure_cost <= 150000
-
-    model.solve()
-    profits_infrastructure_premium.append(value(model.objective) if model.status == 1 else 0)
-
-# Plotar os gráficos de linha para cada tipo de pacote com variação do custo de infraestrutura
-plt.figure(figsize=(10, 6))
-plt.plot(base_infrastructure_costs, profits_infrastructure_basic, label="Lucro vs Custo Infraestrutura Básico", marker='o')
-plt.plot(base_infrastructure_costs, profits_infrastructure_standard, label="Lucro vs Custo Infraestrutura Padrão", marker='o')
-plt.plot(base_infrastructure_costs, profits_infrastructure_premium, label="Lucro vs Custo Infraestrutura Premium", marker='o')
-plt.xlabel("Custo de Infraestrutura Base")
-plt.ylabel("Lucro Máximo")
-plt.title("Variação do Lucro Máximo com Custo de Infraestrutura de Cada Pacote")
-plt.legend()
-plt.show()
+    # Lucros para cada tipo de produto (0 onde nenhuma solução foi encontrada)
+    return {
+        "profits_infrastructure_basic": basic_sweep.profits(default=0),
+        "profits_infrastructure_standard": standard_sweep.profits(default=0),
+        "profits_infrastructure_premium": premium_sweep.profits(default=0),
+        "sweeps": {"Básico": basic_sweep, "Padrão": standard_sweep, "Premium": premium_sweep},
+    }
+
+
+def report(results):
+    for name, result in results["sweeps"].items():
+        print(f"Custo de infraestrutura do {name}: {result.summary()}")
+
+
+def render(results, output=None):
+    with timer.phase("plot"):
+        plt = pyplot(output)
+
+        # Plotar os gráficos de linha para cada tipo de pacote com variação do custo de infraestrutura
+        plt.figure(figsize=(10, 6))
+        plt.plot(base_infrastructure_costs, results["profits_infrastructure_basic"], label="Lucro vs Custo Infraestrutura Básico", marker='o')
+        plt.plot(base_infrastructure_costs, results["profits_infrastructure_standard"], label="Lucro vs Custo Infraestrutura Padrão", marker='o')
+        plt.plot(base_infrastructure_costs, results["profits_infrastructure_premium"], label="Lucro vs Custo Infraestrutura Premium", marker='o')
+        plt.xlabel("Custo de Infraestrutura Base")
+        plt.ylabel("Lucro Máximo")
+        plt.title("Variação do Lucro Máximo com Custo de Infraestrutura de Cada Pacote")
+        plt.legend()
+        if timer.enabled:
+            plt.gcf().canvas.draw()  # Renderiza aqui para que o desenho entre na fase plot
+
+    # Tempos por fase (apenas com SOLVER_PROFILE=1)
+    timer.report()
+    finish(plt, output)
+
+
+if __name__ == "__main__":
+    main(compute, render, report, description="Lucro vs custo de infraestrutura de cada pacote")
@@ -1,74 +1,98 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from pulp import LpMaximize, LpProblem, LpVariable, value
+
+from Solver_Adaptive import adaptive_surface
+from Solver_Backends import get_backend
+from Solver_Cache import ScenarioCache
+from Solver_Model import Scenario
+from Solver_Parallel import solve_grid
+from Solver_Plotting import finish, main, pyplot
 
 # Definir intervalos para preço base e custo de infraestrutura base
 base_prices = np.arange(50, 201, 10)  # Preço base de 50 a 200
 infrastructure_costs = np.arange(50, 201, 10)  # Custo de infraestrutura base de 50 a 200
 
-# Matrizes para armazenar os lucros para as combinações de preço base e custo de infraestrutura
-profits = np.zeros((len(base_prices), len(infrastructure_costs)))
-
-# Loop sobre todas as combinações de preço base e custo de infraestrutura base
-for i, base_price in enumerate(base_prices):
-    for j, base_infrastructure_cost in enumerate(infrastructure_costs):
-        # Preços dos pacotes com base no preço base atual
-        xb_price = base_price
-        xp_price = 2 * base_price
-        xg_price = 3 * base_price
-
-        # Custos de infraestrutura dos pacotes com base no custo de infraestrutura atual
-        xb_infrastructure_cost = base_infrastructure_cost
-        xp_infrastructure_cost = 1.5 * base_infrastructure_cost
-        xg_infrastructure_cost = 2 * base_infrastructure_cost
-
-        # Definir o problema de maximização do lucro
-        model = LpProblem(name="maximize-profit", sense=LpMaximize)
-
-        # Variáveis de decisão para as quantidades de pacotes vendidas
-        q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")
-        q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-        q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")
-
-        # Cálculo do custo total de infraestrutura com as variáveis de quantidade
-        total_infrastructure_cost = (
-            q_basic * xb_infrastructure_cost +
-            q_standard * xp_infrastructure_cost +
-            q_premium * xg_infrastructure_cost
+
+def make_scenario(base_price, base_infrastructure_cost):
+    # Preços 1x/2x/3x do preço base e custos 1x/1.5x/2x do custo de infraestrutura base
+    return Scenario.from_base(base_price, base_infrastructure_cost)
+
+
+def compute(adaptive=False, cache=None, backend=None):
+    """Matriz de lucros (preço base x custo de infraestrutura base) e os eixos usados.
+
+    Com ``adaptive``, amostra uma faixa bem maior (10 a 400) com o mesmo número
+    de resoluções da grade fixa (16 x 16), usando ``backend`` (por padrão, o
+    CBC); senão, resolve a grade fixa em paralelo. ``cache`` é o
+    ``ScenarioCache`` compartilhado (por padrão, o arquivo padrão em disco).
+    """
+    cache = cache if cache is not None else ScenarioCache()
+    if adaptive:
+        # Só as células em que o mix ótimo muda são subdivididas
+        backend = backend if backend is not None else get_backend("cbc", cache=cache)
+        sampled = adaptive_surface(
+            make_scenario, (10, 400), (10, 400), max_depth=5, max_solves=256, solve_batch=backend.solve_batch
         )
+        axis = np.linspace(10, 400, 157)
+        return {
+            "base_prices": axis,
+            "infrastructure_costs": axis,
+            "profits": sampled.surface(axis, axis),
+            "sampled": sampled,
+            "failed": 0,
+        }
+
+    # Resolver todas as combinações de preço base e custo de infraestrutura base em paralelo
+    # (um processo por núcleo, cada um com o seu modelo reaproveitado e o cache em disco compartilhado)
+    grid = solve_grid(make_scenario, (base_prices, infrastructure_costs), cache=cache)
+
+    # Matriz de lucros para as combinações (0 onde nenhuma solução foi encontrada)
+    return {
+        "base_prices": base_prices,
+        "infrastructure_costs": infrastructure_costs,
+        "profits": grid.profits(default=0),
+        "sampled": None,
+        "failed": grid.failed,
+    }
+
 
-        # Definir a função objetivo (Maximizar o lucro líquido: lucro total - custo de infraestrutura)
-        model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price) - total_infrastructure_cost, "Net Profit"
+def report(results):
+    if results["sampled"] is not None:
+        print(f"Pontos resolvidos: {results['sampled'].solves}, células: {len(results['sampled'].cells)}")
+    if results["failed"]:
+        print(f"Pontos não resolvidos (falha ou tempo esgotado): {results['failed']}")
 
-        # Restrições de capacidade
-        model += (1 * q_basic + 2 * q_standard + 3 * q_premium) <= 300  # Horas de processamento
-        model += (2 * q_basic + 3 * q_standard + 4 * q_premium) <= 450  # Capacidade de armazenamento
 
-        # Limite para o custo de infraestrutura total (restrição de orçamento)
-        model += total_infrastructure_cost <= 150000
+def render(results, output=None):
+    plt = pyplot(output)
 
-        # Resolver o problema
-        model.solve()
+    # Plotar o gráfico de superfície 3D (o pyplot registra a projeção '3d')
+    X, Y = np.meshgrid(results["base_prices"], results["infrastructure_costs"])
+    Z = results["profits"].T  # Transpor para alinhar as dimensões
+    sampled = results["sampled"]
 
-        # Armazenar o lucro para esta combinação
-        if model.status == 1:  # Solução ótima encontrada
-            profits[i, j] = value(model.objective)
-        else:
-            profits[i, j] = 0  # Nenhuma solução encontrada para esta configuração
+    fig = plt.figure(figsize=(12, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    surf = ax.plot_surface(X, Y, Z, cmap='viridis', edgecolor='k' if sampled is None else 'none')
+    if sampled is not None:
+        # Pontos efetivamente resolvidos (mais densos nas cristas da superfície)
+        points = sampled.points
+        ax.scatter(points[:, 0], points[:, 1], np.nan_to_num(sampled.objectives), color='k', s=4)
 
-# Plotar o gráfico de superfície 3D
-X, Y = np.meshgrid(base_prices, infrastructure_costs)
-Z = profits.T  # Transpor para alinhar as dimensões
+    # Personalizar o gráfico
+    ax.set_xlabel("Preço Base")
+    ax.set_ylabel("Custo de Infraestrutura Base")
+    ax.set_zlabel("Lucro Máximo")
+    ax.set_title("Impacto do Preço Base e Custo de Infraestrutura Base no Lucro Máximo")
+    fig.colorbar(surf, ax=ax, shrink=0.5, aspect=5, label="Lucro Máximo")
+    finish(plt, output)
 
-fig = plt.figure(figsize=(12, 8))
-ax = fig.add_subplot(111, projection='3d')
-surf = ax.plot_surface(X, Y, Z, cmap='viridis', edgecolor='k')
 
-# Personalizar o gráfico
-ax.set_xlabel("Preço Base")
-ax.set_ylabel("Custo de Infraestrutura Base")
-ax.set_zlabel("Lucro Máximo")
-ax.set_title("Impacto do Preço Base e Custo de Infraestrutura Base no Lucro Máximo")
-fig.colorbar(surf, ax=ax, shrink=0.5, aspect=5, label="Lucro Máximo")
-plt.show()
+if __name__ == "__main__":
+    main(
+        compute, render, report,
+        description="Superfície de lucro: preço base x custo de infraestrutura base",
+        configure=lambda parser: parser.add_argument(
+            "--adaptive", action="store_true", help="amostragem adaptativa numa faixa maior (10 a 400)"
+        ),
+        options=lambda args: {"adaptive": args.adaptive},
+    )
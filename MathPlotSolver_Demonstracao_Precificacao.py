@@ -1,6 +1,16 @@
-import matplotlib.pyplot as plt
+import os
+
 import numpy as np
-from pulp import LpMaximize, LpProblem, LpVariable, value
+
+from Solver_Backends import get_backend
+from Solver_Checkpoint import DEFAULT_DIRECTORY, ResultStore, run_key
+from Solver_Distributed import distributed_solve
+from Solver_Model import Scenario
+from Solver_MonteCarlo import monte_carlo
+from Solver_Plotting import finish, main, pyplot
+from Solver_Presolve import INFEASIBLE_CLASS, NEEDS_SOLVER, TRIVIAL, classify_arrays, demand_cube
+from Solver_Results import ResultTable
+from Solver_Vectorized import scenario_arrays
 
 # Definir faixa para preços possíveis
 basic_prices = np.arange(50, 201, 10)  # Preços possíveis para o Básico
@@ -12,93 +22,192 @@ basic_demand_base = 100
 standard_demand_base = 80
 premium_demand_base = 50
 
-# Listas para armazenar os resultados
-basic_sales = []
-standard_sales = []
-premium_sales = []
-profits = []
-price_combinations = []
-
-# Loop para testar diferentes combinações de preços
-for xb_price in basic_prices:
-    for xp_price in standard_prices:
-        if xp_price <= xb_price:  # Garantir que o Padrão seja maior que o Básico
-            continue
-        for xg_price in premium_prices:
-            if xg_price <= xp_price:  # Garantir que o Premium seja maior que o Padrão
-                continue
-
-            # Demanda ajustada com base no preço (inversamente proporcional)
-            basic_demand = max(basic_demand_base - 0.5 * xb_price, 0)
-            standard_demand = max(standard_demand_base - 0.3 * xp_price, 0)
-            premium_demand = max(premium_demand_base - 0.2 * xg_price, 0)
-
-            # Definir o problema de maximização do lucro
-            model = LpProblem(name="maximize-profit", sense=LpMaximize)
-
-            # Variáveis de decisão para as quantidades de pacotes vendidas
-            q_basic = LpVariable("q_basic", lowBound=0, upBound=basic_demand, cat="Integer")
-            q_standard = LpVariable("q_standard", lowBound=0, upBound=standard_demand, cat="Integer")
-            q_premium = LpVariable("q_premium", lowBound=0, upBound=premium_demand, cat="Integer")
-
-            # Definir a função objetivo (Maximizar o lucro total)
-            model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price), "Total Profit"
-
-            # Restrições simplificadas para horas de processamento e armazenamento
-            model += (1 * q_basic + 1 * q_standard + 1 * q_premium) <= 300  # Total de horas de processamento
-            model += (1 * q_basic + 1 * q_standard + 1 * q_premium) <= 450  # Total de capacidade de armazenamento
-
-            # Resolver o problema
-            model.solve()
-
-            # Armazenar os resultados se a solução for ótima
-            if model.status == 1:
-                basic = q_basic.value()
-                standard = q_standard.value()
-                premium = q_premium.value()
-                profit = value(model.objective)
-                basic_sales.append(basic)
-                standard_sales.append(standard)
-                premium_sales.append(premium)
-                profits.append(profit)
-                price_combinations.append((xb_price, xp_price, xg_price))
-
-# Encontrar o ponto de equilíbrio (menor diferença nas vendas)
-differences = [abs(b - s) + abs(s - p) + abs(b - p) for b, s, p in zip(basic_sales, standard_sales, premium_sales)]
-min_diff_index = np.argmin(differences)
-
-# Obter a combinação de preços e vendas correspondentes
-best_prices = price_combinations[min_diff_index]
-best_sales = (basic_sales[min_diff_index], standard_sales[min_diff_index], premium_sales[min_diff_index])
-best_profit = profits[min_diff_index]
-
-# Exibir os resultados
-print("Preços que equilibram as vendas:")
-print(f"Preço do Básico: {best_prices[0]}, Padrão: {best_prices[1]}, Premium: {best_prices[2]}")
-print("Vendas equilibradas:")
-print(f"Básico: {best_sales[0]}, Padrão: {best_sales[1]}, Premium: {best_sales[2]}")
-print(f"Lucro Máximo: {best_profit}")
-
-# Plotar os resultados
-plt.figure(figsize=(12, 6))
-
-# Gráfico 1: Quantidades vendidas
-plt.subplot(1, 2, 1)
-plt.scatter(range(len(basic_sales)), basic_sales, label="Básico", marker="o")
-plt.scatter(range(len(standard_sales)), standard_sales, label="Padrão", marker="o")
-plt.scatter(range(len(premium_sales)), premium_sales, label="Premium", marker="o")
-plt.xlabel("Configuração de Preço")
-plt.ylabel("Quantidade Vendida")
-plt.title("Vendas por Configuração de Preços")
-plt.legend()
-
-# Gráfico 2: Lucro máximo
-plt.subplot(1, 2, 2)
-plt.scatter(range(len(profits)), profits, label="Lucro", marker="o", color="green")
-plt.xlabel("Configuração de Preço")
-plt.ylabel("Lucro Máximo")
-plt.title("Lucro Máximo por Configuração de Preços")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
+# Desvios-padrão da demanda base e da inclinação no modo Monte Carlo (--monte-carlo N)
+basic_demand_sd, standard_demand_sd, premium_demand_sd = 10, 8, 5
+demand_slope = (0.5, 0.3, 0.2)
+demand_slope_sd = (0.05, 0.03, 0.02)
+
+# Modelo de receita (sem custo de infraestrutura) com 1 hora e 1 unidade de armazenamento por pacote
+demand_scenario = Scenario(
+    process=(1, 1, 1),
+    drive=(1, 1, 1),
+    infrastructure_budget=None,
+    lower_bounds=(0, 0, 0),
+    net_profit=False,
+)
+
+
+def price_cube():
+    """Combinações de preços do cubo inteiro e as demandas ajustadas com base no preço.
+
+    O Padrão é maior que o Básico e o Premium maior que o Padrão; a demanda é
+    inversamente proporcional ao preço.
+    """
+    return demand_cube(
+        basic_prices, standard_prices, premium_prices,
+        demand_base=(basic_demand_base, standard_demand_base, premium_demand_base),
+        demand_slope=demand_slope,
+    )
+
+
+def _solve_cube(price_grid, demands, backend, directory):
+    # Pré-resolução: combinações cuja demanda cabe inteira na capacidade já têm a resposta
+    # (vender toda a demanda); só as demais são enviadas ao solver. Cada bloco de combinações
+    # é gravado em disco assim que resolvido, e uma execução interrompida retoma do último bloco
+    _, rows, rhs, lower, _ = scenario_arrays([demand_scenario])
+    store = ResultStore(directory, run_key(price_grid, demands, rows, rhs, lower), chunk_size=1000)
+    resumed = store.completed
+    for start, stop in store.pending(len(price_grid)):
+        classes, results = classify_arrays(price_grid[start:stop], rows, rhs, lower, demands[start:stop])
+        pending = np.flatnonzero(classes == NEEDS_SOLVER)
+        if len(pending):
+            solved = backend.solve_batch([
+                demand_scenario.replace(prices=tuple(price_grid[start + n]), upper_bounds=tuple(demands[start + n]))
+                for n in pending
+            ])
+            results.status[pending] = solved.status
+            results.objectives[pending] = solved.objectives
+            results.quantities[pending] = solved.quantities
+        store.append(
+            start, stop, prices=price_grid[start:stop], demands=demands[start:stop], classes=classes,
+            status=results.status, objectives=results.objectives, quantities=results.quantities,
+        )
+    return store.load(), resumed
+
+
+def compute(backend=None, directory=None, samples=None, seed=None, queue=None, local_workers=0):
+    """Vendas e lucro de cada combinação de preços (apenas soluções ótimas) e o ponto de equilíbrio.
+
+    ``backend`` resolve as combinações que a pré-resolução não resolve (por
+    padrão, HiGHS em processo com o CBC como reserva) e ``directory`` é onde
+    os blocos de resultados são gravados. Com ``samples``, avalia também o
+    lucro de cada combinação sob ``samples`` sorteios da demanda (Monte Carlo).
+    Com ``queue``, o cubo é distribuído pela fila de ``Solver_Distributed``
+    nesse diretório compartilhado, resolvido por trabalhadores de outras
+    máquinas ou por ``local_workers`` processos nesta (com o backend padrão
+    dos trabalhadores, e não ``backend``).
+    """
+    backend = backend if backend is not None else get_backend("highs", fallback="cbc")
+    directory = directory if directory is not None else os.path.join(DEFAULT_DIRECTORY, "precificacao")
+
+    price_grid, demands = price_cube()
+
+    if queue is not None:
+        # Cubo distribuído: os trabalhadores fazem a pré-resolução e gravam os blocos na fila
+        columns = distributed_solve(
+            demand_scenario, {"prices": price_grid, "upper_bounds": demands}, queue, local_workers
+        )
+        resumed = 0
+    else:
+        columns, resumed = _solve_cube(price_grid, demands, backend, directory)
+
+    # Apenas soluções ótimas, numa tabela de colunas tipadas (na ordem das combinações)
+    table = ResultTable.from_columns(price_grid, columns["status"], columns["objectives"], columns["quantities"])
+    optimal = table.select(table.optimal())
+
+    # Encontrar o ponto de equilíbrio (menor diferença nas vendas)
+    results = {
+        "table": optimal,
+        "min_diff_index": optimal.argmin_imbalance(),
+        "classes": columns["classes"],
+        "resumed": resumed,
+    }
+    if samples:
+        results["prices"] = price_grid
+        results["monte_carlo"] = monte_carlo(
+            price_grid, demand_scenario,
+            base=(basic_demand_base, standard_demand_base, premium_demand_base), slope=demand_slope,
+            base_sd=(basic_demand_sd, standard_demand_sd, premium_demand_sd), slope_sd=demand_slope_sd,
+            samples=samples, seed=seed,
+        )
+    return results
+
+
+def report_monte_carlo(prices, result, top=5):
+    expected = result.expected
+    best = int(np.nanargmax(expected))
+    print(f"Monte Carlo: {len(result.profits)} amostras da demanda, {result.pending} cenários ao solver "
+          f"({result.solved} distintos), {result.unsolved_samples} amostras sem solução")
+    print(f"Maior lucro esperado: {expected[best]:.1f} com preços {prices[best].astype(int).tolist()}")
+    quantiles = result.quantiles[:, best]
+    print("Quantis do lucro: " + ", ".join(
+        f"{level:.0%}: {value:.1f}" for level, value in zip(result.quantile_levels, quantiles)
+    ))
+    probability = result.probability_optimal
+    print("Combinações com maior probabilidade de serem ótimas:")
+    for n in np.argsort(probability)[::-1][:top]:
+        print(f"  Preços {prices[n].astype(int).tolist()}: P(ótima) = {probability[n]:.3f}, "
+              f"lucro esperado = {expected[n]:.1f}")
+
+
+def report(results):
+    classes = results["classes"]
+    if results["resumed"]:
+        print(f"Retomando: {results['resumed']} de {len(classes)} combinações já gravadas")
+    print(
+        f"Combinações: {len(classes)}, triviais: {np.sum(classes == TRIVIAL)}, "
+        f"inviáveis: {np.sum(classes == INFEASIBLE_CLASS)}, enviadas ao solver: {np.sum(classes == NEEDS_SOLVER)}"
+    )
+
+    # Obter a combinação de preços e vendas correspondentes
+    table = results["table"]
+    index = results["min_diff_index"]
+    best_prices = table.parameters[index].astype(int)
+    best_sales = table.quantities[index].astype(float)
+    best_profit = table.objectives[index]
+
+    # Exibir os resultados
+    print("Preços que equilibram as vendas:")
+    print(f"Preço do Básico: {best_prices[0]}, Padrão: {best_prices[1]}, Premium: {best_prices[2]}")
+    print("Vendas equilibradas:")
+    print(f"Básico: {best_sales[0]}, Padrão: {best_sales[1]}, Premium: {best_sales[2]}")
+    print(f"Lucro Máximo: {best_profit}")
+
+    if "monte_carlo" in results:
+        report_monte_carlo(results["prices"], results["monte_carlo"])
+
+
+def render(results, output=None):
+    plt = pyplot(output)
+
+    # Plotar os resultados
+    plt.figure(figsize=(12, 6))
+
+    # Gráfico 1: Quantidades vendidas
+    plt.subplot(1, 2, 1)
+    table = results["table"]
+    positions = np.arange(len(table))
+    for tier, label in enumerate(["Básico", "Padrão", "Premium"]):
+        plt.scatter(positions, table.quantities[:, tier], label=label, marker="o")
+    plt.xlabel("Configuração de Preço")
+    plt.ylabel("Quantidade Vendida")
+    plt.title("Vendas por Configuração de Preços")
+    plt.legend()
+
+    # Gráfico 2: Lucro máximo
+    plt.subplot(1, 2, 2)
+    plt.scatter(positions, table.objectives, label="Lucro", marker="o", color="green")
+    plt.xlabel("Configuração de Preço")
+    plt.ylabel("Lucro Máximo")
+    plt.title("Lucro Máximo por Configuração de Preços")
+    plt.legend()
+
+    plt.tight_layout()
+    finish(plt, output)
+
+
+if __name__ == "__main__":
+    def configure(parser):
+        parser.add_argument("--monte-carlo", type=int, metavar="N", help="avalia N sorteios da demanda")
+        parser.add_argument("--seed", type=int, help="semente dos sorteios do Monte Carlo")
+        parser.add_argument("--queue", metavar="DIR", help="distribui o cubo pela fila neste diretório compartilhado")
+        parser.add_argument("--local-workers", type=int, default=0, help="trabalhadores da fila nesta máquina")
+
+    main(
+        compute, render, report,
+        description="Vendas e lucro por combinação de preços",
+        configure=configure,
+        options=lambda args: {
+            "samples": args.monte_carlo, "seed": args.seed, "queue": args.queue, "local_workers": args.local_workers,
+        },
+    )
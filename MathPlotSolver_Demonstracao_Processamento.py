@@ -1,6 +1,13 @@
-import matplotlib.pyplot as plt
+import os
+
 import numpy as np
-from pulp import LpMaximize, LpProblem, LpVariable, value
+
+from Solver_Async import AsyncCbcBackend
+from Solver_Model import PricingModel, Scenario
+from Solver_Monotone import monotone_sweep
+from Solver_Plotting import finish, main, pyplot
+from Solver_Profiling import PhaseTimer, instrument
+from Solver_Results import ResultTable
 
 # Preços fixos dos pacotes
 xb_price = 1000
@@ -12,91 +19,154 @@ basic_hours = np.arange(1, 11, 1)  # Horas para o Básico (1 a 10)
 standard_hours = np.arange(2, 21, 1)  # Horas para o Padrão (2 a 20)
 premium_hours = np.arange(3, 31, 1)  # Horas para o Premium (3 a 30)
 
-# Listas para armazenar os resultados
-basic_sales = []
-standard_sales = []
-premium_sales = []
-profits = []
-hours_combinations = []
-
-# Loop para testar diferentes combinações de horas de processamento
-for xb_process in basic_hours:
-    for xp_process in standard_hours:
-        if xp_process <= xb_process:  # Garantir que o Padrão consuma mais que o Básico
-            continue
-        for xg_process in premium_hours:
-            if xg_process <= xp_process:  # Garantir que o Premium consuma mais que o Padrão
-                continue
-
-            # Definir o problema de maximização do lucro
-            model = LpProblem(name="maximize-profit", sense=LpMaximize)
-
-            # Variáveis de decisão para as quantidades de pacotes vendidas
-            q_basic = LpVariable("q_basic", lowBound=30, cat="Integer")
-            q_standard = LpVariable("q_standard", lowBound=0, cat="Integer")
-            q_premium = LpVariable("q_premium", lowBound=0, upBound=15, cat="Integer")
-
-            # Definir a função objetivo (Maximizar o lucro total)
-            model += (q_basic * xb_price + q_standard * xp_price + q_premium * xg_price), "Total Profit"
-
-            # Restrições para horas de processamento e armazenamento (simplificadas)
-            model += (xb_process * q_basic + xp_process * q_standard + xg_process * q_premium) <= 300  # Total de horas de processamento
-            model += (1 * q_basic + 1 * q_standard + 1 * q_premium) <= 450  # Total de capacidade de armazenamento
-
-            # Resolver o problema
-            model.solve()
-
-            # Calcular total de horas manualmente e filtrar valores inválidos
-            if model.status == 1:
-                basic = q_basic.value()
-                standard = q_standard.value()
-                premium = q_premium.value()
-                total_hours = xb_process * basic + xp_process * standard + xg_process * premium
-
-                if total_hours <= 300:  # Garantir que respeita o limite
-                    profit = value(model.objective)
-                    basic_sales.append(basic)
-                    standard_sales.append(standard)
-                    premium_sales.append(premium)
-                    profits.append(profit)
-                    hours_combinations.append((xb_process, xp_process, xg_process))
-
-# Encontrar o ponto de equilíbrio (menor diferença nas vendas)
-differences = [abs(b - s) + abs(s - p) + abs(b - p) for b, s, p in zip(basic_sales, standard_sales, premium_sales)]
-min_diff_index = np.argmin(differences)
-
-# Obter a combinação de horas e vendas correspondentes
-best_hours = hours_combinations[min_diff_index]
-best_sales = (basic_sales[min_diff_index], standard_sales[min_diff_index], premium_sales[min_diff_index])
-best_profit = profits[min_diff_index]
-
-# Exibir os resultados
-print("Horas de Processamento que equilibram as vendas:")
-print(f"Básico: {best_hours[0]}, Padrão: {best_hours[1]}, Premium: {best_hours[2]}")
-print("Vendas equilibradas:")
-print(f"Básico: {best_sales[0]}, Padrão: {best_sales[1]}, Premium: {best_sales[2]}")
-print(f"Lucro Máximo: {best_profit}")
-
-# Plotar os resultados
-plt.figure(figsize=(12, 6))
-
-# Gráfico 1: Quantidades vendidas
-plt.subplot(1, 2, 1)
-plt.scatter(range(len(basic_sales)), basic_sales, label="Básico", marker="o")
-plt.scatter(range(len(standard_sales)), standard_sales, label="Padrão", marker="o")
-plt.scatter(range(len(premium_sales)), premium_sales, label="Premium", marker="o")
-plt.xlabel("Configuração de Horas de Processamento")
-plt.ylabel("Quantidade Vendida")
-plt.title("Vendas por Configuração de Horas de Processamento")
-plt.legend()
-
-# Gráfico 2: Lucro máximo
-plt.subplot(1, 2, 2)
-plt.scatter(range(len(profits)), profits, label="Lucro", marker="o", color="green")
-plt.xlabel("Configuração de Horas de Processamento")
-plt.ylabel("Lucro Máximo")
-plt.title("Lucro Máximo por Configuração de Horas de Processamento")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
+# Modelo de receita (sem custo de infraestrutura); com SOLVER_PROFILE=1 o tempo
+# de cada fase das resoluções e do gráfico é medido
+processing_scenario = Scenario(
+    prices=(xb_price, xp_price, xg_price),
+    drive=(1, 1, 1),
+    infrastructure_budget=None,
+    net_profit=False,
+)
+timer = PhaseTimer.from_environment()
+
+
+def compute(model=None, concurrency=None, timeout=None, verify=0.0):
+    """Vendas e lucro de cada combinação de horas de processamento e o ponto de equilíbrio.
+
+    Por padrão, um único modelo resolve as combinações, uma por vez
+    (``model``, se informado): no laço interno as horas do Premium só
+    aumentam, e ``monotone_sweep`` preenche sem resolver os pontos em que a
+    solução anterior continua viável (``verify`` é a fração desses pontos
+    resolvida mesmo assim, para conferência). Só com ``concurrency`` maior que
+    1 ou com ``timeout`` as combinações são resolvidas por até ``concurrency``
+    subprocessos do CBC ao mesmo tempo (padrão: um por núcleo), cada um com até
+    ``timeout`` segundos, sem a varredura monótona; combinações que esgotam o
+    prazo ficam de fora, como as sem solução ótima. Com SOLVER_PROFILE=1 a resolução é sempre
+    sequencial, para que as fases de cada ponto sejam medidas.
+    """
+    # Combinações de horas (Padrão consome mais que o Básico e Premium mais que o Padrão)
+    hours_combinations = [
+        (xb_process, xp_process, xg_process)
+        for xb_process in basic_hours
+        for xp_process in standard_hours
+        if xp_process > xb_process
+        for xg_process in premium_hours
+        if xg_process > xp_process
+    ]
+
+    # Horas de processamento variando; armazenamento simplificado (1 unidade por pacote)
+    scenarios = [processing_scenario.replace(process=hours) for hours in hours_combinations]
+
+    # Tabela de resultados alocada uma vez, uma linha por combinação
+    table = ResultTable(len(hours_combinations))
+    timed_out = 0
+    sweeps = []
+    # Subprocessos em paralelo só quando pedidos: o padrão é a varredura monótona em sequência
+    concurrent = (concurrency or 1) > 1 or timeout is not None
+    if model is not None or timer.enabled or not concurrent:
+        # Modelo construído uma única vez e reaproveitado em todas as combinações; cada laço
+        # interno (Básico e Padrão fixos, Premium crescendo) é uma varredura monótona
+        template = instrument(model if model is not None else PricingModel(processing_scenario), timer)
+        start = 0
+        while start < len(scenarios):
+            stop = start + 1
+            while stop < len(scenarios) and hours_combinations[stop][:2] == hours_combinations[start][:2]:
+                stop += 1
+            sweeps.append(monotone_sweep(scenarios[start:stop], template, verify=verify))
+            for index, solution in enumerate(sweeps[-1].solutions, start):
+                table.set(index, hours_combinations[index], solution)
+            start = stop
+    else:
+        backend = AsyncCbcBackend(concurrency or os.cpu_count() or 1, timeout=timeout)
+        batch = backend.solve_batch(scenarios)
+        table.fill(0, hours_combinations, batch.status, batch.objectives, batch.quantities)
+        timed_out = backend.timed_out
+
+    # Calcular total de horas e filtrar valores inválidos (apenas soluções ótimas que respeitam o limite)
+    total_hours = np.einsum("nk,nk->n", table.parameters, table.quantities)
+    table = table.select(table.optimal() & (total_hours <= 300))
+
+    # Encontrar o ponto de equilíbrio (menor diferença nas vendas)
+    return {"table": table, "min_diff_index": table.argmin_imbalance(), "timed_out": timed_out, "sweeps": sweeps}
+
+
+def report(results):
+    if results["timed_out"]:
+        print(f"Combinações com prazo esgotado: {results['timed_out']}")
+    if results["sweeps"]:
+        sweeps = results["sweeps"]
+        solves = sum(sweep.solves for sweep in sweeps)
+        skipped = sum(sweep.skipped for sweep in sweeps)
+        print(f"Laços internos: {solves} resolvidos, {skipped} preenchidos sem resolver", end="")
+        verified = sum(sweep.verified for sweep in sweeps)
+        if verified:
+            print(f" ({verified} conferidos, {sum(sweep.mismatches for sweep in sweeps)} divergências)", end="")
+        print()
+
+    # Obter a combinação de horas e vendas correspondentes
+    table = results["table"]
+    index = results["min_diff_index"]
+    if index is None:
+        print("Nenhuma combinação com solução ótima dentro do limite de horas.")
+        return
+    best_hours = table.parameters[index].astype(int)
+    best_sales = table.quantities[index].astype(float)
+    best_profit = table.objectives[index]
+
+    # Exibir os resultados
+    print("Horas de Processamento que equilibram as vendas:")
+    print(f"Básico: {best_hours[0]}, Padrão: {best_hours[1]}, Premium: {best_hours[2]}")
+    print("Vendas equilibradas:")
+    print(f"Básico: {best_sales[0]}, Padrão: {best_sales[1]}, Premium: {best_sales[2]}")
+    print(f"Lucro Máximo: {best_profit}")
+
+
+def render(results, output=None):
+    with timer.phase("plot"):
+        plt = pyplot(output)
+
+        # Plotar os resultados
+        plt.figure(figsize=(12, 6))
+
+        # Gráfico 1: Quantidades vendidas
+        plt.subplot(1, 2, 1)
+        table = results["table"]
+        positions = np.arange(len(table))
+        for tier, label in enumerate(["Básico", "Padrão", "Premium"]):
+            plt.scatter(positions, table.quantities[:, tier], label=label, marker="o")
+        plt.xlabel("Configuração de Horas de Processamento")
+        plt.ylabel("Quantidade Vendida")
+        plt.title("Vendas por Configuração de Horas de Processamento")
+        plt.legend()
+
+        # Gráfico 2: Lucro máximo
+        plt.subplot(1, 2, 2)
+        plt.scatter(positions, table.objectives, label="Lucro", marker="o", color="green")
+        plt.xlabel("Configuração de Horas de Processamento")
+        plt.ylabel("Lucro Máximo")
+        plt.title("Lucro Máximo por Configuração de Horas de Processamento")
+        plt.legend()
+
+        plt.tight_layout()
+        if timer.enabled:
+            plt.gcf().canvas.draw()  # Renderiza aqui para que o desenho entre na fase plot
+
+    # Tempos por fase (apenas com SOLVER_PROFILE=1)
+    timer.report()
+    finish(plt, output)
+
+
+if __name__ == "__main__":
+    def configure(parser):
+        parser.add_argument("--concurrency", type=int,
+                            help="subprocessos do CBC em paralelo (padrão: resolve em sequência)")
+        parser.add_argument("--timeout", type=float, help="prazo de cada resolução, em segundos")
+        parser.add_argument("--verify", type=float, default=0.0,
+                            help="fração dos pontos pulados no laço interno resolvida para conferência")
+
+    main(
+        compute, render, report,
+        description="Vendas e lucro por combinação de horas de processamento",
+        configure=configure,
+        options=lambda args: {"concurrency": args.concurrency, "timeout": args.timeout, "verify": args.verify},
+    )
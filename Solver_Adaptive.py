@@ -0,0 +1,185 @@
+"""Amostragem adaptativa de superfícies de lucro em dois parâmetros.
+
+Em vez de uma grade fixa, ``adaptive_surface`` começa com uma grade grossa e
+subdivide (em quatro) apenas as células cujos cantos têm soluções diferentes:
+as regiões planas ficam com poucos pontos e as cristas em que o mix ótimo
+muda recebem a resolução. Os pontos de cada nível são resolvidos em lote.
+
+Uma célula também é subdividida quando a região viável
+(``Solver_Sweep.feasible_region``: restrições e limites, sem o orçamento
+quando ele nunca limita) muda entre os cantos, como ao variar o custo de
+infraestrutura com o orçamento ativo. Se os quatro cantos têm a mesma solução
+ótima e a mesma região viável, e objetivo e restrições variam de forma afim
+com os parâmetros (como nos scripts), essa solução é ótima em toda a célula,
+e o lucro dentro dela é exato. ``surface`` avalia o
+lucro em qualquer grade regular (para o ``plot_surface``) como o maior lucro,
+entre as soluções dos cantos da célula que continuam viáveis no ponto.
+"""
+import numpy as np
+
+from Solver_Backends import CbcBackend
+from Solver_Model import OPTIMAL
+from Solver_Sweep import feasible_region
+from Solver_Vectorized import scenario_arrays
+
+_EPS = 1e-9
+
+
+class AdaptiveResult:
+    """Pontos resolvidos pela amostragem adaptativa e as células finais."""
+
+    def __init__(self, make_scenario, x_range, y_range, scale, points, solutions, cells, solves):
+        self.make_scenario = make_scenario
+        self.x_range = x_range
+        self.y_range = y_range
+        self.scale = scale
+        self._points = points
+        self._solutions = solutions
+        self.cells = cells
+        self.solves = solves
+
+    def _value(self, i, j):
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        return x0 + (x1 - x0) * i / self.scale[0], y0 + (y1 - y0) * j / self.scale[1]
+
+    @property
+    def points(self):
+        """Valores dos parâmetros de todos os pontos resolvidos, forma (N, 2)."""
+        return np.array([self._value(i, j) for i, j in self._points])
+
+    @property
+    def status(self):
+        return np.array([self._solutions[point][0] for point in self._points], dtype=np.int8)
+
+    @property
+    def objectives(self):
+        return np.array([self._solutions[point][1] for point in self._points], dtype=float)
+
+    @property
+    def quantities(self):
+        return np.array([self._solutions[point][2] for point in self._points], dtype=float).reshape(-1, 3)
+
+    def surface(self, x_values, y_values, default=0):
+        """Lucro estimado na grade ``x_values`` x ``y_values``, forma (len(x), len(y)).
+
+        Exato nas células cujos cantos concordam (mesma solução e mesma região
+        viável); nas demais, o maior lucro entre as soluções dos cantos viáveis
+        no ponto (``default`` se nenhuma).
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        y_values = np.asarray(y_values, dtype=float)
+        scenarios = [self.make_scenario(x, y) for x in x_values for y in y_values]
+        objective, rows, rhs, lower, upper = scenario_arrays(scenarios)
+        shape = (len(x_values), len(y_values))
+        objective = objective.reshape(shape + (3,))
+        rows = rows.reshape(shape + rows.shape[1:])
+        rhs = rhs.reshape(shape + rhs.shape[1:])
+        lower = lower.reshape(shape + (3,))
+        upper = upper.reshape(shape + (3,))
+
+        profits = np.full(shape, -np.inf)
+        for i, j, size in self.cells:
+            (xa, ya), (xb, yb) = self._value(i, j), self._value(i + size, j + size)
+            xs = slice(np.searchsorted(x_values, xa - _EPS), np.searchsorted(x_values, xb + _EPS, side="right"))
+            ys = slice(np.searchsorted(y_values, ya - _EPS), np.searchsorted(y_values, yb + _EPS, side="right"))
+            corners = {self._solutions[corner] for corner in _corners(i, j, size)}
+            candidates = np.array([quantities for status, _, quantities in corners if status == OPTIMAL])
+            if xs.start >= xs.stop or ys.start >= ys.stop or not len(candidates):
+                continue
+            values = objective[xs, ys] @ candidates.T
+            feasible = (np.einsum("abrk,ck->abcr", rows[xs, ys], candidates) <= rhs[xs, ys, None] + _EPS).all(axis=-1)
+            feasible &= (candidates >= lower[xs, ys, None] - _EPS).all(axis=-1)
+            feasible &= (candidates <= upper[xs, ys, None] + _EPS).all(axis=-1)
+            best = np.where(feasible, values, -np.inf).max(axis=-1)
+            profits[xs, ys] = np.maximum(profits[xs, ys], best)
+        return np.where(np.isfinite(profits), profits, default)
+
+
+def _region(scenario):
+    # Região viável hashable, para comparar os cantos de uma célula
+    rows, lower, upper = feasible_region(scenario)
+    return tuple(rows), lower, upper
+
+
+def _corners(i, j, size):
+    return (i, j), (i + size, j), (i, j + size), (i + size, j + size)
+
+
+def _children(i, j, size):
+    half = size // 2
+    return [(i, j, half), (i + half, j, half), (i, j + half, half), (i + half, j + half, half)]
+
+
+def adaptive_surface(make_scenario, x_range, y_range, coarse=(4, 4), max_depth=4, max_solves=None, solve_batch=None):
+    """Amostra ``make_scenario(x, y)`` em ``x_range`` x ``y_range`` com refinamento adaptativo.
+
+    ``coarse`` é o número de células da grade inicial em cada eixo e
+    ``max_depth`` quantas vezes uma célula pode ser subdividida. Com
+    ``max_solves``, cada nível refina primeiro as células com maior diferença de
+    lucro entre os cantos até esgotar o orçamento de resoluções. ``solve_batch``
+    recebe uma lista de ``Scenario`` e retorna um ``BatchResult`` (por padrão, o
+    backend CBC). Retorna um ``AdaptiveResult``.
+    """
+    solve_batch = solve_batch if solve_batch is not None else CbcBackend().solve_batch
+    step = 2 ** max_depth
+    scale = (coarse[0] * step, coarse[1] * step)
+    solutions = {}
+    regions = {}
+    order = []
+    solves = 0
+
+    def value(i, j):
+        (x0, x1), (y0, y1) = x_range, y_range
+        return x0 + (x1 - x0) * i / scale[0], y0 + (y1 - y0) * j / scale[1]
+
+    def solve(points):
+        nonlocal solves
+        points = [point for point in dict.fromkeys(points) if point not in solutions]
+        if not points:
+            return
+        scenarios = [make_scenario(*value(i, j)) for i, j in points]
+        result = solve_batch(scenarios)
+        for n, point in enumerate(points):
+            regions[point] = _region(scenarios[n])
+            status = int(result.status[n])
+            if status == OPTIMAL:
+                solutions[point] = (status, float(result.objectives[n]), tuple(float(q) for q in result.quantities[n]))
+            else:
+                solutions[point] = (status, np.nan, (np.nan,) * 3)
+            order.append(point)
+        solves += len(points)
+
+    def differs(cell):
+        corners = {solutions[corner][::2] for corner in _corners(*cell)}
+        return len(corners) > 1 or len({regions[corner] for corner in _corners(*cell)}) > 1
+
+    def spread(cell):
+        objectives = [solutions[corner][1] for corner in _corners(*cell)]
+        if np.isnan(objectives).any():
+            return np.inf
+        return max(objectives) - min(objectives)
+
+    cells = [(a * step, b * step, step) for a in range(coarse[0]) for b in range(coarse[1])]
+    solve([corner for cell in cells for corner in _corners(*cell)])
+
+    leaves = []
+    while cells:
+        refine = [cell for cell in cells if cell[2] > 1 and differs(cell)]
+        refined = set(refine)
+        leaves.extend(cell for cell in cells if cell not in refined)
+        if max_solves is not None:
+            refine.sort(key=spread, reverse=True)
+            budget = max_solves - solves
+            chosen, pending = [], set()
+            for cell in refine:
+                new = {point for child in _children(*cell) for point in _corners(*child)} - solutions.keys() - pending
+                if len(pending) + len(new) > budget:
+                    break
+                chosen.append(cell)
+                pending |= new
+            leaves.extend(cell for cell in refine[len(chosen):])
+            refine = chosen
+        cells = [child for cell in refine for child in _children(*cell)]
+        solve([corner for cell in cells for corner in _corners(*cell)])
+
+    return AdaptiveResult(make_scenario, x_range, y_range, scale, order, solutions, leaves, solves)
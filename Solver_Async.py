@@ -0,0 +1,118 @@
+"""Resolução concorrente com subprocessos do CBC gerenciados pelo asyncio.
+
+O ``PULP_CBC_CMD`` bloqueia o processo Python enquanto o CBC roda, e uma
+resolução travada trava a varredura inteira. O ``AsyncCbcBackend`` monta o
+arquivo MPS de cada ponto com um único ``PricingModel`` e mantém até
+``concurrency`` subprocessos do CBC em execução ao mesmo tempo (sem os
+processos Python inteiros do ``Solver_Parallel``). Cada resolução tem:
+
+- ``time_limit``: limite do próprio CBC (``-sec``); sem otimalidade provada, o ponto fica ``NOT_SOLVED``;
+- ``timeout``: prazo de parede; ao esgotar, o subprocesso é morto e o ponto fica ``UNDEFINED``.
+
+Cancelar a varredura (por exemplo, Ctrl+C) mata os subprocessos em execução.
+Os resultados voltam na ordem dos cenários, com a mesma interface dos
+backends de ``Solver_Backends``::
+
+    backend = AsyncCbcBackend(concurrency=4, timeout=10)
+    batch = backend.solve_batch(scenarios)  # BatchResult, na ordem de ``scenarios``
+
+Dentro de código assíncrono, use ``await backend.solve_all(scenarios)``.
+"""
+import asyncio
+import os
+import subprocess
+import tempfile
+
+from pulp import PULP_CBC_CMD, PulpSolverError
+
+from Solver_Backends import batch_result
+from Solver_Model import OPTIMAL, UNDEFINED, PricingModel, Solution, solution_status
+
+
+class AsyncCbcBackend:
+    """CBC em subprocessos concorrentes, com prazo por resolução."""
+
+    name = "cbc-async"
+
+    def __init__(self, concurrency=None, time_limit=None, timeout=None, cache=None):
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.timeout = timeout
+        self.cache = cache
+        self.model = PricingModel()
+        self.solver = PULP_CBC_CMD(msg=False)
+        if not self.solver.executable(self.solver.path):
+            raise PulpSolverError(f"Não foi possível executar o CBC: {self.solver.path}")
+        self.timed_out = 0
+
+    def _write(self, scenario, path):
+        # Troca os coeficientes e grava o MPS de uma vez, sem ceder o laço de eventos no meio
+        self.model.update(scenario)
+        variables, variable_names, constraint_names, _ = self.model.model.writeMPS(path, rename=1)
+        return variables, variable_names, constraint_names
+
+    def _arguments(self, mps, solution):
+        arguments = [self.solver.path, mps, "-max"]
+        if self.time_limit is not None:
+            arguments += ["-sec", str(self.time_limit)]
+        return arguments + ["-solve", "-printingOptions", "all", "-solution", solution]
+
+    async def _solve(self, index, scenario, directory, semaphore):
+        if self.cache is not None:
+            cached = self.cache.get(scenario)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            mps = os.path.join(directory, f"point_{index}.mps")
+            solution_path = os.path.join(directory, f"point_{index}.sol")
+            variables, variable_names, constraint_names = self._write(scenario, mps)
+            process = await asyncio.create_subprocess_exec(
+                *self._arguments(mps, solution_path),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                returncode = await asyncio.wait_for(process.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                return Solution(UNDEFINED, None, None)
+            finally:
+                # Prazo esgotado ou varredura cancelada: não deixa o CBC rodando
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            if returncode != 0 or not os.path.exists(solution_path):
+                return Solution(UNDEFINED, None, None)
+            status, values, _, _, _, sol_status = self.solver.readsol_MPS(
+                solution_path, self.model.model, variables, variable_names, constraint_names
+            )
+            # Como no PULP_CBC_CMD: CBC parado pelo limite de tempo vem com status Optimal e sol_status viável
+            self.model.model.assignStatus(status, sol_status)
+            status = solution_status(self.model.model)
+            os.remove(mps)
+            os.remove(solution_path)
+
+        solution = self._solution(scenario, status, values)
+        if self.cache is not None:
+            self.cache.put(scenario, solution)
+        return solution
+
+    def _solution(self, scenario, status, values):
+        if status != OPTIMAL:
+            return Solution(status, None, None)
+        quantities = tuple(values[q.name] for q in self.model.variables)
+        objective = sum(c * q for c, q in zip(scenario.objective_coefficients(), quantities))
+        return Solution(status, objective, quantities)
+
+    async def solve_all(self, scenarios):
+        """Resolve os cenários com até ``concurrency`` subprocessos; retorna os ``Solution`` na ordem."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with tempfile.TemporaryDirectory(prefix="cbc-async-") as directory:
+            return await asyncio.gather(*(
+                self._solve(index, scenario, directory, semaphore) for index, scenario in enumerate(scenarios)
+            ))
+
+    def solve(self, scenario):
+        return asyncio.run(self.solve_all([scenario]))[0]
+
+    def solve_batch(self, scenarios):
+        return batch_result(asyncio.run(self.solve_all(scenarios)))
@@ -0,0 +1,156 @@
+"""Camada de backends de solver com resolução em lote.
+
+Todos os backends têm a mesma interface: ``solve(scenario)`` retorna um
+``Solution`` e ``solve_batch(scenarios)`` retorna um ``BatchResult``.
+
+- ``cbc``: PuLP + CBC (subprocesso e arquivos temporários), via ``PricingModel``;
+- ``highs``: HiGHS em processo pelo SciPy, com o modelo em memória;
+- ``numpy``: enumeração exata vetorizada de ``Solver_Vectorized``.
+
+O SciPy é opcional: sem ele, ``get_backend("highs")`` cai para o CBC.
+"""
+import numpy as np
+from pulp import PULP_CBC_CMD
+
+from Solver_Model import INFEASIBLE, NOT_SOLVED, OPTIMAL, UNBOUNDED, UNDEFINED, PricingModel, Solution
+from Solver_Vectorized import BatchResult, scenario_arrays
+from Solver_Vectorized import solve_batch as solve_vectorized
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+except ImportError:  # SciPy não instalado
+    milp = None
+
+_EPS = 1e-9
+
+# Status do HiGHS (scipy.optimize.milp/linprog) para os códigos do PuLP
+HIGHS_STATUS = {0: OPTIMAL, 1: NOT_SOLVED, 2: INFEASIBLE, 3: UNBOUNDED, 4: UNDEFINED}
+
+
+def batch_result(solutions):
+    """``BatchResult`` de uma lista de ``Solution`` (NaN onde não há solução)."""
+    status = np.array([s.status for s in solutions], dtype=np.int8)
+    objectives = np.array([np.nan if s.objective is None else s.objective for s in solutions], dtype=float)
+    quantities = np.array([(np.nan,) * 3 if s.quantities is None else s.quantities for s in solutions], dtype=float)
+    return BatchResult(status, objectives, quantities.reshape(len(solutions), 3))
+
+
+class CbcBackend:
+    """CBC pelo PuLP, reaproveitando um único ``PricingModel``."""
+
+    name = "cbc"
+
+    def __init__(self, cache=None, time_limit=None):
+        self.model = PricingModel(solver=PULP_CBC_CMD(msg=False, timeLimit=time_limit), cache=cache)
+
+    def solve(self, scenario):
+        return self.model.solve(scenario)
+
+    def solve_batch(self, scenarios):
+        return batch_result([self.model.solve(scenario) for scenario in scenarios])
+
+
+class HighsBackend:
+    """HiGHS em processo (SciPy), sem subprocesso nem arquivos temporários.
+
+    Cada cenário resolve primeiro a relaxação linear, com os limites das
+    variáveis arredondados para inteiros; se a solução já for inteira ela é
+    ótima para o problema inteiro. Caso contrário, roda o ``milp``. Com
+    ``fallback``, pontos em que o HiGHS não conclui (tempo esgotado ou erro)
+    são resolvidos pelo backend de reserva.
+    """
+
+    name = "highs"
+
+    def __init__(self, time_limit=None, fallback=None):
+        if milp is None:
+            raise ImportError("O backend HiGHS precisa do SciPy (scipy.optimize.milp)")
+        self.options = {} if time_limit is None else {"time_limit": time_limit}
+        self.fallback = fallback
+
+    def _solve_arrays(self, objective, rows, rhs, lower, upper):
+        lower = np.ceil(lower - _EPS)
+        upper = np.floor(upper + _EPS)
+        if (lower > upper).any():
+            return Solution(INFEASIBLE, None, None)
+        active = np.isfinite(rhs)
+        rows, rhs = rows[active], rhs[active]
+
+        relaxation = linprog(
+            -objective, A_ub=rows, b_ub=rhs, bounds=np.column_stack([lower, upper]), method="highs",
+            options=self.options,
+        )
+        if relaxation.status == 2:
+            return Solution(INFEASIBLE, None, None)
+        if relaxation.status == 0 and np.allclose(relaxation.x, np.round(relaxation.x), atol=_EPS, rtol=0):
+            x = np.round(relaxation.x)
+        else:
+            result = milp(
+                -objective,
+                constraints=LinearConstraint(rows, -np.inf, rhs),
+                bounds=Bounds(lower, upper),
+                integrality=np.ones(3),
+                options={**self.options, "mip_rel_gap": 0},  # Ótimo provado, sem a folga padrão de 0,01%
+            )
+            status = HIGHS_STATUS.get(result.status, UNDEFINED)
+            if status != OPTIMAL or result.x is None:
+                return Solution(status, None, None)
+            x = np.round(result.x)
+        quantities = tuple(float(q) + 0.0 for q in x)  # + 0.0 normaliza -0.0
+        return Solution(OPTIMAL, float(sum(c * q for c, q in zip(objective, quantities))), quantities)
+
+    def solve(self, scenario):
+        objective, rows, rhs, lower, upper = (array[0] for array in scenario_arrays([scenario]))
+        solution = self._solve_arrays(objective, rows, rhs, lower, upper)
+        if self.fallback is not None and solution.status in (NOT_SOLVED, UNDEFINED):
+            return self.fallback.solve(scenario)
+        return solution
+
+    def solve_batch(self, scenarios):
+        objective, rows, rhs, lower, upper = scenario_arrays(scenarios)
+        solutions = []
+        for n, scenario in enumerate(scenarios):
+            solution = self._solve_arrays(objective[n], rows[n], rhs[n], lower[n], upper[n])
+            if self.fallback is not None and solution.status in (NOT_SOLVED, UNDEFINED):
+                solution = self.fallback.solve(scenario)
+            solutions.append(solution)
+        return batch_result(solutions)
+
+
+class NumpyBackend:
+    """Enumeração exata vetorizada (``Solver_Vectorized``), o lote inteiro de uma vez."""
+
+    name = "numpy"
+
+    def __init__(self, max_elements=2_000_000):
+        self.max_elements = max_elements
+
+    def solve(self, scenario):
+        result = self.solve_batch([scenario])
+        if result.status[0] != OPTIMAL:
+            return Solution(int(result.status[0]), None, None)
+        return Solution(OPTIMAL, float(result.objectives[0]), tuple(float(q) for q in result.quantities[0]))
+
+    def solve_batch(self, scenarios):
+        return solve_vectorized(scenarios, max_elements=self.max_elements)
+
+
+BACKENDS = {"cbc": CbcBackend, "highs": HighsBackend, "numpy": NumpyBackend}
+
+
+def get_backend(name="highs", fallback="cbc", **options):
+    """Cria o backend ``name``; se ele não estiver disponível, usa ``fallback``.
+
+    Para o HiGHS, ``fallback`` também resolve os pontos em que ele não conclui.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name!r} (opções: {', '.join(BACKENDS)})")
+    reserve = BACKENDS[fallback]() if fallback is not None and fallback != name else None
+    try:
+        if name == "highs":
+            return HighsBackend(fallback=reserve, **options)
+        return BACKENDS[name](**options)
+    except ImportError:
+        if reserve is None:
+            raise
+        return reserve
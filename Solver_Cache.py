@@ -0,0 +1,146 @@
+"""Cache persistente de cenários resolvidos, endereçado pelo conteúdo do modelo.
+
+A chave é o SHA-256 de uma forma canônica do modelo (sentido, variáveis com
+categoria e limites, coeficientes do objetivo e restrições), então cenários
+diferentes que geram o mesmo modelo compartilham a mesma entrada. As soluções
+ficam num arquivo SQLite (modo WAL), que pode ser lido e escrito por vários
+processos ao mesmo tempo; as entradas menos usadas recentemente são
+descartadas quando o cache passa de ``max_entries``.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+
+from Solver_Model import INFEASIBLE, OPTIMAL, TIERS, UNBOUNDED, Solution
+
+DEFAULT_PATH = os.environ.get("SOLVER_CACHE_PATH", ".solver_cache.sqlite")
+
+# Status determinísticos que podem ser reaproveitados (tempo esgotado ou erro não entram no cache;
+# uma solução viável sem otimalidade provada chega como NOT_SOLVED, ver ``solution_status``)
+CACHEABLE_STATUS = (OPTIMAL, INFEASIBLE, UNBOUNDED)
+
+
+def _number(value):
+    if value is None:
+        return None
+    value = float(value)
+    if math.isfinite(value) and value == int(value):
+        return int(value)  # 100 e 100.0 geram a mesma chave
+    return repr(value)
+
+
+def canonical_model(scenario):
+    """Forma canônica (JSON) do modelo gerado pelo cenário."""
+    model = {
+        "sense": "maximize",
+        "variables": [
+            {"name": f"q_{tier}", "cat": "Integer", "low": _number(low), "up": _number(up)}
+            for tier, low, up in zip(TIERS, scenario.lower_bounds, scenario.upper_bounds)
+        ],
+        "objective": [_number(c) for c in scenario.objective_coefficients()],
+        "constraints": [
+            {"name": name, "sense": "<=", "coefficients": [_number(a) for a in row], "rhs": _number(rhs)}
+            for name, row, rhs in scenario.constraint_rows()
+        ],
+    }
+    return json.dumps(model, sort_keys=True, separators=(",", ":"))
+
+
+def model_key(scenario):
+    """Hash SHA-256 da forma canônica do modelo."""
+    return hashlib.sha256(canonical_model(scenario).encode()).hexdigest()
+
+
+class ScenarioCache:
+    """Cache em disco de soluções, compartilhável entre processos.
+
+    Exemplo::
+
+        template = PricingModel(cache=ScenarioCache())
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=100_000, evict_every=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+        self._writes = 0
+
+    def __getstate__(self):
+        # A conexão não atravessa processos: cada processo abre a sua
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        return state
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "key TEXT PRIMARY KEY, status INTEGER, objective REAL,"
+                " q_basic REAL, q_standard REAL, q_premium REAL, last_used REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, scenario):
+        """Solução salva para o cenário, ou None se ainda não foi resolvido."""
+        key = model_key(scenario)
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT status, objective, q_basic, q_standard, q_premium FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        status, objective, *quantities = row
+        if status != OPTIMAL:
+            return Solution(status, None, None)
+        return Solution(status, objective, tuple(quantities))
+
+    def put(self, scenario, solution):
+        """Salva a solução do cenário (apenas status determinísticos)."""
+        if solution.status not in CACHEABLE_STATUS:
+            return
+        quantities = solution.quantities if solution.quantities is not None else (None, None, None)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (model_key(scenario), solution.status, solution.objective, *quantities, time.time()),
+        )
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+
+    def evict(self):
+        """Descarta as entradas usadas há mais tempo além de ``max_entries``."""
+        self._connect().execute(
+            "DELETE FROM solutions WHERE key IN ("
+            "SELECT key FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self):
+        self._connect().execute("DELETE FROM solutions")
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self.evict()
+            self._connection.close()
+        self._connection = None
+        self._pid = None
@@ -0,0 +1,213 @@
+"""Tabela de lucro ótimo para todas as capacidades, por programação dinâmica.
+
+As capacidades (300 horas de processamento, 450 de armazenamento e o
+orçamento de 150000) são fixas em cada script, e testar outro valor exige
+uma nova varredura. Como as quantidades são inteiras e pequenas, o modelo de
+Find_Best_Solution_BF.py é uma mochila limitada com várias capacidades:
+``capacity_table`` calcula, numa única passagem, o lucro ótimo de cada
+combinação de capacidades dos recursos tabelados, de zero até o máximo
+informado. Perguntas de planejamento viram consultas à tabela::
+
+    table = capacity_table(scenario, {"processing": 600, "storage": 900})
+    table.lookup(processing=250, storage=450), table.lookup(processing=350, storage=450)
+
+A programação dinâmica trata cada pacote como uma mochila limitada
+(decomposição binária da quantidade em itens 0/1) sobre uma grade com uma
+dimensão por recurso tabelado. Requisitos:
+
+- coeficientes de restrição inteiros e não negativos (em unidades de ``steps``);
+- limites inferiores finitos (o canto inferior é descontado das capacidades);
+- as restrições não tabeladas precisam ser folgadas em toda a tabela; caso
+  contrário o recurso deve entrar em ``maxima``.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import INFEASIBLE, OPTIMAL, Solution
+
+_EPS = 1e-9
+
+
+class CapacityTable(namedtuple("CapacityTable", ["resources", "capacities", "status", "objectives", "quantities"])):
+    """Soluções ótimas numa grade de capacidades (uma dimensão por recurso em ``resources``).
+
+    ``capacities`` traz os valores de cada eixo; ``status``, ``objectives`` e
+    ``quantities`` têm a forma da grade (mais 3 nas quantidades), com NaN onde
+    não há solução.
+    """
+
+    __slots__ = ()
+
+    def index(self, **capacities):
+        """Posição na grade das capacidades informadas (uma por recurso tabelado)."""
+        if set(capacities) != set(self.resources):
+            raise ValueError(f"Informe as capacidades de {', '.join(self.resources)}")
+        position = []
+        for name, axis in zip(self.resources, self.capacities):
+            value = capacities[name]
+            if not axis[0] <= value <= axis[-1] + _EPS:
+                raise ValueError(f"Capacidade de {name} fora da tabela: {value} (0 a {axis[-1]})")
+            # O consumo é múltiplo do passo, então vale a maior capacidade tabelada que não passa do valor
+            position.append(int(np.searchsorted(axis, value + _EPS, side="right")) - 1)
+        return tuple(position)
+
+    def lookup(self, **capacities):
+        """``Solution`` do cenário com as capacidades informadas."""
+        position = self.index(**capacities)
+        status = int(self.status[position])
+        if status != OPTIMAL:
+            return Solution(status, None, None)
+        return Solution(status, float(self.objectives[position]), tuple(self.quantities[position].tolist()))
+
+
+def _integer(values, name):
+    rounded = np.round(values)
+    if not np.allclose(values, rounded, rtol=0, atol=1e-9):
+        raise ValueError(f"A tabela de {name} exige consumos inteiros (múltiplos do passo)")
+    return rounded.astype(np.int64)
+
+
+def _knapsack(values, weights, counts, shape):
+    # Mochila limitada na grade: cada quantidade é decomposta em itens 0/1 de 1, 2, 4, ... unidades
+    best = np.zeros(shape)
+    chosen = np.zeros(shape + (len(values),), dtype=np.int64)
+    for j, (value, weight, count) in enumerate(zip(values, weights, counts)):
+        if value <= 0:
+            continue
+        piece, remaining = 1, count
+        while remaining > 0:
+            units = min(piece, remaining)
+            remaining -= units
+            piece *= 2
+            shift = units * weight
+            if (shift >= np.array(shape)).any():
+                continue
+            target = tuple(slice(s, None) for s in shift)
+            source = tuple(slice(0, size - s) for s, size in zip(shift, shape))
+            candidate = best[source] + units * value
+            better = candidate > best[target] + _EPS
+            previous = chosen[source].copy()
+            previous[..., j] += units
+            best[target][better] = candidate[better]
+            chosen[target][better] = previous[better]
+    return chosen
+
+
+def capacity_table(scenario, maxima=None, steps=None):
+    """Lucro ótimo do ``scenario`` para todas as capacidades dos recursos em ``maxima``.
+
+    ``maxima`` associa o nome da restrição (``"processing"``, ``"storage"`` ou
+    ``"infrastructure_budget"``) à maior capacidade tabelada; por padrão,
+    processamento e armazenamento até o dobro das capacidades do cenário.
+    ``steps`` dá o intervalo entre capacidades de cada recurso (padrão 1; o
+    orçamento com custos 100/150/200 pode usar 50). As demais restrições ficam
+    com os valores do cenário. Retorna uma ``CapacityTable``.
+    """
+    if maxima is None:
+        maxima = {"processing": 2 * scenario.processing_capacity, "storage": 2 * scenario.storage_capacity}
+    steps = steps or {}
+    rows = {name: (np.array(row), rhs) for name, row, rhs in scenario.constraint_rows()}
+    unknown = set(maxima) - set(rows)
+    if unknown:
+        raise ValueError(f"Recursos sem restrição no cenário: {', '.join(sorted(unknown))}")
+    if None in scenario.lower_bounds:
+        raise ValueError("A tabela de capacidades exige limites inferiores finitos")
+    if any(row.min() < 0 for row, _ in rows.values()):
+        raise ValueError("A tabela de capacidades exige coeficientes de restrição não negativos")
+
+    resources = list(maxima)
+    coefficients = np.array(scenario.objective_coefficients())
+    lower = np.array(scenario.lower_bounds, dtype=float)
+    upper = np.array([np.inf if up is None else up for up in scenario.upper_bounds], dtype=float)
+    lower, upper = np.ceil(lower - _EPS), np.floor(upper + _EPS)
+
+    # Grade em unidades do passo: índice k de cada eixo é a capacidade k * passo
+    axes, weights, base = [], [], []
+    for name in resources:
+        step = steps.get(name, 1)
+        weight = _integer(rows[name][0] / step, name)
+        axes.append(np.arange(int(np.floor(maxima[name] / step + _EPS)) + 1) * step)
+        weights.append(weight)
+        base.append(int(weight @ lower))
+    weights = np.array(weights).T  # (pacote, recurso)
+    shape = tuple(len(axis) for axis in axes)
+    size = np.array(shape) - 1 - np.array(base)
+
+    # Acréscimo máximo de cada pacote sobre o limite inferior (pelos limites e por todas as restrições)
+    fixed = {name: value for name, value in rows.items() if name not in maxima}
+    counts = upper - lower
+    for j in range(3):
+        for r in range(len(resources)):
+            if weights[j, r] > 0:
+                counts[j] = min(counts[j], np.floor(size[r] / weights[j, r]))
+        for row, rhs in fixed.values():
+            if row[j] > 0:
+                counts[j] = min(counts[j], np.floor((rhs - row @ lower) / row[j] + _EPS))
+    counts = np.where(coefficients > 0, counts, 0)
+
+    status = np.full(shape, INFEASIBLE, dtype=np.int8)
+    objectives = np.full(shape, np.nan)
+    quantities = np.full(shape + (3,), np.nan)
+    infeasible = (lower > upper).any() or (size < 0).any()
+    infeasible = infeasible or any(row @ lower > rhs + _EPS for row, rhs in fixed.values())
+    if infeasible:
+        return CapacityTable(resources, axes, status, objectives, quantities)
+    if np.isinf(counts).any():
+        raise ValueError("Cenário ilimitado: um pacote com lucro positivo não tem limite superior")
+    for name, (row, rhs) in fixed.items():
+        if row @ (lower + counts) > rhs + _EPS:
+            raise ValueError(f"A restrição {name} pode ficar ativa na tabela; inclua-a em ``maxima``")
+
+    # Capacidades abaixo do consumo do canto inferior são inviáveis; as demais deslocam a grade
+    chosen = _knapsack(coefficients, weights, counts.astype(np.int64), tuple(size + 1))
+    feasible = tuple(slice(b, None) for b in base)
+    status[feasible] = OPTIMAL
+    quantities[feasible] = lower + chosen
+    objectives[feasible] = quantities[feasible] @ coefficients
+    return CapacityTable(resources, axes, status, objectives, quantities)
+
+
+if __name__ == "__main__":
+    import time
+    import warnings
+
+    from Find_Best_Solution_BF import scenario
+    from Solver_Model import PricingModel, Scenario
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    # Cenário de Find_Best_Solution_BF.py: processamento x armazenamento até o dobro das capacidades
+    start = time.perf_counter()
+    table = capacity_table(scenario)
+    elapsed = time.perf_counter() - start
+    print(f"Tabela {table.status.shape} ({table.status.size} capacidades) em {elapsed:.3f} s")
+    for hours in (250, 300, 350):
+        solution = table.lookup(processing=hours, storage=scenario.storage_capacity)
+        print(f"{hours} horas de processamento: lucro {solution.objective}, quantidades {solution.quantities}")
+
+    # Conferência com o PuLP nos cenários dos scripts, em capacidades sorteadas até as do cenário
+    # (com o dobro, o orçamento fica ativo nos custos mais altos) e numa tabela que inclui o orçamento
+    base = Scenario.from_base(100, 100)
+    cases = [(scenario, None)] + [
+        (Scenario.from_base(base_price, base_cost), {"processing": 300, "storage": 450})
+        for base_price in (50, 100, 250) for base_cost in (50, 100, 200)
+    ] + [(base, {"processing": 100, "storage": 150, "infrastructure_budget": 15000})]
+    rng = np.random.default_rng(0)
+    model = PricingModel()
+    checked = mismatches = 0
+    for current, maxima in cases:
+        table = capacity_table(current, maxima, steps={"infrastructure_budget": 50})
+        for _ in range(20):
+            capacities = {name: int(rng.integers(0, axis[-1] + 1)) for name, axis in zip(table.resources, table.capacities)}
+            expected = model.solve(current.replace(**{
+                {"processing": "processing_capacity", "storage": "storage_capacity"}.get(name, name): value
+                for name, value in capacities.items()
+            }))
+            found = table.lookup(**capacities)
+            checked += 1
+            if expected.status != found.status or (
+                found.status == OPTIMAL and abs(expected.objective - found.objective) > 1e-6
+            ):
+                mismatches += 1
+    print(f"Conferência com o PuLP: {checked - mismatches} de {checked} iguais")
@@ -0,0 +1,224 @@
+"""Cache de soluções ótimas com certificado de otimalidade.
+
+Nas varreduras de preço e custo a solução ótima muda em poucos pontos, mas
+cada ponto paga uma resolução inteira. O ``CertifiedCache`` guarda, para cada
+solução ótima encontrada, um certificado que vale também para outros
+coeficientes:
+
+- as variáveis duais ``y`` da relaxação linear (HiGHS, pelo SciPy): para
+  qualquer ``y >= 0``, ``b·y + max (c - Aᵀy)·q`` sobre a caixa de limites das
+  variáveis é um limite superior do lucro, com os ``A``, ``b`` e ``c`` do novo
+  cenário (os custos reduzidos ``c - Aᵀy`` decidem o máximo na caixa);
+- o próprio lucro ótimo ``z`` com o objetivo ``c0`` do cenário resolvido: se a
+  região viável é a mesma (``Solver_Sweep.feasible_region``),
+  ``α z + max (c - α c0)·q`` também é limite superior para todo ``α >= 0``.
+
+Se uma solução guardada continua viável no novo cenário e o seu lucro atinge
+o menor desses limites (arredondado para baixo quando o objetivo é inteiro),
+ela é ótima e o cenário é respondido sem o solver. Os limites são funções
+lineares por partes e convexas de ``α``, avaliadas nos pontos de quebra, para
+todas as entradas de uma vez. Inviabilidade também é reaproveitada, pela
+região viável.
+
+Exemplo::
+
+    cache = CertifiedCache(PricingModel())
+    profits = [cache.solve(scenario).objective for scenario in scenarios]
+    print(cache.summary())  # acertos, resoluções e fração economizada
+"""
+import numpy as np
+
+from Solver_Model import INFEASIBLE, OPTIMAL, PricingModel, Solution
+from Solver_Sweep import feasible_region
+from Solver_Vectorized import implied_upper, scenario_arrays
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # SciPy não instalado: só o certificado pelo lucro ótimo
+    linprog = None
+
+_EPS = 1e-9
+
+
+def _arrays(scenario):
+    # Arrays do cenário só com as restrições ativas (sem orçamento, a linha de lado direito infinito sai)
+    objective, rows, rhs, lower, upper = (array[0] for array in scenario_arrays([scenario]))
+    active = np.isfinite(rhs)
+    return objective, rows[active], rhs[active], lower, upper
+
+
+def _duals(objective, rows, rhs, lower, upper):
+    # Duais das restrições na relaxação linear (zeros sem o SciPy ou se a relaxação falhar)
+    if linprog is None:
+        return np.zeros(len(rhs))
+    bounds = [(low, None if np.isinf(up) else up) for low, up in zip(lower, upper)]
+    relaxation = linprog(-objective, A_ub=rows, b_ub=rhs, bounds=bounds, method="highs")
+    if relaxation.status != 0:
+        return np.zeros(len(rhs))
+    return np.maximum(-relaxation.ineqlin.marginals, 0)
+
+
+def _box_bound(alphas, base, gradient, objective, lower, upper):
+    # min sobre α de α·base + max_{lower <= q <= upper} (objective - α·gradient)·q; formas (E, A), (E,), (E, 3)
+    reduced = objective[None, None, :] - alphas[:, :, None] * gradient[:, None, :]
+    best = np.maximum(reduced * lower, reduced * upper).sum(axis=2)
+    return (alphas * base[:, None] + best).min(axis=1)
+
+
+def _breakpoints(objective, gradient):
+    # α onde algum custo reduzido troca de sinal, mais 0 e 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(gradient != 0, objective[None, :] / gradient, 0.0)
+    alphas = np.concatenate([np.zeros((len(gradient), 1)), np.ones((len(gradient), 1)), ratios], axis=1)
+    return np.maximum(alphas, 0.0)
+
+
+def _region(scenario):
+    # Região viável hashable: restrições (sem o orçamento redundante) e limites
+    rows, lower, upper = feasible_region(scenario)
+    return tuple(rows), lower, upper
+
+
+class CertifiedCache:
+    """Responde cenários com soluções já encontradas quando um certificado prova a otimalidade.
+
+    ``model`` resolve os cenários sem certificado (por padrão, um
+    ``PricingModel``). ``solve(scenario, initial=None)`` tem a mesma interface
+    do ``PricingModel``, então o cache pode substituí-lo em ``sweep`` e
+    ``parametric_sweep``. ``hits`` e ``misses`` contam as respostas do cache
+    e as resoluções.
+    """
+
+    def __init__(self, model=None):
+        self.model = model if model is not None else PricingModel()
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # número de restrições -> listas de quantidades, duais, objetivos, lucros e regiões
+        self._regions = {}  # região viável -> identificador
+        self._infeasible = set()
+
+    def __len__(self):
+        return sum(len(entries["regions"]) for entries in self._entries.values())
+
+    def summary(self):
+        total = self.hits + self.misses
+        saved = self.hits / total if total else 0.0
+        return f"{total} cenários: {self.hits} certificados pelo cache, {self.misses} resolvidos ({saved:.0%} economizados)"
+
+    def lookup(self, scenario):
+        """``Solution`` certificada para o cenário, ou None se nenhuma entrada vale."""
+        region = self._regions.get(_region(scenario))
+        if region in self._infeasible:
+            return Solution(INFEASIBLE, None, None)
+        objective, rows, rhs, lower, upper = _arrays(scenario)
+        entries = self._entries.get(len(rhs))
+        if not entries or not np.isfinite(lower).all():
+            return None
+        upper = implied_upper(rows[None], rhs[None], lower[None], upper[None])[0]
+        if np.isinf(upper[objective > 0]).any():
+            return None
+        lower = np.ceil(lower - _EPS)
+
+        quantities = np.array(entries["quantities"])
+        feasible = ((quantities @ rows.T) <= rhs + _EPS).all(axis=1)
+        feasible &= ((quantities >= lower - _EPS) & (quantities <= upper + _EPS)).all(axis=1)
+        if not feasible.any():
+            return None
+
+        # Limite pelos duais da relaxação (com as restrições do novo cenário)
+        duals = np.array(entries["duals"])[feasible]
+        gradient = duals @ rows
+        bound = _box_bound(_breakpoints(objective, gradient), duals @ rhs, gradient, objective, lower, upper)
+        # Limite pelo lucro ótimo guardado, apenas na mesma região viável
+        same = np.array(entries["regions"])[feasible] == region
+        if same.any():
+            previous = np.array(entries["objectives"])[feasible][same]
+            profits = np.array(entries["profits"])[feasible][same]
+            bound[same] = np.minimum(
+                bound[same], _box_bound(_breakpoints(objective, previous), profits, previous, objective, lower, upper)
+            )
+        if np.allclose(objective, np.round(objective), rtol=0, atol=1e-9):
+            bound = np.floor(bound + 1e-6)
+
+        values = quantities[feasible] @ objective
+        certified = np.flatnonzero(values >= bound - 1e-6 * np.maximum(1, np.abs(bound)))
+        if not len(certified):
+            return None
+        best = quantities[feasible][certified[0]]
+        return Solution(OPTIMAL, float(best @ objective), tuple(float(q) for q in best))
+
+    def add(self, scenario, solution):
+        """Guarda a solução resolvida (ótima ou inviável) com o seu certificado."""
+        region = self._regions.setdefault(_region(scenario), len(self._regions))
+        if solution.status == INFEASIBLE:
+            self._infeasible.add(region)
+            return
+        if solution.status != OPTIMAL:
+            return
+        objective, rows, rhs, lower, upper = _arrays(scenario)
+        entries = self._entries.setdefault(
+            len(rhs), {"quantities": [], "duals": [], "objectives": [], "profits": [], "regions": []}
+        )
+        entries["quantities"].append(solution.quantities)
+        entries["duals"].append(_duals(objective, rows, rhs, np.ceil(lower - _EPS), np.floor(upper + _EPS)))
+        entries["objectives"].append(objective)
+        entries["profits"].append(solution.objective)
+        entries["regions"].append(region)
+
+    def solve(self, scenario=None, initial=None):
+        """Resolve o cenário, pelo cache quando há certificado; retorna um ``Solution``."""
+        scenario = scenario if scenario is not None else self.model.scenario
+        solution = self.lookup(scenario)
+        if solution is not None:
+            self.hits += 1
+            return solution
+        self.misses += 1
+        solution = self.model.solve(scenario, initial=initial)
+        self.add(scenario, solution)
+        return solution
+
+
+if __name__ == "__main__":
+    import time
+    import warnings
+
+    from Solver_Model import Scenario
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    # Grade preço base x custo base de Find_Best_Solution_Multiplot_compare.py, conferida com o CBC
+    scenarios = [
+        Scenario.from_base(base_price, base_cost)
+        for base_price in range(50, 201, 10) for base_cost in range(50, 201, 10)
+    ]
+    cache = CertifiedCache()
+    start = time.perf_counter()
+    solutions = [cache.solve(scenario) for scenario in scenarios]
+    elapsed = time.perf_counter() - start
+    print(f"{cache.summary()} em {elapsed:.2f} s")
+
+    model = PricingModel()
+    start = time.perf_counter()
+    expected = [model.solve(scenario) for scenario in scenarios]
+    print(f"Sem o cache: {len(scenarios)} resoluções em {time.perf_counter() - start:.2f} s")
+    mismatches = sum(
+        a.status != b.status or (a.status == OPTIMAL and abs(a.objective - b.objective) > 1e-6)
+        for a, b in zip(solutions, expected)
+    )
+    print(f"Divergências em relação ao CBC: {mismatches}")
+
+    # Coeficientes grandes e fracionários: o limite não pode ser arredondado como se fosse inteiro
+    base = Scenario(
+        process=(1, 1, 1), drive=(1, 1, 1), processing_capacity=1, storage_capacity=1, infrastructure_budget=None,
+        lower_bounds=(0, 0, 0), upper_bounds=(None, None, 0), net_profit=False,
+    )
+    fractional = CertifiedCache()
+    fractional.solve(base.replace(prices=(100000, 100000.5, 0)))
+    scenario = base.replace(prices=(100000.5, 100000, 0))
+    found, expected = fractional.solve(scenario), model.solve(scenario)
+    print(f"Coeficientes fracionários: cache {found.objective}, CBC {expected.objective}")
+
+    start = time.perf_counter()
+    for scenario in scenarios[:50]:
+        cache.lookup(scenario)
+    print(f"Consulta ao cache: {(time.perf_counter() - start) / 50 * 1e6:.0f} µs por cenário")
@@ -0,0 +1,143 @@
+"""Gravação incremental de resultados de varreduras, com checkpoint e retomada.
+
+Cada bloco de pontos resolvidos vira um arquivo NPZ (colunas NumPy) no
+diretório da varredura e, só depois dele gravado, o ``checkpoint.json`` é
+atualizado com o número de pontos concluídos. As duas gravações são atômicas
+(arquivo temporário + ``os.replace``): uma execução interrompida retoma do
+último bloco concluído e os resultados podem ser lidos depois com
+``ResultStore.load`` sem resolver nada de novo.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from Solver_Cache import canonical_model
+from Solver_Vectorized import BatchResult
+
+DEFAULT_DIRECTORY = os.environ.get("SWEEP_RESULTS_DIR", ".sweeps")
+
+_CHECKPOINT = "checkpoint.json"
+
+
+def run_key(*arrays):
+    """Identificador (SHA-256) de uma varredura a partir dos arrays que a definem."""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write):
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class ResultStore:
+    """Resultados de uma varredura gravados em blocos NPZ no diretório ``directory``.
+
+    ``key`` identifica a varredura (ver ``run_key``); se o diretório tiver
+    blocos de outra varredura, eles são descartados e a varredura recomeça.
+
+    Exemplo::
+
+        store = ResultStore(".sweeps/precificacao", run_key(prices))
+        for start, stop in store.pending(len(prices)):
+            ...
+            store.append(start, stop, prices=prices[start:stop], objectives=objectives)
+        table = store.load()
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, key=None, chunk_size=1000):
+        self.directory = directory
+        self.key = key
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+        checkpoint = self._read_checkpoint()
+        if checkpoint is None or checkpoint["key"] != key:
+            self._reset()
+        else:
+            self._state = checkpoint
+
+    @property
+    def _checkpoint_path(self):
+        return os.path.join(self.directory, _CHECKPOINT)
+
+    def _read_checkpoint(self):
+        try:
+            with open(self._checkpoint_path) as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_checkpoint(self, completed, chunks):
+        state = {"key": self.key, "completed": completed, "chunks": chunks}
+        _write_atomic(self._checkpoint_path, lambda file: file.write(json.dumps(state).encode()))
+        self._state = state
+
+    def _chunk_path(self, number):
+        return os.path.join(self.directory, f"chunk_{number:06d}.npz")
+
+    def _reset(self):
+        for path in glob.glob(os.path.join(self.directory, "chunk_*.npz*")):
+            os.remove(path)
+        self._write_checkpoint(0, 0)
+
+    @property
+    def completed(self):
+        """Número de pontos já gravados (a varredura retoma a partir daqui)."""
+        return self._state["completed"]
+
+    def pending(self, total):
+        """Intervalos ``(start, stop)`` de pontos que ainda faltam, em blocos de ``chunk_size``."""
+        for start in range(self.completed, total, self.chunk_size):
+            yield start, min(start + self.chunk_size, total)
+
+    def append(self, start, stop, **columns):
+        """Grava o bloco de pontos ``start:stop`` (colunas com ``stop - start`` linhas)."""
+        if start != self.completed:
+            raise ValueError(f"Bloco fora de ordem: esperado início {self.completed}, recebido {start}")
+        for name, column in columns.items():
+            if len(column) != stop - start:
+                raise ValueError(f"A coluna {name!r} tem {len(column)} linhas, esperado {stop - start}")
+        number = self._state["chunks"]
+        _write_atomic(
+            self._chunk_path(number), lambda file: np.savez(file, start=start, stop=stop, **columns)
+        )
+        self._write_checkpoint(stop, number + 1)
+
+    def load(self):
+        """Colunas de todos os blocos concluídos, concatenadas (dicionário nome -> array)."""
+        chunks = []
+        for number in range(self._state["chunks"]):
+            with np.load(self._chunk_path(number)) as data:
+                chunks.append({name: data[name] for name in data.files if name not in ("start", "stop")})
+        if not chunks:
+            return {}
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def checkpointed_solve(scenarios, solve_batch, directory=DEFAULT_DIRECTORY, chunk_size=1000):
+    """Resolve os cenários em blocos com ``solve_batch``, gravando cada bloco e retomando de onde parou.
+
+    ``solve_batch`` recebe uma lista de ``Scenario`` e retorna um ``BatchResult``
+    (por exemplo, ``get_backend("highs").solve_batch``). Retorna o ``BatchResult``
+    completo, lido dos blocos gravados.
+    """
+    key = hashlib.sha256("\n".join(canonical_model(scenario) for scenario in scenarios).encode()).hexdigest()
+    store = ResultStore(directory, key, chunk_size)
+    for start, stop in store.pending(len(scenarios)):
+        status, objectives, quantities = solve_batch(scenarios[start:stop])
+        store.append(start, stop, status=status, objectives=objectives, quantities=quantities)
+    table = store.load()
+    if not table:
+        return BatchResult(np.empty(0, dtype=np.int8), np.empty(0), np.empty((0, 3)))
+    return BatchResult(table["status"], table["objectives"], table["quantities"])
@@ -0,0 +1,391 @@
+"""Fila de trabalho em diretório compartilhado para distribuir varreduras entre máquinas.
+
+O coordenador divide a varredura em blocos e grava a tarefa num diretório
+visível por todas as máquinas (NFS, SMB ou um disco local nos testes);
+trabalhadores em qualquer máquina pegam blocos, resolvem e devolvem os
+resultados no mesmo diretório::
+
+    diretório/job.json                 # chave, total de pontos, tamanho do bloco e cenário base
+    diretório/inputs.npz               # colunas que variam por ponto (campos de ``Scenario``)
+    diretório/leases/chunk_000012.1    # reserva do bloco 12 (tentativa 1), com prazo
+    diretório/results/chunk_000012.npz # resultado do bloco 12
+
+A fila usa apenas operações atômicas do sistema de arquivos:
+
+- reserva: cada tentativa de um bloco é um arquivo gravado à parte e publicado
+  completo com ``os.link``, que falha se ele já existe, então só um
+  trabalhador ganha cada tentativa;
+- perda: uma reserva vencida (trabalhador morto, máquina desligada) libera a
+  tentativa seguinte para outro trabalhador; depois de ``max_attempts``
+  tentativas o bloco é gravado com status ``UNDEFINED``, como no
+  ``Solver_Parallel``;
+- resultado: gravado num arquivo temporário e publicado com ``os.replace``.
+  Um bloco resolvido duas vezes (reserva vencida de um trabalhador lento)
+  produz o mesmo arquivo, e a junção lê um resultado por bloco, então repetir
+  não altera nada.
+
+O prazo da reserva (``lease``) precisa ser maior que o tempo de um bloco, e os
+relógios das máquinas precisam estar sincronizados. ``distributed_solve``
+submete, opcionalmente sobe trabalhadores locais (processos nesta máquina,
+para testes) e junta os resultados::
+
+    python Solver_Distributed.py worker /mnt/compartilhado/precificacao   # em cada máquina
+    python MathPlotSolver_Demonstracao_Precificacao.py --queue /mnt/compartilhado/precificacao
+"""
+import dataclasses
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import time
+import uuid
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Backends import get_backend
+from Solver_Cache import canonical_model
+from Solver_Checkpoint import run_key
+from Solver_Model import UNDEFINED, Scenario
+from Solver_Presolve import NEEDS_SOLVER, solve_with_presolve
+
+_JOB = "job.json"
+_INPUTS = "inputs.npz"
+
+
+class Progress(namedtuple("Progress", ["chunks", "done", "leased", "failed"])):
+    """Situação da fila: blocos no total, concluídos, reservados por trabalhadores e desistidos."""
+
+    __slots__ = ()
+
+    def summary(self):
+        return (
+            f"{self.done} de {self.chunks} blocos concluídos, {self.leased} em andamento"
+            + (f", {self.failed} sem solução" if self.failed else "")
+        )
+
+
+def _lease_path(directory, number, attempt):
+    return os.path.join(directory, "leases", f"chunk_{number:06d}.{attempt}")
+
+
+def _result_path(directory, number):
+    return os.path.join(directory, "results", f"chunk_{number:06d}.npz")
+
+
+def _publish(path, write, exclusive=False):
+    # Como em Solver_Checkpoint, mas com um temporário por gravação: dois trabalhadores
+    # podem publicar o mesmo bloco ao mesmo tempo. Com ``exclusive``, o arquivo completo
+    # é ligado ao destino com ``os.link``, que falha (FileExistsError) se ele já existe
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary, "wb") as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    if not exclusive:
+        os.replace(temporary, path)
+        return
+    try:
+        os.link(temporary, path)
+    finally:
+        os.remove(temporary)
+
+
+def _read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _scenario_fields(scenario):
+    fields = dataclasses.asdict(scenario)
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in fields.items()}
+
+
+def _base_scenario(fields):
+    return Scenario(**{name: tuple(value) if isinstance(value, list) else value for name, value in fields.items()})
+
+
+def submit(directory, base, columns, chunk_size=1000):
+    """Grava a varredura na fila: ``base`` com os campos de ``columns`` trocados ponto a ponto.
+
+    ``columns`` associa campos de ``Scenario`` a arrays com uma linha por ponto
+    (forma (N, 3) para as tuplas, (N,) para os escalares). Se o diretório já
+    tem a mesma varredura, nada muda e os blocos concluídos são aproveitados
+    (com o ``chunk_size`` já gravado); se tem outra, ela é descartada.
+    Retorna a chave da varredura.
+    """
+    columns = {name: np.asarray(column) for name, column in columns.items()}
+    unknown = set(columns) - {field.name for field in dataclasses.fields(Scenario)}
+    if unknown:
+        raise ValueError(f"Campos desconhecidos de Scenario: {', '.join(sorted(unknown))}")
+    total = len(next(iter(columns.values())))
+    if any(len(column) != total for column in columns.values()):
+        raise ValueError("Todas as colunas precisam ter o mesmo número de pontos")
+
+    key = run_key(np.frombuffer(canonical_model(base).encode(), dtype=np.uint8), *columns.values())
+    job = _read_json(os.path.join(directory, _JOB))
+    if job is not None and job["key"] == key:
+        return key
+    for name in ("leases", "results"):
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        os.makedirs(os.path.join(directory, name))
+    _publish(os.path.join(directory, _INPUTS), lambda file: np.savez(file, **columns))
+    job = {
+        "key": key, "total": total, "chunk_size": chunk_size, "chunks": -(-total // chunk_size),
+        "columns": list(columns), "base": _scenario_fields(base),
+    }
+    # O job.json é gravado por último: os trabalhadores só começam com a tarefa completa
+    _publish(os.path.join(directory, _JOB), lambda file: file.write(json.dumps(job).encode()))
+    return key
+
+
+def _load_job(directory):
+    job = _read_json(os.path.join(directory, _JOB))
+    if job is None:
+        return None, None
+    with np.load(os.path.join(directory, _INPUTS)) as data:
+        columns = {name: data[name] for name in job["columns"]}
+    return job, columns
+
+
+def _done(directory, job):
+    done = set()
+    for path in glob.glob(os.path.join(directory, "results", "chunk_*.npz")):
+        done.add(int(os.path.basename(path)[6:12]))
+    return {number for number in done if number < job["chunks"]}
+
+
+def _leases(directory):
+    # Última tentativa de cada bloco reservado
+    latest = {}
+    for name in os.listdir(os.path.join(directory, "leases")):
+        stem, _, attempt = name.partition(".")
+        if stem.startswith("chunk_") and attempt.isdigit():
+            number = int(stem[6:])
+            latest[number] = max(latest.get(number, 0), int(attempt))
+    return latest
+
+
+def _live(directory, number, attempt, now):
+    lease = _read_json(_lease_path(directory, number, attempt))
+    # As reservas são publicadas completas: uma ilegível (corrompida) conta como vencida
+    return lease is not None and lease["expires"] > now
+
+
+def progress(directory):
+    """``Progress`` da varredura no diretório (blocos reservados com prazo ainda válido)."""
+    job = _read_json(os.path.join(directory, _JOB))
+    if job is None:
+        return Progress(0, 0, 0, 0)
+    done = _done(directory, job)
+    now = time.time()
+    leased = sum(
+        number not in done and _live(directory, number, attempt, now)
+        for number, attempt in _leases(directory).items()
+    )
+    failed = 0
+    for number in done:
+        with np.load(_result_path(directory, number)) as data:
+            failed += bool(data["failed"])
+    return Progress(job["chunks"], len(done), leased, failed)
+
+
+def _bounds(job, number):
+    start = number * job["chunk_size"]
+    return start, min(start + job["chunk_size"], job["total"])
+
+
+def _write_result(directory, job, number, worker, status, objectives, quantities, classes, failed=False):
+    start, stop = _bounds(job, number)
+    _publish(_result_path(directory, number), lambda file: np.savez(
+        file, key=job["key"], start=start, stop=stop, worker=worker, failed=failed,
+        status=status, objectives=objectives, quantities=quantities, classes=classes,
+    ))
+
+
+def _give_up(directory, job, number, worker):
+    start, stop = _bounds(job, number)
+    size = stop - start
+    _write_result(
+        directory, job, number, worker, np.full(size, UNDEFINED, dtype=np.int8), np.full(size, np.nan),
+        np.full((size, 3), np.nan), np.full(size, NEEDS_SOLVER, dtype=np.int8), failed=True,
+    )
+
+
+def _claim(directory, job, worker, lease, max_attempts):
+    # Primeiro bloco sem resultado e sem reserva ativa; None se não há nenhum disponível agora
+    done = _done(directory, job)
+    leases = _leases(directory)
+    now = time.time()
+    for number in range(job["chunks"]):
+        if number in done:
+            continue
+        attempt = leases.get(number, 0)
+        if attempt and _live(directory, number, attempt, now):
+            continue
+        if attempt >= max_attempts:
+            _give_up(directory, job, number, worker)
+            continue
+        content = json.dumps({"worker": worker, "expires": now + lease}).encode()
+        try:
+            _publish(_lease_path(directory, number, attempt + 1), lambda file: file.write(content), exclusive=True)
+        except FileExistsError:
+            continue  # Outro trabalhador pegou esta tentativa
+        return number
+    return None
+
+
+def _solve(job, columns, number, backend):
+    base = _base_scenario(job["base"])
+    start, stop = _bounds(job, number)
+    scenarios = [
+        base.replace(**{
+            name: tuple(column[index].tolist()) if column.ndim > 1 else column[index].item()
+            for name, column in columns.items()
+        })
+        for index in range(start, stop)
+    ]
+    result, classes = solve_with_presolve(scenarios, backend)
+    return result.status, result.objectives, result.quantities, classes
+
+
+def work(directory, backend=None, worker=None, lease=600.0, max_attempts=3, poll=1.0, limit=None):
+    """Trabalhador: pega blocos da fila em ``directory``, resolve e grava os resultados.
+
+    ``backend`` resolve os cenários que a pré-resolução não resolve (por
+    padrão, HiGHS com o CBC como reserva). Espera a tarefa aparecer e termina
+    quando todos os blocos têm resultado, ou depois de ``limit`` blocos.
+    Retorna o número de blocos resolvidos por este trabalhador.
+    """
+    backend = backend if backend is not None else get_backend("highs", fallback="cbc")
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    solved = 0
+    job = key = None
+    while limit is None or solved < limit:
+        current = _read_json(os.path.join(directory, _JOB))
+        if current is None:
+            time.sleep(poll)
+            continue
+        if current["key"] != key:
+            job, columns = _load_job(directory)
+            key = job["key"]
+        number = _claim(directory, job, worker, lease, max_attempts)
+        if number is None:
+            if len(_done(directory, job)) == job["chunks"]:
+                break
+            time.sleep(poll)  # Blocos restantes reservados por outros: espera concluírem ou vencerem
+            continue
+        try:
+            results = _solve(job, columns, number, backend)
+        except Exception as error:  # Falha do solver: a tentativa vence e outro trabalhador tenta de novo
+            print(f"{worker}: bloco {number} falhou ({error!r})", file=sys.stderr)
+            continue
+        current = _read_json(os.path.join(directory, _JOB))
+        if current is None or current["key"] != key:
+            continue  # Varredura trocada enquanto o bloco era resolvido: o resultado não serve mais
+        _write_result(directory, job, number, worker, *results)
+        solved += 1
+    return solved
+
+
+def collect(directory, poll=1.0, timeout=None):
+    """Espera todos os blocos e junta os resultados, na ordem dos pontos.
+
+    Retorna um dicionário com as colunas da tarefa e ``status``,
+    ``objectives``, ``quantities``, ``classes`` (da pré-resolução) e
+    ``failed`` (pontos de blocos desistidos). Com ``timeout`` (segundos),
+    levanta ``TimeoutError`` se a fila não terminar a tempo.
+    """
+    start = time.monotonic()
+    while True:
+        job, columns = _load_job(directory)
+        if job is not None and len(_done(directory, job)) == job["chunks"]:
+            break
+        if timeout is not None and time.monotonic() - start > timeout:
+            raise TimeoutError(f"Fila incompleta em {directory}: {progress(directory).summary()}")
+        time.sleep(poll)
+
+    merged = {name: [] for name in ("status", "objectives", "quantities", "classes", "failed")}
+    for number in range(job["chunks"]):
+        with np.load(_result_path(directory, number)) as data:
+            if str(data["key"]) != job["key"] or (int(data["start"]), int(data["stop"])) != _bounds(job, number):
+                raise ValueError(f"Resultado do bloco {number} não pertence à varredura atual")
+            for name in ("status", "objectives", "quantities", "classes"):
+                merged[name].append(data[name])
+            merged["failed"].append(np.full(len(data["status"]), bool(data["failed"])))
+    columns.update({name: np.concatenate(parts) for name, parts in merged.items()})
+    return columns
+
+
+def _local_worker(directory, backend, options):
+    work(directory, get_backend(backend, fallback="cbc"), **options)
+
+
+def distributed_solve(base, columns, directory, local_workers=0, chunk_size=1000, backend="highs",
+                      lease=600.0, max_attempts=3, poll=1.0, timeout=None):
+    """Submete a varredura, sobe ``local_workers`` trabalhadores nesta máquina e junta os resultados.
+
+    Sem trabalhadores locais, espera os trabalhadores de outras máquinas
+    (``python Solver_Distributed.py worker diretório``). Retorna as colunas de
+    ``collect``.
+    """
+    submit(directory, base, columns, chunk_size)
+    options = {"lease": lease, "max_attempts": max_attempts, "poll": poll}
+    processes = [
+        multiprocessing.Process(target=_local_worker, args=(directory, backend, options), daemon=True)
+        for _ in range(local_workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        return collect(directory, poll, timeout)
+    finally:
+        for process in processes:
+            process.join(poll)
+            if process.is_alive():
+                process.terminate()
+
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    parser = argparse.ArgumentParser(description="Fila de trabalho para distribuir varreduras")
+    parser.add_argument("mode", choices=("submit", "worker", "status", "local"),
+                        help="submit: grava o cubo de preços da Precificação; worker: resolve blocos; "
+                             "status: mostra o andamento; local: submete e resolve com processos locais")
+    parser.add_argument("directory", help="diretório compartilhado da fila")
+    parser.add_argument("--workers", type=int, default=2, help="trabalhadores locais (modo local)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="pontos por bloco")
+    parser.add_argument("--backend", default="highs", help="backend de Solver_Backends")
+    parser.add_argument("--lease", type=float, default=600.0, help="prazo da reserva de um bloco (segundos)")
+    args = parser.parse_args()
+
+    if args.mode == "worker":
+        count = work(args.directory, get_backend(args.backend, fallback="cbc"), lease=args.lease)
+        print(f"{count} blocos resolvidos; {progress(args.directory).summary()}")
+    elif args.mode == "status":
+        print(progress(args.directory).summary())
+    else:
+        from MathPlotSolver_Demonstracao_Precificacao import demand_scenario, price_cube
+
+        prices, demands = price_cube()
+        columns = {"prices": prices, "upper_bounds": demands}
+        if args.mode == "submit":
+            key = submit(args.directory, demand_scenario, columns, args.chunk_size)
+            print(f"Varredura {key[:12]}: {len(prices)} pontos; {progress(args.directory).summary()}")
+        else:
+            start = time.perf_counter()
+            results = distributed_solve(
+                demand_scenario, columns, args.directory, args.workers, args.chunk_size, args.backend, args.lease
+            )
+            print(f"{len(results['status'])} pontos com {args.workers} trabalhadores em "
+                  f"{time.perf_counter() - start:.2f} s; {progress(args.directory).summary()}")
@@ -0,0 +1,155 @@
+"""Busca direta do ponto de equilíbrio (menor diferença entre as vendas dos pacotes).
+
+Os scripts de demonstração resolvem todas as combinações e só no fim calculam
+``abs(b - s) + abs(s - p) + abs(b - p)`` e o ``np.argmin``. Essa diferença é
+``2 * (max - min)`` das quantidades, então cada cenário tem um limite inferior
+barato: nenhuma solução fica abaixo do seu limite inferior nem acima do limite
+superior implícito pelas capacidades. ``equilibrium_search`` visita os cenários
+em ordem crescente desse limite (melhor primeiro) e para assim que nenhum
+cenário restante pode superar o melhor encontrado. Cenários que a
+pré-resolução já resolve (ótimo único no canto guloso) entram com o valor
+exato, sem chamar o solver.
+
+O resultado é o mesmo do ``np.argmin`` sobre a varredura completa, inclusive
+no desempate pelo primeiro índice.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import OPTIMAL, PricingModel, Solution
+from Solver_Presolve import INFEASIBLE_CLASS, TRIVIAL, classify_arrays
+from Solver_Vectorized import implied_upper, scenario_arrays
+
+# Índice do cenário de equilíbrio (None se nenhum foi aceito), sua solução, a diferença
+# nas vendas, quantas resoluções foram feitas e quantos cenários foram descartados pelo limite
+Equilibrium = namedtuple("Equilibrium", ["index", "solution", "imbalance", "solves", "pruned"])
+
+
+def imbalance(quantities):
+    """Diferença nas vendas usada pelos scripts: ``|b - s| + |s - p| + |b - p|``."""
+    basic, standard, premium = quantities
+    return abs(basic - standard) + abs(standard - premium) + abs(basic - premium)
+
+
+def imbalance_bounds(scenarios):
+    """Limite inferior da diferença nas vendas de cada cenário, sem resolver nada.
+
+    Retorna ``bounds``, a pré-resolução (``classes`` e ``result``) e a máscara
+    ``exact`` dos cenários em que o limite já é o valor exato.
+    """
+    objective, rows, rhs, lower, upper = scenario_arrays(scenarios)
+    classes, result = classify_arrays(objective, rows, rhs, lower, upper)
+
+    bounds = np.zeros(len(scenarios))
+    finite = np.isfinite(lower).all(axis=1)
+    if finite.any():
+        low = np.ceil(lower[finite] - 1e-9)
+        high = implied_upper(rows[finite], rhs[finite], low, np.floor(upper[finite] + 1e-9))
+        bounds[finite] = 2 * np.maximum(0, low.max(axis=1) - high.min(axis=1))
+
+    # Triviais com todos os coeficientes positivos têm ótimo único: o valor é exato
+    exact = (classes == TRIVIAL) & (objective > 0).all(axis=1)
+    spread = result.quantities.max(axis=1) - result.quantities.min(axis=1)
+    bounds[exact] = 2 * spread[exact]
+    bounds[classes == INFEASIBLE_CLASS] = np.inf
+    return bounds, classes, result, exact
+
+
+def equilibrium_search(scenarios, solve=None, accept=None):
+    """Encontra o cenário de menor diferença nas vendas resolvendo o mínimo possível.
+
+    ``solve`` recebe um ``Scenario`` e retorna um ``Solution`` (por padrão, um
+    ``PricingModel`` com o CBC). ``accept(index, solution)`` pode descartar
+    soluções ótimas, como o filtro de horas de MathPlotSolver_Demonstracao_Processamento.py.
+    Retorna um ``Equilibrium``.
+    """
+    solve = solve if solve is not None else PricingModel().solve
+    bounds, _, presolved, exact = imbalance_bounds(scenarios)
+
+    best_index, best_solution, best_value = None, None, np.inf
+    solves = 0
+    order = np.lexsort((np.arange(len(scenarios)), bounds))
+    for position, index in enumerate(order):
+        bound = bounds[index]
+        # Nenhum cenário daqui em diante melhora o atual (desempate pelo menor índice, como no argmin)
+        if not np.isfinite(bound) or (bound, index) > (best_value, best_index if best_index is not None else -1):
+            break
+        if exact[index]:
+            solution = Solution(
+                OPTIMAL, float(presolved.objectives[index]), tuple(float(q) for q in presolved.quantities[index])
+            )
+        else:
+            solution = solve(scenarios[index])
+            solves += 1
+        if solution.status != OPTIMAL or (accept is not None and not accept(index, solution)):
+            continue
+        value = imbalance(solution.quantities)
+        if best_index is None or (value, index) < (best_value, best_index):
+            best_index, best_solution, best_value = int(index), solution, value
+    else:
+        position = len(order)
+
+    return Equilibrium(
+        best_index,
+        best_solution,
+        best_value if best_index is not None else None,
+        solves,
+        len(order) - position,
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    from Solver_Model import Scenario
+
+    def report(name, scenarios, solve, accept=None):
+        start = time.perf_counter()
+        found = equilibrium_search(scenarios, solve, accept)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {len(scenarios)} combinações, {found.solves} resoluções, "
+              f"{found.pruned} descartadas pelo limite, {elapsed:.2f} s")
+        if found.index is not None:
+            print(f"  Índice {found.index}, vendas {found.solution.quantities}, "
+                  f"diferença {found.imbalance}, lucro {found.solution.objective}")
+        return found
+
+    # Cubo de preços de MathPlotSolver_Demonstracao_Precificacao.py
+    demand_scenario = Scenario(
+        process=(1, 1, 1), drive=(1, 1, 1), infrastructure_budget=None, lower_bounds=(0, 0, 0), net_profit=False
+    )
+    pricing = []
+    for xb_price in np.arange(50, 201, 10):
+        for xp_price in np.arange(60, 301, 10):
+            if xp_price <= xb_price:
+                continue
+            for xg_price in np.arange(70, 401, 10):
+                if xg_price <= xp_price:
+                    continue
+                pricing.append(demand_scenario.replace(
+                    prices=(xb_price, xp_price, xg_price),
+                    upper_bounds=(
+                        max(100 - 0.5 * xb_price, 0), max(80 - 0.3 * xp_price, 0), max(50 - 0.2 * xg_price, 0)
+                    ),
+                ))
+    report("Precificação", pricing, PricingModel(demand_scenario).solve)
+
+    # Cubo de horas de processamento de MathPlotSolver_Demonstracao_Processamento.py
+    processing_scenario = Scenario(
+        prices=(1000, 2000, 3000), drive=(1, 1, 1), infrastructure_budget=None, net_profit=False
+    )
+    processing = []
+    for xb_process in np.arange(1, 11):
+        for xp_process in np.arange(2, 21):
+            if xp_process <= xb_process:
+                continue
+            for xg_process in np.arange(3, 31):
+                if xg_process <= xp_process:
+                    continue
+                processing.append(processing_scenario.replace(process=(xb_process, xp_process, xg_process)))
+
+    def within_hours(index, solution):
+        return np.dot(processing[index].process, solution.quantities) <= 300
+
+    report("Processamento", processing, PricingModel(processing_scenario).solve, within_hours)
@@ -0,0 +1,179 @@
+"""Modelo matricial com N pacotes e M recursos.
+
+O ``Scenario`` e o ``PricingModel`` descrevem exatamente três pacotes e as
+restrições de processamento, armazenamento e orçamento. O ``MatrixScenario``
+descreve o mesmo modelo com vetores e matrizes:
+
+- ``prices`` e ``infrastructure_costs``: um valor por pacote (N);
+- ``consumption``: consumo de cada recurso por pacote, matriz M x N esparsa (CSR);
+- ``capacities``: capacidade de cada recurso (M);
+- ``lower_bounds`` e ``upper_bounds``: limites por pacote (-inf/inf sem limite).
+
+As restrições ``consumption @ q <= capacities`` são montadas linha a linha a
+partir da matriz CSR, com um ``LpAffineExpression`` por recurso, em vez de
+somar termos escalares. ``solve_matrix`` resolve com o CBC (PuLP) ou com o
+HiGHS do SciPy, que recebe a matriz esparsa diretamente.
+
+Os cenários dos scripts são o caso particular de três pacotes::
+
+    solution = solve_matrix(MatrixScenario.from_scenario(Scenario.from_base(100, 100)))
+"""
+import numpy as np
+from pulp import PULP_CBC_CMD, LpAffineExpression, LpConstraint, LpConstraintLE, LpMaximize, LpProblem, LpVariable
+
+from Solver_Backends import HIGHS_STATUS
+from Solver_Model import INFEASIBLE, OPTIMAL, TIERS, UNDEFINED, Solution, solution_status
+
+try:
+    from scipy import sparse
+    from scipy.optimize import Bounds, LinearConstraint, milp
+except ImportError:  # SciPy não instalado
+    sparse = None
+    milp = None
+
+_EPS = 1e-9
+
+
+def _bounds(values, count, default):
+    if values is None:
+        return np.full(count, default)
+    return np.array([default if value is None else value for value in values], dtype=float)
+
+
+class MatrixScenario:
+    """Coeficientes do modelo para N pacotes e M recursos (ver o módulo).
+
+    ``consumption`` pode ser uma lista de linhas, um array denso ou uma matriz
+    do ``scipy.sparse``; sem o SciPy, fica densa. ``net_profit=False``
+    maximiza apenas a receita.
+    """
+
+    def __init__(self, prices, consumption, capacities, infrastructure_costs=None, lower_bounds=None,
+                 upper_bounds=None, net_profit=True, tier_names=None, resource_names=None):
+        self.prices = np.asarray(prices, dtype=float)
+        count = len(self.prices)
+        self.infrastructure_costs = (
+            np.zeros(count) if infrastructure_costs is None else np.asarray(infrastructure_costs, dtype=float)
+        )
+        if sparse is not None:
+            self.consumption = sparse.csr_matrix(consumption, dtype=float)
+        else:
+            self.consumption = np.asarray(consumption, dtype=float).reshape(-1, count)
+        self.capacities = np.asarray(capacities, dtype=float)
+        self.lower_bounds = _bounds(lower_bounds, count, 0.0)
+        self.upper_bounds = _bounds(upper_bounds, count, np.inf)
+        self.net_profit = net_profit
+        self.tier_names = list(tier_names) if tier_names is not None else [f"tier_{j}" for j in range(count)]
+        self.resource_names = (
+            list(resource_names) if resource_names is not None
+            else [f"resource_{r}" for r in range(len(self.capacities))]
+        )
+        if self.consumption.shape != (len(self.capacities), count):
+            raise ValueError(
+                f"Consumo com forma {self.consumption.shape}, esperado ({len(self.capacities)}, {count})"
+            )
+
+    @classmethod
+    def from_scenario(cls, scenario):
+        """Cenário de três pacotes (``Solver_Model.Scenario``) na forma matricial."""
+        rows = scenario.constraint_rows()
+        return cls(
+            prices=scenario.prices,
+            consumption=[row for _, row, _ in rows],
+            capacities=[rhs for _, _, rhs in rows],
+            infrastructure_costs=scenario.infrastructure_costs,
+            lower_bounds=[-np.inf if low is None else low for low in scenario.lower_bounds],
+            upper_bounds=scenario.upper_bounds,
+            net_profit=scenario.net_profit,
+            tier_names=TIERS,
+            resource_names=[name for name, _, _ in rows],
+        )
+
+    @property
+    def shape(self):
+        """(recursos, pacotes)."""
+        return self.consumption.shape
+
+    def objective_coefficients(self):
+        if self.net_profit:
+            return self.prices - self.infrastructure_costs
+        return self.prices
+
+    def _rows(self):
+        # (índices, coeficientes) de cada recurso, direto das linhas da matriz CSR
+        if sparse is None:
+            for row in self.consumption:
+                indices = np.flatnonzero(row)
+                yield indices, row[indices]
+            return
+        matrix = self.consumption
+        for r in range(matrix.shape[0]):
+            start, stop = matrix.indptr[r], matrix.indptr[r + 1]
+            yield matrix.indices[start:stop], matrix.data[start:stop]
+
+
+def _pulp_bound(bound):
+    return None if np.isinf(bound) else float(bound)
+
+
+def build_matrix_model(scenario):
+    """Monta o ``LpProblem`` do cenário matricial; retorna o modelo e a lista de variáveis."""
+    model = LpProblem(name="maximize-profit", sense=LpMaximize)
+    variables = [
+        LpVariable(f"q_{name}", lowBound=_pulp_bound(low), upBound=_pulp_bound(up), cat="Integer")
+        for name, low, up in zip(scenario.tier_names, scenario.lower_bounds, scenario.upper_bounds)
+    ]
+    objective = scenario.objective_coefficients()
+    nonzero = np.flatnonzero(objective)
+    model.setObjective(LpAffineExpression(zip([variables[j] for j in nonzero], objective[nonzero].tolist())))
+    for name, (indices, coefficients), capacity in zip(scenario.resource_names, scenario._rows(), scenario.capacities):
+        expression = LpAffineExpression(zip([variables[j] for j in indices], coefficients.tolist()))
+        model.addConstraint(LpConstraint(expression, LpConstraintLE, name, float(capacity)))
+    return model, variables
+
+
+def _solution(scenario, x):
+    quantities = np.round(x) + 0.0  # + 0.0 normaliza -0.0
+    return Solution(OPTIMAL, float(scenario.objective_coefficients() @ quantities), tuple(quantities.tolist()))
+
+
+def _solve_cbc(scenario, time_limit=None):
+    model, variables = build_matrix_model(scenario)
+    model.solve(PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    status = solution_status(model)
+    if status != OPTIMAL:
+        return Solution(status, None, None)
+    return _solution(scenario, np.array([q.value() or 0.0 for q in variables]))
+
+
+def _solve_highs(scenario, time_limit=None):
+    if milp is None:
+        raise ImportError("O HiGHS precisa do SciPy (scipy.optimize.milp)")
+    lower = np.ceil(scenario.lower_bounds - _EPS)
+    upper = np.floor(scenario.upper_bounds + _EPS)
+    if (lower > upper).any():
+        return Solution(INFEASIBLE, None, None)
+    result = milp(
+        -scenario.objective_coefficients(),
+        constraints=LinearConstraint(scenario.consumption, -np.inf, scenario.capacities),
+        bounds=Bounds(lower, upper),
+        integrality=np.ones(len(lower)),
+        options={"mip_rel_gap": 0} if time_limit is None else {"time_limit": time_limit, "mip_rel_gap": 0},
+    )
+    status = HIGHS_STATUS.get(result.status, UNDEFINED)
+    if status != OPTIMAL or result.x is None:
+        return Solution(status, None, None)
+    return _solution(scenario, result.x)
+
+
+MATRIX_SOLVERS = {"cbc": _solve_cbc, "highs": _solve_highs}
+
+
+def solve_matrix(scenario, solver="cbc", time_limit=None):
+    """Resolve o ``MatrixScenario`` com ``solver`` (``"cbc"`` ou ``"highs"``); retorna um ``Solution``.
+
+    As quantidades vêm numa tupla com um valor por pacote, na ordem de ``tier_names``.
+    """
+    if solver not in MATRIX_SOLVERS:
+        raise ValueError(f"Solver desconhecido: {solver!r} (opções: {', '.join(MATRIX_SOLVERS)})")
+    return MATRIX_SOLVERS[solver](scenario, time_limit)
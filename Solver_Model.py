@@ -0,0 +1,252 @@
+"""Modelo de precificação reutilizável para as varreduras dos scripts.
+
+O ``PricingModel`` constrói o ``LpProblem`` uma única vez (variáveis, objetivo
+e restrições) e, a cada ponto da varredura, apenas troca os coeficientes,
+limites e capacidades antes de resolver novamente.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, replace
+
+from pulp import (
+    PULP_CBC_CMD,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintLE,
+    LpMaximize,
+    LpProblem,
+    LpSolutionOptimal,
+    LpVariable,
+    value,
+)
+
+# Códigos de status do PuLP usados pelos scripts
+OPTIMAL = 1
+NOT_SOLVED = 0
+INFEASIBLE = -1
+UNBOUNDED = -2
+UNDEFINED = -3
+
+TIERS = ("basic", "standard", "premium")
+
+# Resultado de uma resolução: status do PuLP, valor do objetivo e quantidades (Básico, Padrão, Premium)
+Solution = namedtuple("Solution", ["status", "objective", "quantities"])
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Coeficientes de um ponto da varredura (na ordem Básico, Padrão, Premium).
+
+    Os valores padrão reproduzem o modelo de Find_Best_Solution_BF.py.
+    ``infrastructure_budget=None`` remove a restrição de orçamento e
+    ``net_profit=False`` maximiza apenas a receita (sem descontar a infraestrutura).
+    """
+
+    prices: tuple = (100, 200, 300)
+    infrastructure_costs: tuple = (100, 150.0, 200)
+    process: tuple = (1, 2, 3)  # Índices de cálculo do processamento
+    drive: tuple = (2, 3, 4)  # Índices de cálculo do armazenamento
+    processing_capacity: float = 300  # Horas de processamento
+    storage_capacity: float = 450  # Capacidade de armazenamento
+    infrastructure_budget: float = 150000  # Orçamento de infraestrutura (None desativa)
+    lower_bounds: tuple = (30, 0, 0)  # Demanda mínima de 30 pacotes básicos
+    upper_bounds: tuple = (None, None, 15)  # Máximo de 15 pacotes premium
+    net_profit: bool = True
+
+    @classmethod
+    def from_base(cls, base_price=100, base_infrastructure_cost=100, **changes):
+        """Cenário com preços 1x/2x/3x e custos 1x/1.5x/2x dos valores base."""
+        changes.setdefault("prices", (base_price, 2 * base_price, 3 * base_price))
+        changes.setdefault(
+            "infrastructure_costs",
+            (base_infrastructure_cost, 1.5 * base_infrastructure_cost, 2 * base_infrastructure_cost),
+        )
+        return cls(**changes)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    def objective_coefficients(self):
+        """Coeficientes do objetivo para (q_basic, q_standard, q_premium)."""
+        if self.net_profit:
+            return tuple(float(p) - float(c) for p, c in zip(self.prices, self.infrastructure_costs))
+        return tuple(float(p) for p in self.prices)
+
+    def constraint_rows(self):
+        """Restrições ``<=`` ativas como tuplas (nome, coeficientes, lado direito)."""
+        rows = [
+            ("processing", tuple(float(a) for a in self.process), float(self.processing_capacity)),
+            ("storage", tuple(float(a) for a in self.drive), float(self.storage_capacity)),
+        ]
+        if self.infrastructure_budget is not None:
+            rows.append((
+                "infrastructure_budget",
+                tuple(float(a) for a in self.infrastructure_costs),
+                float(self.infrastructure_budget),
+            ))
+        return rows
+
+
+def make_scenario(fixed, **values):
+    """Monta o ``Scenario`` a partir dos valores fixos e dos valores variando (estes têm prioridade).
+
+    Os nomes são os campos de ``Scenario``, os de ``Scenario.from_base``
+    (``base_price`` e ``base_infrastructure_cost``), ``base_hours`` (horas de
+    processamento 1x/2x/3x) e um pacote de um campo por tupla, como
+    ``prices.basic`` ou ``infrastructure_costs.premium``.
+    """
+    spec = dict(fixed)
+    spec.update(values)
+    tiers = {name: spec.pop(name) for name in list(spec) if "." in name}
+    fields = {name: tuple(value) if isinstance(value, list) else value for name, value in spec.items()}
+    base_hours = fields.pop("base_hours", None)
+    if base_hours is not None:
+        fields["process"] = (base_hours, 2 * base_hours, 3 * base_hours)
+    scenario = Scenario.from_base(fields.pop("base_price", 100), fields.pop("base_infrastructure_cost", 100), **fields)
+    for name, value in tiers.items():
+        field, tier = name.split(".")
+        coefficients = list(getattr(scenario, field))
+        coefficients[TIERS.index(tier)] = value
+        scenario = scenario.replace(**{field: tuple(coefficients)})
+    return scenario
+
+
+def _bound(bound):
+    return None if bound is None else float(bound)
+
+
+def build_model(scenario):
+    """Monta o modelo do zero, como os scripts fazem em cada ponto da varredura.
+
+    Retorna o ``LpProblem`` e a tupla de variáveis (q_basic, q_standard, q_premium).
+    """
+    model = LpProblem(name="maximize-profit", sense=LpMaximize)
+    variables = tuple(
+        LpVariable(f"q_{tier}", lowBound=_bound(low), upBound=_bound(up), cat="Integer")
+        for tier, low, up in zip(TIERS, scenario.lower_bounds, scenario.upper_bounds)
+    )
+    coefficients = scenario.objective_coefficients()
+    model += sum(c * q for c, q in zip(coefficients, variables)), "Net Profit"
+    for name, row, rhs in scenario.constraint_rows():
+        model += sum(a * q for a, q in zip(row, variables)) <= rhs, name
+    return model, variables
+
+
+class PricingModel:
+    """Modelo de precificação construído uma vez e reaproveitado entre resoluções.
+
+    Exemplo::
+
+        template = PricingModel()
+        for base_price in base_prices:
+            solution = template.solve(Scenario.from_base(base_price, 100))
+
+    Com ``cache`` (um ``Solver_Cache.ScenarioCache``), cenários já resolvidos
+    são respondidos sem chamar o solver.
+    """
+
+    def __init__(self, scenario=None, solver=None, cache=None):
+        self.solver = solver if solver is not None else PULP_CBC_CMD(msg=False)
+        self.cache = cache
+        self.model = None
+        self.scenario = None
+        self.update(scenario if scenario is not None else Scenario())
+
+    def _build(self, names):
+        # Estrutura do modelo (variáveis, objetivo e restrições) com coeficientes zerados
+        self.model = LpProblem(name="maximize-profit", sense=LpMaximize)
+        self.variables = tuple(LpVariable(f"q_{tier}", lowBound=0, cat="Integer") for tier in TIERS)
+        self.q_basic, self.q_standard, self.q_premium = self.variables
+
+        self.model += LpAffineExpression([(q, 0) for q in self.variables]), "Net Profit"
+        self.constraints = {}
+        for name in names:
+            constraint = LpConstraint(
+                LpAffineExpression([(q, 0) for q in self.variables]), LpConstraintLE, name, 0
+            )
+            self.model += constraint
+            self.constraints[name] = constraint
+        self.scenario = None
+
+    def update(self, scenario):
+        """Troca os coeficientes do modelo pelos do cenário.
+
+        A estrutura só é reconstruída quando o conjunto de restrições muda
+        (por exemplo, ao ativar ou desativar o orçamento de infraestrutura).
+        """
+        if self.scenario == scenario:
+            return
+
+        rows = scenario.constraint_rows()
+        names = tuple(name for name, _, _ in rows)
+        if self.model is None or names != tuple(self.constraints):
+            self._build(names)
+
+        for q, coefficient in zip(self.variables, scenario.objective_coefficients()):
+            self.model.objective[q] = coefficient
+
+        for name, row, rhs in rows:
+            constraint = self.constraints[name]
+            for q, coefficient in zip(self.variables, row):
+                constraint.expr[q] = coefficient
+            constraint.changeRHS(rhs)
+
+        for q, low, up in zip(self.variables, scenario.lower_bounds, scenario.upper_bounds):
+            q.lowBound = _bound(low)
+            q.upBound = _bound(up)
+
+        self.scenario = scenario
+
+    def solve(self, scenario=None, initial=None):
+        """Resolve o cenário informado (ou o atual) e retorna um ``Solution``.
+
+        ``initial`` (quantidades viáveis, por exemplo a solução do ponto vizinho)
+        é passado ao CBC como solução inicial (warm start).
+        """
+        if scenario is None:
+            scenario = self.scenario
+        if self.cache is not None:
+            cached = self.cache.get(scenario)
+            if cached is not None:
+                return cached
+
+        self.update(scenario)
+        options = getattr(self.solver, "optionsDict", {})
+        warm_start = initial is not None and "warmStart" in options
+        if warm_start:
+            for q, quantity in zip(self.variables, initial):
+                q.setInitialValue(quantity, check=False)
+            previous, options["warmStart"] = options["warmStart"], True
+        try:
+            self.model.solve(self.solver)
+        finally:
+            if warm_start:
+                options["warmStart"] = previous
+        status = solution_status(self.model)
+        if status != OPTIMAL:
+            solution = Solution(status, None, None)
+        else:
+            solution = Solution(status, value(self.model.objective), tuple(q.value() for q in self.variables))
+        if self.cache is not None:
+            self.cache.put(scenario, solution)
+        return solution
+
+
+def solution_status(model):
+    """Status do ``LpProblem`` resolvido, com ``NOT_SOLVED`` quando a otimalidade não foi provada.
+
+    O CBC interrompido pelo limite de tempo com uma solução viável devolve
+    status ``Optimal``; só o ``sol_status`` distingue esse caso.
+    """
+    if model.status == OPTIMAL and model.sol_status != LpSolutionOptimal:
+        return NOT_SOLVED
+    return model.status
+
+
+def solve_rebuild(scenario, solver=None):
+    """Resolve reconstruindo o modelo inteiro (padrão original dos scripts)."""
+    model, variables = build_model(scenario)
+    model.solve(solver if solver is not None else PULP_CBC_CMD(msg=False))
+    status = solution_status(model)
+    if status != OPTIMAL:
+        return Solution(status, None, None)
+    return Solution(status, value(model.objective), tuple(q.value() for q in variables))
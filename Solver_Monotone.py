@@ -0,0 +1,108 @@
+"""Varredura com término antecipado quando a região viável só encolhe ao longo do eixo.
+
+Em MathPlotSolver_Demonstracao_Processamento.py o laço interno aumenta as
+horas de processamento do Premium: o objetivo não muda e a região viável só
+encolhe (coeficientes de restrição maiores, com quantidades não negativas).
+Nessa situação, entre dois pontos consecutivos ``k`` e ``k + 1``:
+
+- se a solução ótima em ``k`` continua viável em ``k + 1``, ela é ótima em
+  ``k + 1`` (a região de ``k + 1`` está contida na de ``k``). Em particular,
+  quando um pacote chega a zero, o consumo dele deixa de importar e o resto do
+  laço é preenchido sem chamar o solver;
+- se ``k`` é inviável, todos os pontos seguintes também são, e o laço termina.
+
+``monotone_sweep`` confere as condições (mesmo objetivo, coeficientes que não
+diminuem, capacidades e limites que não aumentam) a cada passo e só aproveita
+a solução anterior quando elas valem; nos demais casos, resolve. Com
+``verify``, uma fração dos pontos pulados é resolvida de verdade para
+confirmar o resultado::
+
+    result = monotone_sweep([scenario.replace(process=(1, 2, hours)) for hours in range(3, 31)], model)
+    result.solutions, result.solves, result.skipped
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import INFEASIBLE, OPTIMAL, PricingModel, Solution
+from Solver_Sweep import is_feasible
+
+_EPS = 1e-9
+
+
+class MonotoneResult(namedtuple("MonotoneResult", ["solutions", "solves", "skipped", "verified", "mismatches"])):
+    """Soluções da varredura (na ordem dos cenários) e contadores.
+
+    ``skipped`` conta os pontos preenchidos sem resolver; ``verified`` os
+    pulados que foram resolvidos mesmo assim (modo de verificação) e
+    ``mismatches`` os que divergiram.
+    """
+
+    __slots__ = ()
+
+    def summary(self):
+        text = f"{len(self.solutions)} pontos: {self.solves} resolvidos, {self.skipped} sem resolver"
+        if self.verified:
+            text += f" ({self.verified} conferidos, {self.mismatches} divergências)"
+        return text
+
+
+def _bounds(bounds, default):
+    return np.array([default if bound is None else bound for bound in bounds], dtype=float)
+
+
+def shrinks(previous, current):
+    """Indica se a região viável de ``current`` está contida na de ``previous``, com o mesmo objetivo."""
+    if previous.objective_coefficients() != current.objective_coefficients():
+        return False
+    rows_before = {name: (row, rhs) for name, row, rhs in previous.constraint_rows()}
+    for name, row, rhs in current.constraint_rows():
+        if name not in rows_before:
+            continue  # Restrição nova: só encolhe a região
+        row_before, rhs_before = rows_before.pop(name)
+        if rhs > rhs_before + _EPS or any(a < b - _EPS for a, b in zip(row, row_before)):
+            return False
+    if rows_before:
+        return False  # Restrição removida: a região pode crescer
+    lower_before, lower = _bounds(previous.lower_bounds, -np.inf), _bounds(current.lower_bounds, -np.inf)
+    upper_before, upper = _bounds(previous.upper_bounds, np.inf), _bounds(current.upper_bounds, np.inf)
+    # Coeficientes maiores só encolhem a região com quantidades não negativas
+    return bool((lower >= lower_before).all() and (upper <= upper_before).all() and (lower >= 0).all())
+
+
+def _same(first, second):
+    if first.status != second.status:
+        return False
+    return first.status != OPTIMAL or abs(first.objective - second.objective) <= 1e-6 * max(1, abs(first.objective))
+
+
+def monotone_sweep(scenarios, model=None, verify=0.0, rng=None):
+    """Resolve uma sequência de cenários aproveitando a monotonicidade; retorna um ``MonotoneResult``.
+
+    ``model`` resolve os pontos necessários (por padrão, um ``PricingModel``).
+    ``verify`` é a fração dos pontos pulados que também é resolvida, para
+    conferência (sorteio com ``rng``, um ``numpy.random.Generator``).
+    """
+    model = model if model is not None else PricingModel()
+    rng = rng if rng is not None else np.random.default_rng()
+    solutions = []
+    solves = skipped = verified = mismatches = 0
+    for index, scenario in enumerate(scenarios):
+        previous = solutions[-1] if solutions else None
+        reused = None
+        if previous is not None and shrinks(scenarios[index - 1], scenario):
+            if previous.status == INFEASIBLE:
+                reused = previous
+            elif previous.status == OPTIMAL and is_feasible(scenario, previous.quantities):
+                objective = sum(c * q for c, q in zip(scenario.objective_coefficients(), previous.quantities))
+                reused = Solution(OPTIMAL, float(objective), previous.quantities)
+        if reused is None:
+            solutions.append(model.solve(scenario))
+            solves += 1
+            continue
+        solutions.append(reused)
+        skipped += 1
+        if verify and rng.random() < verify:
+            verified += 1
+            mismatches += not _same(model.solve(scenario), reused)
+    return MonotoneResult(solutions, solves, skipped, verified, mismatches)
@@ -0,0 +1,184 @@
+"""Monte Carlo da demanda linear do cubo de preços, em lotes vetorizados.
+
+Em MathPlotSolver_Demonstracao_Precificacao.py a demanda de cada pacote é
+``max(base - inclinação * preço, 0)`` com base e inclinação fixas. Aqui cada
+amostra sorteia a base e a inclinação dos três pacotes (normais, com desvios
+informados) e todas as combinações de preços são avaliadas com a demanda
+dessa amostra.
+
+Todos os cenários de um bloco de amostras passam pela pré-resolução
+vetorizada (``Solver_Presolve``), que responde os que cabem inteiros na
+capacidade. Os que restam vão para o solver exato vetorizado
+(``Solver_Vectorized``), cada cenário distinto uma única vez: como as
+quantidades são inteiras, a demanda (limite superior) entra arredondada para
+baixo sem mudar a solução, e cenários com a mesma combinação e as mesmas
+demandas arredondadas são deduplicados (``np.unique``). Com ruído contínuo
+as repetições exatas são raras: no cubo do script com 1000 amostras cerca de
+14% das demandas se repetem, e com a capacidade ativa quase nenhuma. A
+economia vem da pré-resolução; ``MonteCarloResult`` informa quantos
+cenários foram ao solver e quantos eram distintos.
+
+Exemplo::
+
+    result = monte_carlo(prices, demand_scenario, base=(100, 80, 50), slope=(0.5, 0.3, 0.2),
+                         base_sd=(10, 8, 5), slope_sd=(0.05, 0.03, 0.02), samples=2000)
+    result.expected, result.quantiles, result.probability_optimal
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import OPTIMAL
+from Solver_Presolve import NEEDS_SOLVER, classify_arrays
+from Solver_Vectorized import scenario_arrays, solve_arrays
+
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+class MonteCarloResult(namedtuple("MonteCarloResult", ["profits", "quantile_levels", "pending", "solved"])):
+    """Lucro de cada amostra (linhas) em cada combinação de preços (colunas) e contadores.
+
+    ``pending`` conta os cenários que a pré-resolução não respondeu e
+    ``solved`` os distintos entre eles, os únicos enviados ao solver. Sem
+    solução ótima, o lucro da amostra é NaN.
+    """
+
+    __slots__ = ()
+
+    @property
+    def expected(self):
+        """Lucro esperado por combinação (média das amostras com solução)."""
+        return np.nanmean(self.profits, axis=0)
+
+    @property
+    def quantiles(self):
+        """Quantis ``quantile_levels`` do lucro por combinação, forma (níveis, combinações)."""
+        return np.nanquantile(self.profits, self.quantile_levels, axis=0)
+
+    @property
+    def unsolved_samples(self):
+        """Amostras em que nenhuma combinação tem solução ótima."""
+        return int(np.isnan(self.profits).all(axis=1).sum())
+
+    @property
+    def probability_optimal(self):
+        """Fração das amostras em que cada combinação tem o maior lucro (empates dividem a amostra).
+
+        Amostras sem nenhuma combinação com solução ficam de fora (ver ``unsolved_samples``).
+        """
+        solved = ~np.isnan(self.profits).all(axis=1)
+        if not solved.any():
+            return np.zeros(self.profits.shape[1])
+        profits = np.nan_to_num(self.profits[solved], nan=-np.inf)
+        best = profits == profits.max(axis=1, keepdims=True)
+        return (best / best.sum(axis=1, keepdims=True)).mean(axis=0)
+
+
+def sample_demands(prices, base, slope, base_sd, slope_sd, samples, rng):
+    """Demandas sorteadas, forma (amostras, combinações, 3), já arredondadas para baixo.
+
+    Cada amostra sorteia base e inclinação dos três pacotes (a inclinação não
+    fica negativa); a mesma amostra vale para todas as combinações de preços.
+    """
+    sampled_base = rng.normal(base, base_sd, (samples, 3))
+    sampled_slope = np.maximum(rng.normal(slope, slope_sd, (samples, 3)), 0)
+    demands = sampled_base[:, None, :] - sampled_slope[:, None, :] * prices[None, :, :]
+    return np.floor(np.maximum(demands, 0))
+
+
+def objective_coefficients(prices, scenario):
+    """Coeficientes do objetivo de cada combinação de preços, com os custos do cenário se ``net_profit``."""
+    if scenario.net_profit:
+        return prices - np.asarray(scenario.infrastructure_costs, dtype=float)
+    return prices
+
+
+def _encode(combination, demands):
+    # Chave inteira única por (combinação, demandas), para deduplicar com um ``np.unique`` 1D
+    size = int(demands.max(initial=0)) + 1
+    keys = combination.astype(np.int64)
+    for tier in range(3):
+        keys = keys * size + demands[:, tier].astype(np.int64)
+    return keys
+
+
+def solve_demands(prices, demands, scenario):
+    """Lucro ótimo para cada par (amostra, combinação); retorna também os contadores do solver.
+
+    ``demands`` tem forma (amostras, combinações, 3). Os lucros voltam com
+    forma (amostras, combinações); os contadores são os cenários que
+    precisaram do solver e os distintos entre eles (resolvidos uma vez cada).
+    """
+    count = demands.shape[1]
+    objective = objective_coefficients(prices, scenario)
+    _, rows, rhs, lower, _ = scenario_arrays([scenario])
+    classes, result = classify_arrays(objective[None], rows, rhs, lower, demands)
+    objectives, status = result.objectives, result.status
+
+    pending = np.flatnonzero(classes.reshape(-1) == NEEDS_SOLVER)
+    distinct = 0
+    if len(pending):
+        combination = pending % count
+        pending_demands = demands.reshape(-1, 3)[pending]
+        _, first, inverse = np.unique(_encode(combination, pending_demands), return_index=True, return_inverse=True)
+        distinct = len(first)
+        solved = solve_arrays(objective[combination[first]], rows, rhs, lower, pending_demands[first])
+        objectives.reshape(-1)[pending] = solved.objectives[inverse]
+        status.reshape(-1)[pending] = solved.status[inverse]
+    return np.where(status == OPTIMAL, objectives, np.nan), len(pending), distinct
+
+
+def monte_carlo(prices, scenario, base, slope, base_sd, slope_sd, samples=1000, chunk_size=100, seed=None,
+                quantile_levels=QUANTILES):
+    """Lucro de cada combinação de ``prices`` (M, 3) sob ``samples`` sorteios da demanda.
+
+    ``scenario`` fornece as restrições, os custos e ``net_profit`` (como o
+    ``demand_scenario`` do script); as amostras são processadas em blocos de
+    ``chunk_size`` para limitar a memória. Retorna um ``MonteCarloResult``.
+    """
+    prices = np.asarray(prices, dtype=float)
+    rng = np.random.default_rng(seed)
+    profits = np.empty((samples, len(prices)))
+    pending = solved = 0
+    for start in range(0, samples, chunk_size):
+        stop = min(start + chunk_size, samples)
+        demands = sample_demands(prices, base, slope, base_sd, slope_sd, stop - start, rng)
+        profits[start:stop], chunk_pending, chunk_solved = solve_demands(prices, demands, scenario)
+        pending += chunk_pending
+        solved += chunk_solved
+    return MonteCarloResult(profits, np.asarray(quantile_levels), pending, solved)
+
+
+if __name__ == "__main__":
+    import time
+
+    from Solver_Model import PricingModel, Scenario
+    from Solver_Presolve import demand_cube
+
+    # Cubo de preços de MathPlotSolver_Demonstracao_Precificacao.py; com a demanda do script
+    # quase tudo cabe na capacidade; a segunda rodada usa demandas maiores (capacidade ativa), bem
+    # mais lenta porque cada cenário vai ao solver enumerativo
+    prices, _ = demand_cube(np.arange(50, 201, 10), np.arange(60, 301, 10), np.arange(70, 401, 10))
+    scenario = Scenario(process=(1, 1, 1), drive=(1, 1, 1), infrastructure_budget=None,
+                        lower_bounds=(0, 0, 0), net_profit=False)
+    for base, base_sd, samples in [((100, 80, 50), (10, 8, 5), 1000), ((200, 150, 100), (20, 15, 10), 20)]:
+        start = time.perf_counter()
+        result = monte_carlo(prices, scenario, base, (0.5, 0.3, 0.2), base_sd, (0.05, 0.03, 0.02),
+                             samples=samples, seed=0)
+        elapsed = time.perf_counter() - start
+        points = result.profits.size
+        print(f"Demanda base {base}: {points} cenários em {elapsed:.2f} s ({points / elapsed:,.0f}/s), "
+              f"{result.pending} ao solver, {result.solved} distintos")
+
+    # Conferência com o CBC numa amostra dos cenários com capacidade ativa
+    rng = np.random.default_rng(1)
+    demands = sample_demands(prices, (200, 150, 100), (0.5, 0.3, 0.2), (20, 15, 10), (0.05, 0.03, 0.02), 2, rng)
+    profits, _, _ = solve_demands(prices, demands, scenario)
+    model = PricingModel()
+    checked = [(s, i) for s in range(2) for i in rng.choice(len(prices), 100, replace=False)]
+    mismatches = sum(
+        abs(model.solve(scenario.replace(prices=tuple(prices[i]), upper_bounds=tuple(demands[s, i]))).objective
+            - profits[s, i]) > 1e-6
+        for s, i in checked
+    )
+    print(f"Conferência com o CBC: {len(checked) - mismatches} de {len(checked)} iguais")
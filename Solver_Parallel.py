@@ -0,0 +1,206 @@
+"""Execução da grade de cenários em paralelo com um pool de processos.
+
+Cada processo mantém o seu próprio ``PricingModel`` e resolve blocos de
+pontos da grade; os resultados voltam para as mesmas posições ``[i, j]``.
+Se um processo morrer, os blocos perdidos são reenviados ponto a ponto para
+um pool novo; pontos que continuarem falhando ficam com status ``UNDEFINED``.
+"""
+import itertools
+import math
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from pulp import PULP_CBC_CMD, PulpSolverError
+
+from Solver_Model import NOT_SOLVED, OPTIMAL, UNDEFINED, PricingModel, Solution
+
+_template = None
+
+
+def _init_worker(time_limit, cache):
+    global _template
+    _template = PricingModel(solver=PULP_CBC_CMD(msg=False, timeLimit=time_limit), cache=cache)
+
+
+def _solve_chunk(indices, scenarios):
+    results = []
+    for scenario in scenarios:
+        try:
+            results.append(_template.solve(scenario))
+        except PulpSolverError:
+            results.append(Solution(UNDEFINED, None, None))
+    return indices, results
+
+
+class GridResult(namedtuple("GridResult", ["status", "objectives", "quantities", "failed"])):
+    """Resultados da grade: status e objetivo com a forma da grade, quantidades com uma dimensão extra de 3.
+
+    ``failed`` conta os pontos perdidos por falha de processo ou tempo esgotado.
+    """
+
+    __slots__ = ()
+
+    def profits(self, default=0):
+        """Lucro ótimo por ponto, com ``default`` onde não há solução ótima."""
+        return np.where(self.status == OPTIMAL, self.objectives, default)
+
+
+def _empty_result(shape):
+    return GridResult(
+        np.full(shape, NOT_SOLVED, dtype=np.int8),
+        np.full(shape, np.nan),
+        np.full(shape + (3,), np.nan),
+        0,
+    )
+
+
+def _store(result, flat_indices, solutions):
+    status = result.status.reshape(-1)
+    objectives = result.objectives.reshape(-1)
+    quantities = result.quantities.reshape(-1, 3)
+    for index, solution in zip(flat_indices, solutions):
+        status[index] = solution.status
+        if solution.status == OPTIMAL:
+            objectives[index] = solution.objective
+            quantities[index] = solution.quantities
+
+
+class WorkerPool:
+    """Pool de processos de ``worker_pool``: número de processos (``workers``) e se ficou inutilizado (``broken``).
+
+    ``broken`` é marcado por ``solve_grid`` quando um processo morre ou o tempo
+    esgota; a partir daí o pool não aceita novos blocos e deve ser substituído.
+    """
+
+    def __init__(self, workers, time_limit, cache):
+        self.workers = workers
+        self.broken = False
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(time_limit, cache)
+        )
+        self.processes = set()
+
+    def submit(self, function, *args):
+        # Os processos sobem dentro do submit: guarda os novos para poder matá-los no tempo esgotado
+        known = set(multiprocessing.active_children())
+        future = self.executor.submit(function, *args)
+        self.processes.update(set(multiprocessing.active_children()) - known)
+        return future
+
+    def terminate(self):
+        """Encerra sem esperar os blocos em andamento, matando os processos."""
+        self.broken = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def worker_pool(workers=None, time_limit=None, cache=None):
+    """Pool de processos com um ``PricingModel`` por processo, para reaproveitar em várias grades.
+
+    Os processos sobem uma única vez (importações e modelo prontos) e atendem
+    todas as chamadas de ``solve_grid(..., pool=pool)``. Retorna um ``WorkerPool``.
+    """
+    return WorkerPool(workers or os.cpu_count() or 1, time_limit, cache)
+
+
+def _run_pool(scenarios, chunks, workers, time_limit, timeout, cache, result, pool=None):
+    """Resolve os blocos num pool (``pool`` ou um novo, encerrado ao final).
+
+    Retorna os blocos perdidos por queda de processo e os abandonados por tempo esgotado.
+    """
+    pending = {}
+    crashed, expired = [], []
+    own = pool is None
+    if own:
+        pool = worker_pool(workers, time_limit, cache)
+    try:
+        for chunk in chunks:
+            future = pool.submit(_solve_chunk, chunk, [scenarios[index] for index in chunk])
+            pending[future] = chunk
+        while pending:
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Nenhum bloco terminou dentro do prazo: abandona os restantes
+                expired.extend(pending.values())
+                pool.terminate()
+                break
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    flat_indices, solutions = future.result()
+                except BrokenProcessPool:
+                    pool.broken = True
+                    crashed.append(chunk)
+                else:
+                    _store(result, flat_indices, solutions)
+    finally:
+        if own:
+            pool.shutdown()
+    return crashed, expired
+
+
+def solve_grid(
+    make_scenario, axes, workers=None, chunk_size=None, time_limit=None, timeout=None, cache=None, pool=None
+):
+    """Resolve ``make_scenario(*valores)`` para todas as combinações dos eixos em paralelo.
+
+    ``axes`` é uma sequência de faixas de valores (por exemplo ``(base_prices,
+    infrastructure_costs)``); o resultado tem a forma ``(len(axes[0]), len(axes[1]), ...)``.
+    ``time_limit`` limita cada resolução do CBC (segundos) e ``timeout`` é o
+    tempo máximo de espera, sem nenhum bloco concluído, antes de abandonar os restantes.
+    Com ``cache`` (um ``ScenarioCache``), todos os processos compartilham o mesmo arquivo.
+
+    ``pool`` (de ``worker_pool``) é usado na primeira passagem no lugar de um
+    pool novo; ele já traz o seu ``time_limit`` e ``cache``. Se um processo
+    morrer ou o tempo esgotar, esse pool fica inutilizado e as novas
+    tentativas usam pools próprios.
+    """
+    shape = tuple(len(axis) for axis in axes)
+    scenarios = [make_scenario(*values) for values in itertools.product(*axes)]
+    result = _empty_result(shape)
+    if not scenarios:
+        return result
+
+    workers = workers or (pool.workers if pool is not None else None) or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(scenarios) / (4 * workers)))
+    indices = list(range(len(scenarios)))
+    chunks = [indices[start:start + chunk_size] for start in range(0, len(indices), chunk_size)]
+
+    crashed, expired = _run_pool(scenarios, chunks, workers, time_limit, timeout, cache, result, pool)
+
+    # Nova tentativa ponto a ponto enquanto houver progresso; a queda de um
+    # processo derruba o pool inteiro, então os pontos restantes voltam para a fila
+    retry = [index for chunk in crashed for index in chunk]
+    while retry:
+        crashed, more_expired = _run_pool(scenarios, [[index] for index in retry], workers, time_limit, timeout, cache, result)
+        expired.extend(more_expired)
+        remaining = [index for chunk in crashed for index in chunk]
+        if len(remaining) == len(retry):
+            break
+        retry = remaining
+
+    # Sem progresso: cada ponto restante roda isolado, para perder apenas os que derrubam o processo
+    failed = [index for chunk in expired for index in chunk]
+    for index in retry:
+        crashed, more_expired = _run_pool(scenarios, [[index]], 1, time_limit, timeout, cache, result)
+        if crashed or more_expired:
+            failed.append(index)
+
+    result.status.reshape(-1)[failed] = UNDEFINED
+    return result._replace(failed=len(failed))
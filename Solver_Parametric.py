@@ -0,0 +1,154 @@
+"""Análise paramétrica exata para um único parâmetro variando.
+
+Quando apenas o objetivo depende do parâmetro ``t`` (de forma afim), o lucro
+ótimo é uma função convexa e linear por partes de ``t``. ``parametric_sweep``
+encontra os intervalos em que as quantidades ótimas não mudam e os pontos de
+quebra entre eles resolvendo o modelo apenas nos extremos e nas interseções
+das retas de lucro, em vez de amostrar a faixa inteira.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import OPTIMAL, PricingModel
+
+# Intervalo [start, end] em que ``quantities`` é ótima (None se não há solução ótima)
+Segment = namedtuple("Segment", ["start", "end", "quantities"])
+
+
+def budget_is_redundant(scenario):
+    """Indica se o orçamento de infraestrutura nunca limita o cenário.
+
+    Compara o orçamento com o maior custo possível dentro dos limites das
+    variáveis e das restrições de processamento e armazenamento.
+    """
+    if scenario.infrastructure_budget is None:
+        return True
+    lower = [float(low) for low in scenario.lower_bounds]
+    largest = []
+    for j in range(3):
+        limit = np.inf if scenario.upper_bounds[j] is None else float(scenario.upper_bounds[j])
+        for _, row, rhs in scenario.constraint_rows()[:2]:
+            if row[j] > 0:
+                used = sum(row[k] * lower[k] for k in range(3) if k != j)
+                limit = min(limit, np.floor((rhs - used) / row[j]))
+        largest.append(limit)
+    cost = sum(float(c) * q for c, q in zip(scenario.infrastructure_costs, largest) if c != 0)
+    return cost <= scenario.infrastructure_budget
+
+
+def _constraints(scenario):
+    rows = scenario.constraint_rows()
+    if budget_is_redundant(scenario):
+        rows = [row for row in rows if row[0] != "infrastructure_budget"]
+    return rows, scenario.lower_bounds, scenario.upper_bounds
+
+
+class ParametricResult:
+    """Segmentos ótimos de uma análise paramétrica e o lucro exato em qualquer ponto."""
+
+    def __init__(self, make_scenario, start, end, segments, solves):
+        self.make_scenario = make_scenario
+        self.start = start
+        self.end = end
+        self.segments = segments
+        self.solves = solves
+        self._origin = np.array(make_scenario(start).objective_coefficients())
+        if end != start:
+            self._slope = (np.array(make_scenario(end).objective_coefficients()) - self._origin) / (end - start)
+        else:
+            self._slope = np.zeros(3)
+
+    @property
+    def breakpoints(self):
+        """Valores do parâmetro em que as quantidades ótimas mudam."""
+        return [segment.start for segment in self.segments[1:]]
+
+    def _segment_index(self, values):
+        return np.searchsorted(np.array(self.breakpoints, dtype=float), values, side="right")
+
+    def quantities(self, values):
+        """Quantidades ótimas (NaN sem solução) para cada valor do parâmetro."""
+        values = np.asarray(values, dtype=float)
+        table = np.array([
+            segment.quantities if segment.quantities is not None else (np.nan,) * 3
+            for segment in self.segments
+        ])
+        return table[self._segment_index(values)]
+
+    def profit(self, values, default=0):
+        """Lucro ótimo exato para cada valor do parâmetro (``default`` sem solução)."""
+        values = np.asarray(values, dtype=float)
+        coefficients = self._origin + (values[..., None] - self.start) * self._slope
+        profits = (coefficients * self.quantities(values)).sum(axis=-1)
+        return np.where(np.isnan(profits), default, profits)
+
+
+def parametric_sweep(make_scenario, start, end, solve=None, tolerance=1e-9):
+    """Encontra os intervalos ótimos de ``make_scenario(t)`` para ``t`` em ``[start, end]``.
+
+    ``make_scenario`` deve variar apenas o objetivo, de forma afim em ``t``
+    (preços ou custos de infraestrutura); o orçamento pode variar desde que
+    nunca limite o problema. ``solve`` recebe um ``Scenario`` e retorna um
+    ``Solution`` (por padrão, um ``PricingModel`` com o CBC).
+    """
+    solve = solve if solve is not None else PricingModel().solve
+    first, last = make_scenario(start), make_scenario(end)
+    if _constraints(first) != _constraints(last):
+        raise ValueError("A análise paramétrica exige restrições fixas ao longo do parâmetro")
+    middle = make_scenario((start + end) / 2)
+    expected = (np.array(first.objective_coefficients()) + np.array(last.objective_coefficients())) / 2
+    if not np.allclose(middle.objective_coefficients(), expected):
+        raise ValueError("O objetivo deve variar de forma afim com o parâmetro")
+
+    solves = 0
+
+    def solve_at(t):
+        nonlocal solves
+        solves += 1
+        return solve(make_scenario(t))
+
+    def value(quantities, t):
+        return float(np.dot(make_scenario(t).objective_coefficients(), quantities))
+
+    def close(a, b):
+        return a >= b - tolerance * max(1.0, abs(b))
+
+    low, high = solve_at(start), solve_at(end)
+    if low.status != OPTIMAL or high.status != OPTIMAL:
+        # Com restrições fixas a viabilidade não depende do parâmetro
+        result = [Segment(start, end, None)]
+        return ParametricResult(make_scenario, start, end, result, solves)
+
+    segments = []
+    # Pilha de intervalos (a, solução ótima em a, b, solução ótima em b), da esquerda para a direita
+    stack = [(start, low, end, high)]
+    while stack:
+        a, at_a, b, at_b = stack.pop()
+        if at_a.quantities == at_b.quantities or close(value(at_a.quantities, b), at_b.objective):
+            segments.append(Segment(a, b, at_a.quantities))
+            continue
+        if close(value(at_b.quantities, a), at_a.objective):
+            segments.append(Segment(a, b, at_b.quantities))
+            continue
+        # Interseção das retas de lucro das duas soluções
+        slope_a = value(at_a.quantities, b) - at_a.objective
+        slope_b = at_b.objective - value(at_b.quantities, a)
+        offset = (value(at_b.quantities, a) - at_a.objective) / (slope_a - slope_b)
+        t = a + (b - a) * offset
+        at_t = solve_at(t)
+        if close(value(at_a.quantities, t), at_t.objective):
+            segments.append(Segment(a, t, at_a.quantities))
+            segments.append(Segment(t, b, at_b.quantities))
+        else:
+            stack.append((t, at_t, b, at_b))
+            stack.append((a, at_a, t, at_t))
+
+    # Junta segmentos vizinhos com as mesmas quantidades
+    merged = [segments[0]]
+    for segment in segments[1:]:
+        if segment.quantities == merged[-1].quantities:
+            merged[-1] = merged[-1]._replace(end=segment.end)
+        else:
+            merged.append(segment)
+    return ParametricResult(make_scenario, start, end, merged, solves)
@@ -0,0 +1,70 @@
+"""Apresentação dos scripts, separada do cálculo.
+
+Cada script expõe ``compute()``, que devolve os resultados sem importar o
+matplotlib, e ``render(results, output=None)``, que só importa o matplotlib
+na hora de desenhar. Com ``output`` o gráfico é gravado (PNG, SVG ou outro
+formato do ``savefig``, pela extensão) com o backend Agg, sem abrir janela.
+
+Linha de comando comum a todos os scripts::
+
+    python Find_Best_Solution_Plot.py                     # abre a janela, como antes
+    python Find_Best_Solution_Plot.py --output lucro.png  # grava o gráfico (sem interface gráfica)
+    python Find_Best_Solution_Plot.py --no-plot           # apenas calcula e imprime os resultados
+"""
+import argparse
+import sys
+import time
+
+
+def script_arguments(description, argv=None, configure=None):
+    """Lê as opções ``--output`` e ``--no-plot``; ``configure(parser)`` acrescenta opções do script."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--output", help="grava o gráfico neste arquivo (PNG ou SVG) em vez de abrir uma janela")
+    parser.add_argument("--no-plot", action="store_true", help="apenas calcula e imprime os resultados")
+    parser.add_argument("--timing", action="store_true", help="imprime o tempo de cálculo e de desenho")
+    if configure is not None:
+        configure(parser)
+    return parser.parse_args(argv)
+
+
+def pyplot(output=None):
+    """Importa e retorna o ``matplotlib.pyplot``; com ``output``, usa o backend não interativo Agg."""
+    import matplotlib
+
+    if output is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def finish(plt, output=None):
+    """Mostra a figura atual ou, com ``output``, grava no arquivo e fecha."""
+    if output is None:
+        plt.show()
+        return
+    plt.savefig(output)
+    plt.close("all")
+    print(f"Gráfico gravado em {output}")
+
+
+def main(compute, render, report=None, description=None, argv=None, configure=None, options=None):
+    """Executa um script: calcula, imprime o resumo (``report``) e desenha conforme as opções.
+
+    ``options(args)`` converte as opções extras (de ``configure``) nos
+    argumentos de ``compute``. Retorna os resultados.
+    """
+    args = script_arguments(description, argv, configure)
+    start = time.perf_counter()
+    results = compute(**(options(args) if options is not None else {}))
+    computed = time.perf_counter()
+    if report is not None:
+        report(results)
+    if not args.no_plot:
+        render(results, args.output)
+    if args.timing:
+        print(f"Cálculo: {computed - start:.3f} s", end="")
+        if not args.no_plot:
+            print(f", desenho: {time.perf_counter() - computed:.3f} s", end="")
+        print(f", matplotlib importado: {'matplotlib' in sys.modules}")
+    return results
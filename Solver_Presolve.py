@@ -0,0 +1,100 @@
+"""Pré-resolução vetorizada: separa os cenários que não precisam do solver.
+
+Com coeficientes de restrição não negativos e variáveis inteiras:
+
+- o cenário é inviável se os limites se cruzam ou se o canto inferior já
+  estoura alguma capacidade;
+- se o canto "guloso" (limite superior para coeficiente positivo no objetivo,
+  limite inferior para os demais) cabe nas capacidades, ele é ótimo;
+- os demais seguem para o solver.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import INFEASIBLE, NOT_SOLVED, OPTIMAL
+from Solver_Vectorized import BatchResult, scenario_arrays
+
+# Classes da pré-resolução
+TRIVIAL = 0
+INFEASIBLE_CLASS = 1
+NEEDS_SOLVER = 2
+
+_EPS = 1e-9
+
+# Classe de cada cenário e solução já conhecida (status, objetivo e quantidades) dos triviais e inviáveis
+Presolve = namedtuple("Presolve", ["classes", "result"])
+
+
+def demand_cube(basic_prices, standard_prices, premium_prices, demand_base=(100, 80, 50), demand_slope=(0.5, 0.3, 0.2)):
+    """Combinações de preços estritamente crescentes (Básico < Padrão < Premium) e suas demandas.
+
+    Retorna ``prices`` e ``demands`` com forma (M, 3), na mesma ordem dos laços
+    aninhados de MathPlotSolver_Demonstracao_Precificacao.py. A demanda é
+    ``max(base - inclinação * preço, 0)``.
+    """
+    xb, xp, xg = np.meshgrid(basic_prices, standard_prices, premium_prices, indexing="ij")
+    valid = (xp > xb) & (xg > xp)
+    prices = np.column_stack([xb[valid], xp[valid], xg[valid]])
+    demands = np.maximum(np.asarray(demand_base) - np.asarray(demand_slope) * prices, 0)
+    return prices, demands
+
+
+def classify_arrays(objective, rows, rhs, lower, upper):
+    """Classifica um lote descrito por arrays (mesmas formas de ``Solver_Vectorized.solve_arrays``)."""
+    objective = np.asarray(objective, dtype=float)
+    rows = np.asarray(rows, dtype=float)
+    rhs = np.asarray(rhs, dtype=float)
+    shape = np.broadcast_shapes(
+        objective.shape[:-1], rows.shape[:-2], rhs.shape[:-1], np.shape(lower)[:-1], np.shape(upper)[:-1]
+    )
+    objective = np.broadcast_to(objective, shape + (3,))
+    rows = np.broadcast_to(rows, shape + rows.shape[-2:])
+    rhs = np.broadcast_to(rhs, shape + rhs.shape[-1:])
+    lower = np.ceil(np.broadcast_to(np.asarray(lower, dtype=float), shape + (3,)) - _EPS)
+    upper = np.floor(np.broadcast_to(np.asarray(upper, dtype=float), shape + (3,)) + _EPS)
+    if (rows < 0).any():
+        raise ValueError("A pré-resolução exige coeficientes de restrição não negativos")
+
+    classes = np.full(shape, NEEDS_SOLVER, dtype=np.int8)
+    status = np.full(shape, NOT_SOLVED, dtype=np.int8)
+    objectives = np.full(shape, np.nan)
+    quantities = np.full(shape + (3,), np.nan)
+
+    with np.errstate(invalid="ignore"):
+        minimum_use = np.where(rows > 0, rows * lower[..., None, :], 0).sum(axis=-1)
+    infeasible = (lower > upper).any(axis=-1) | (minimum_use > rhs + _EPS).any(axis=-1)
+
+    corner = np.where(objective > 0, upper, lower)
+    finite = np.isfinite(corner).all(axis=-1)
+    with np.errstate(invalid="ignore"):
+        use = np.where(rows > 0, rows * corner[..., None, :], 0).sum(axis=-1)
+    trivial = finite & (use <= rhs + _EPS).all(axis=-1) & ~infeasible
+
+    classes[infeasible] = INFEASIBLE_CLASS
+    status[infeasible] = INFEASIBLE
+    classes[trivial] = TRIVIAL
+    status[trivial] = OPTIMAL
+    quantities[trivial] = corner[trivial] + 0.0
+    objectives[trivial] = (objective[trivial] * corner[trivial]).sum(axis=-1)
+    return Presolve(classes, BatchResult(status, objectives, quantities))
+
+
+def presolve(scenarios):
+    """Classifica uma lista de ``Scenario``; retorna um ``Presolve``."""
+    return classify_arrays(*scenario_arrays(scenarios))
+
+
+def solve_with_presolve(scenarios, backend):
+    """Resolve os cenários enviando ao ``backend`` apenas os que precisam do solver.
+
+    Retorna o ``BatchResult`` completo e as classes da pré-resolução.
+    """
+    classes, result = presolve(scenarios)
+    pending = np.flatnonzero(classes == NEEDS_SOLVER)
+    if len(pending):
+        solved = backend.solve_batch([scenarios[index] for index in pending])
+        result.status[pending] = solved.status
+        result.objectives[pending] = solved.objectives
+        result.quantities[pending] = solved.quantities
+    return result, classes
@@ -0,0 +1,210 @@
+"""Medição do tempo por fase de cada resolução e ganchos de profiling.
+
+``instrument`` envolve um ``PricingModel`` (e o seu ``PULP_CBC_CMD``) para
+registrar, em cada ponto resolvido, o tempo de:
+
+- ``build``: troca dos coeficientes do modelo (``PricingModel.update``);
+- ``write``: gravação do arquivo MPS para o CBC;
+- ``cbc``: subprocesso do CBC (o restante de ``solve_CBC``);
+- ``read``: leitura do arquivo de solução;
+- ``extract``: o restante de ``PricingModel.solve`` (preparação do PuLP,
+  cache e montagem do ``Solution``).
+
+Fases globais, como ``plot``, são medidas com ``timer.phase("plot")``. O
+``PhaseTimer`` agrega os tempos em percentis e histogramas e pode rodar pontos
+escolhidos sob o ``cProfile``. Os resultados das resoluções não mudam.
+
+Nos scripts, a medição é ativada pelo ambiente::
+
+    SOLVER_PROFILE=1 python MathPlotSolver_Demonstracao_Processamento.py
+    SOLVER_PROFILE=1 SOLVER_PROFILE_POINTS=0,100 python Find_Best_Solution_Multiplot_Infra.py
+"""
+import cProfile
+import os
+import pstats
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+POINT_PHASES = ("build", "write", "cbc", "read", "extract")
+
+
+class PhaseTimer:
+    """Tempos por fase de cada ponto e das fases globais.
+
+    ``profile_points`` são os índices (na ordem das resoluções) dos pontos
+    rodados sob o ``cProfile``; as estatísticas são gravadas em
+    ``profile_dir`` (``point_<índice>.prof``) ou, sem diretório, impressas.
+    Com ``enabled=False`` nada é medido.
+    """
+
+    def __init__(self, enabled=True, profile_points=(), profile_dir=None):
+        self.enabled = enabled
+        self.profile_points = set(profile_points)
+        self.profile_dir = profile_dir
+        self.points = []
+        self.totals = {}
+        self._current = None
+
+    @classmethod
+    def from_environment(cls):
+        """Timer configurado por ``SOLVER_PROFILE``, ``SOLVER_PROFILE_POINTS`` e ``SOLVER_PROFILE_DIR``."""
+        points = os.environ.get("SOLVER_PROFILE_POINTS", "")
+        return cls(
+            enabled=bool(os.environ.get("SOLVER_PROFILE")),
+            profile_points=[int(point) for point in points.split(",") if point.strip()],
+            profile_dir=os.environ.get("SOLVER_PROFILE_DIR"),
+        )
+
+    def record(self, phase, seconds):
+        """Soma ``seconds`` à fase no ponto atual (ou às fases globais, fora de um ponto)."""
+        target = self._current if self._current is not None else self.totals
+        target[phase] = target.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Mede o bloco como a fase ``name``."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @contextmanager
+    def point(self):
+        """Delimita um ponto da varredura; fases medidas dentro do bloco pertencem a ele."""
+        if not self.enabled:
+            yield
+            return
+        index = len(self.points)
+        self._current = {}
+        profiler = cProfile.Profile() if index in self.profile_points else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._dump_profile(index, profiler)
+            self.points.append(self._current)
+            self._current = None
+
+    def _dump_profile(self, index, profiler):
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f"point_{index}.prof")
+            profiler.dump_stats(path)
+            print(f"Perfil do ponto {index} gravado em {path}")
+        else:
+            print(f"Perfil do ponto {index}:")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+    def durations(self, phase):
+        """Tempo da fase em cada ponto (0 nos pontos em que ela não ocorreu, como acertos do cache)."""
+        return np.array([point.get(phase, 0.0) for point in self.points])
+
+    def percentiles(self, phase, q=(50, 90, 99)):
+        durations = self.durations(phase)
+        if not len(durations):
+            return dict.fromkeys(q, 0.0)
+        return dict(zip(q, np.percentile(durations, q)))
+
+    def histogram(self, phase, bins=10):
+        """Histograma (contagens, bordas em segundos) dos tempos da fase por ponto."""
+        return np.histogram(self.durations(phase), bins=bins)
+
+    def summary(self):
+        """Linhas (fase, pontos, total, média, p50, p90, p99, máximo) em segundos."""
+        rows = []
+        for phase in POINT_PHASES:
+            durations = self.durations(phase)
+            if not len(durations) or not durations.any():
+                continue
+            p50, p90, p99 = self.percentiles(phase).values()
+            rows.append((phase, len(durations), durations.sum(), durations.mean(), p50, p90, p99, durations.max()))
+        for phase, total in self.totals.items():
+            rows.append((phase, 1, total, total, total, total, total, total))
+        return rows
+
+    def report(self, bins=8):
+        """Imprime a tabela de tempos por fase e o histograma da fase mais cara por ponto."""
+        if not self.enabled:
+            return
+        rows = self.summary()
+        grand_total = sum(row[2] for row in rows) or 1.0
+        print(f"Tempos por fase ({len(self.points)} pontos, em ms):")
+        print(f"{'fase':<9}{'total':>10}{'%':>7}{'média':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'máx':>9}")
+        for phase, _, total, mean, p50, p90, p99, largest in rows:
+            print(f"{phase:<9}{1000 * total:>10.1f}{100 * total / grand_total:>7.1f}{1000 * mean:>9.3f}"
+                  f"{1000 * p50:>9.3f}{1000 * p90:>9.3f}{1000 * p99:>9.3f}{1000 * largest:>9.3f}")
+        per_point = [row for row in rows if row[0] in POINT_PHASES]
+        if per_point:
+            slowest = max(per_point, key=lambda row: row[2])[0]
+            counts, edges = self.histogram(slowest, bins)
+            print(f"Histograma de {slowest} (ms):")
+            for count, low, high in zip(counts, edges[:-1], edges[1:]):
+                print(f"  {1000 * low:8.3f} - {1000 * high:8.3f} {'#' * int(np.ceil(40 * count / max(counts.max(), 1)))} {count}")
+
+
+def _timed(timer, phase, function):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer.record(phase, time.perf_counter() - start)
+    return wrapper
+
+
+def instrument(model, timer):
+    """Passa a medir as fases de cada ``model.solve`` (um ``PricingModel``) no ``timer``.
+
+    Retorna o próprio modelo. Sem efeito se o timer estiver desativado.
+    """
+    if not timer.enabled:
+        return model
+    solve, update = model.solve, model.update
+    solver = model.solver
+
+    def timed_update(*args, **kwargs):
+        return _timed(timer, "build", update)(*args, **kwargs)
+
+    def timed_solve(*args, **kwargs):
+        with timer.point():
+            start = time.perf_counter()
+            try:
+                return solve(*args, **kwargs)
+            finally:
+                point = timer._current
+                inner = sum(point.get(phase, 0.0) for phase in ("build", "write", "cbc", "read"))
+                timer.record("extract", time.perf_counter() - start - inner)
+
+    model.update = timed_update
+    model.solve = timed_solve
+
+    if hasattr(solver, "solve_CBC"):
+        solve_cbc, readsol = solver.solve_CBC, solver.readsol_MPS
+
+        def timed_solve_cbc(lp, *args, **kwargs):
+            write = lp.writeMPS
+            lp.writeMPS = _timed(timer, "write", write)
+            solver.readsol_MPS = _timed(timer, "read", readsol)
+            point = timer._current if timer._current is not None else {}
+            before = point.get("write", 0.0) + point.get("read", 0.0)
+            start = time.perf_counter()
+            try:
+                return solve_cbc(lp, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                del lp.writeMPS
+                solver.readsol_MPS = readsol
+                io = point.get("write", 0.0) + point.get("read", 0.0) - before
+                timer.record("cbc", elapsed - io)
+
+        solver.solve_CBC = timed_solve_cbc
+    return model
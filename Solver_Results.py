@@ -0,0 +1,135 @@
+"""Tabela de resultados em colunas tipadas (array estruturado do NumPy).
+
+Os scripts acumulavam os resultados em várias listas paralelas de floats e
+tuplas (vendas de cada pacote, lucro, combinação de parâmetros) e só depois
+convertiam para o ``np.argmin`` e o gráfico. A ``ResultTable`` é alocada uma
+vez, com uma linha por ponto da grade (na ordem da grade), e guarda cada
+ponto em 45 bytes: parâmetros (3 x float64), status (int8), lucro (float64)
+e quantidades (3 x int32, inteiras no modelo). As consultas (equilíbrio,
+maiores lucros, filtro por status) são vetorizadas.
+
+Exemplo::
+
+    table = ResultTable(len(combinations), shape=grid_shape)
+    table.fill(0, combinations, batch.status, batch.objectives, batch.quantities)
+    optimal = table.select(table.optimal())
+    best = optimal.argmin_imbalance()
+"""
+import numpy as np
+
+from Solver_Model import NOT_SOLVED, OPTIMAL
+
+
+def result_dtype(parameters=3):
+    """Tipo das linhas da tabela, com ``parameters`` valores de parâmetro por ponto."""
+    return np.dtype([
+        ("parameters", np.float64, (parameters,)),
+        ("status", np.int8),
+        ("objective", np.float64),
+        ("quantities", np.int32, (3,)),
+    ])
+
+
+class ResultTable:
+    """Resultados de uma varredura, uma linha por ponto (status ``NOT_SOLVED`` até ser preenchida).
+
+    ``shape`` é a forma da grade, quando os pontos formam uma; ``grid(column)``
+    devolve a coluna nessa forma. Objetivo e quantidades só valem nas linhas
+    com status ``OPTIMAL`` (nas demais ficam NaN e 0).
+    """
+
+    def __init__(self, size, parameters=3, shape=None):
+        self.data = np.zeros(size, dtype=result_dtype(parameters))
+        self.data["status"] = NOT_SOLVED
+        self.data["objective"] = np.nan
+        self.shape = shape if shape is not None else (size,)
+
+    @classmethod
+    def from_columns(cls, parameters, status, objectives, quantities, shape=None):
+        """Tabela com as colunas já calculadas (por exemplo, um ``BatchResult`` ou um ``ResultStore``)."""
+        parameters = np.asarray(parameters, dtype=float).reshape(len(status), -1)
+        table = cls(len(status), parameters.shape[1], shape)
+        table.fill(0, parameters, status, objectives, quantities)
+        return table
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    @property
+    def parameters(self):
+        return self.data["parameters"]
+
+    @property
+    def status(self):
+        return self.data["status"]
+
+    @property
+    def objectives(self):
+        return self.data["objective"]
+
+    @property
+    def quantities(self):
+        return self.data["quantities"]
+
+    def set(self, index, parameters, solution):
+        """Grava o ``Solution`` do ponto ``index``."""
+        row = self.data[index]
+        row["parameters"] = parameters
+        row["status"] = solution.status
+        if solution.status == OPTIMAL:
+            row["objective"] = solution.objective
+            row["quantities"] = np.rint(solution.quantities)
+
+    def fill(self, start, parameters, status, objectives, quantities):
+        """Grava um bloco de pontos a partir da linha ``start`` (colunas de um lote)."""
+        rows = self.data[start:start + len(status)]
+        optimal = np.asarray(status) == OPTIMAL
+        rows["parameters"] = np.asarray(parameters, dtype=float).reshape(len(rows), -1)
+        rows["status"] = status
+        rows["objective"] = np.where(optimal, objectives, np.nan)
+        rows["quantities"] = np.where(optimal[:, None], np.rint(np.nan_to_num(quantities)), 0)
+
+    def optimal(self):
+        """Máscara das linhas com solução ótima."""
+        return self.data["status"] == OPTIMAL
+
+    def select(self, mask):
+        """Nova tabela só com as linhas de ``mask`` (máscara ou índices), na mesma ordem."""
+        table = ResultTable.__new__(ResultTable)
+        table.data = self.data[mask]
+        table.shape = (len(table.data),)
+        return table
+
+    def grid(self, column):
+        """Coluna ``column`` na forma da grade."""
+        values = self.data[column]
+        return values.reshape(self.shape + values.shape[1:])
+
+    def profits(self, default=0):
+        """Lucro por linha, com ``default`` onde não há solução ótima."""
+        return np.where(self.optimal(), self.data["objective"], default)
+
+    def imbalance(self):
+        """Diferença entre as vendas dos pacotes: ``|b - s| + |s - p| + |b - p|`` por linha."""
+        b, s, p = self.data["quantities"].T.astype(np.int64)
+        return np.abs(b - s) + np.abs(s - p) + np.abs(b - p)
+
+    def argmin_imbalance(self):
+        """Linha ótima de menor diferença entre as vendas (a primeira, em caso de empate); None se não houver."""
+        optimal = np.flatnonzero(self.optimal())
+        if not len(optimal):
+            return None
+        return optimal[np.argmin(self.imbalance()[optimal])]
+
+    def top_k(self, k):
+        """Índices das ``k`` linhas de maior lucro (empates na ordem da tabela)."""
+        optimal = np.flatnonzero(self.optimal())
+        order = np.argsort(-self.data["objective"][optimal], kind="stable")
+        return optimal[order[:k]]
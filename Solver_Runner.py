@@ -0,0 +1,241 @@
+"""Executa várias análises descritas num arquivo JSON num único processo.
+
+Cada script de análise importa numpy/pulp/matplotlib, monta o modelo e sobe
+o seu pool de processos do zero. O executor lê um arquivo com dezenas de
+análises e roda todas no mesmo processo, compartilhando as importações, o
+``PricingModel`` (construído uma vez), o cache de cenários em disco e o pool
+de processos das grades, que sobe uma única vez.
+
+Formato do arquivo (exemplo completo em ``Runner_Scenarios.json``)::
+
+    {
+      "defaults": {"base_price": 100, "base_infrastructure_cost": 100},
+      "analyses": [
+        {"name": "preco_base", "type": "sweep", "parameter": "base_price", "range": [50, 201, 10]},
+        {"name": "custo_premium", "type": "sweep", "parameter": "infrastructure_costs.premium",
+         "values": [50, 100, 150, 200]},
+        {"name": "preco_padrao", "type": "parametric", "parameter": "prices.standard", "range": [100, 401, 20]},
+        {"name": "superficie", "type": "grid", "parameters": ["base_price", "base_infrastructure_cost"],
+         "ranges": [[50, 201, 10], [50, 201, 10]], "fixed": {"infrastructure_budget": null}}
+      ]
+    }
+
+Tipos de análise:
+
+- ``sweep``: um parâmetro variando, com ``Solver_Sweep.sweep`` (reaproveita os pontos vizinhos);
+- ``parametric``: um parâmetro do objetivo variando, com a análise paramétrica exata
+  (``Solver_Parametric``), avaliada nos pontos pedidos;
+- ``grid``: dois ou mais parâmetros, todas as combinações resolvidas no pool compartilhado.
+
+Parâmetros (ver ``Solver_Model.make_scenario``): os campos de ``Scenario`` (``processing_capacity``,
+``infrastructure_budget``, ``net_profit``...), os de ``Scenario.from_base``
+(``base_price`` e ``base_infrastructure_cost``: 1x/2x/3x e 1x/1.5x/2x),
+``base_hours`` (horas de processamento 1x/2x/3x) e um pacote de um campo por
+tupla, como ``prices.basic`` ou ``infrastructure_costs.premium``. ``defaults``
+vale para todas as análises e ``fixed`` para uma só. ``range`` segue o
+``numpy.arange`` (início, fim exclusivo, passo), como as faixas dos scripts.
+
+Cada análise grava ``<nome>.npz`` (eixos, status, objetivos e quantidades) no
+diretório de saída e, com ``--plot``, ``<nome>.png``. Com ``"sensitivity": true``
+a análise grava também os preços-sombra, faixas e folgas de cada ponto
+(``Solver_Sensitivity``), com uma dimensão final por restrição.
+
+Uso::
+
+    python Solver_Runner.py Runner_Scenarios.json --output resultados --plot
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from Solver_Cache import ScenarioCache
+from Solver_Model import NOT_SOLVED, OPTIMAL, PricingModel, make_scenario
+from Solver_Parallel import solve_grid, worker_pool
+from Solver_Parametric import parametric_sweep
+from Solver_Plotting import finish, pyplot
+from Solver_Sensitivity import Sensitivity, sensitivity_arrays
+from Solver_Sweep import sweep
+
+ANALYSIS_TYPES = ("sweep", "parametric", "grid")
+
+
+def axis_values(definition):
+    """Valores de um eixo: ``{"values": [...]}`` ou ``[início, fim, passo]`` do ``numpy.arange``."""
+    if isinstance(definition, dict):
+        return np.asarray(definition["values"], dtype=float)
+    return np.arange(*definition)
+
+
+def _arrays(solutions):
+    status = np.array([s.status for s in solutions], dtype=np.int8)
+    objectives = np.array([s.objective if s.status == OPTIMAL else np.nan for s in solutions], dtype=float)
+    quantities = np.array([s.quantities if s.status == OPTIMAL else (np.nan,) * 3 for s in solutions], dtype=float)
+    return status, objectives, quantities.reshape(len(solutions), 3)
+
+
+class ScenarioRunner:
+    """Estado compartilhado entre as análises: modelo, cache e pool de processos.
+
+    Use como gerenciador de contexto para encerrar o pool ao final::
+
+        with ScenarioRunner() as runner:
+            for analysis in analyses:
+                runner.run(analysis)
+    """
+
+    def __init__(self, cache=None, workers=None, time_limit=None, defaults=None):
+        self.cache = cache if cache is not None else ScenarioCache()
+        self.model = PricingModel(cache=self.cache)
+        self.workers = workers
+        self.time_limit = time_limit
+        self.defaults = dict(defaults or {})
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def pool(self):
+        """Pool de processos compartilhado; recriado se uma grade anterior o inutilizou."""
+        if self._pool is not None and self._pool.broken:
+            self._pool = None
+        if self._pool is None:
+            self._pool = worker_pool(self.workers, self.time_limit, self.cache)
+        return self._pool
+
+    def run(self, analysis):
+        """Executa uma análise; retorna um dicionário com os eixos e os arrays de resultados."""
+        results = self._run(analysis)
+        if analysis.get("sensitivity"):
+            fixed = dict(self.defaults)
+            fixed.update(analysis.get("fixed", {}))
+            scenarios = [
+                make_scenario(fixed, **dict(zip(results["parameters"], values)))
+                for values in itertools.product(*results["axes"])
+            ]
+            shape = results["status"].shape
+            for field, values in sensitivity_arrays(scenarios, results["status"], results["quantities"]).items():
+                results[field] = values.reshape(shape + values.shape[1:])
+        return results
+
+    def _run(self, analysis):
+        kind = analysis.get("type", "sweep")
+        if kind not in ANALYSIS_TYPES:
+            raise ValueError(f"Tipo de análise desconhecido: {kind!r} (opções: {', '.join(ANALYSIS_TYPES)})")
+        fixed = dict(self.defaults)
+        fixed.update(analysis.get("fixed", {}))
+
+        if kind == "grid":
+            parameters = analysis["parameters"]
+            axes = [axis_values(definition) for definition in analysis["ranges"]]
+            grid = solve_grid(
+                lambda *values: make_scenario(fixed, **dict(zip(parameters, values))),
+                axes, time_limit=self.time_limit, cache=self.cache, pool=self.pool(),
+            )
+            return {
+                "parameters": parameters, "axes": axes, "status": grid.status,
+                "objectives": grid.objectives, "quantities": grid.quantities, "solves": grid.status.size,
+            }
+
+        parameter = analysis["parameter"]
+        values = axis_values({"values": analysis["values"]} if "values" in analysis else analysis["range"])
+        if kind == "parametric":
+            result = parametric_sweep(
+                lambda t: make_scenario(fixed, **{parameter: t}), values[0], values[-1], solve=self.model.solve
+            )
+            quantities = result.quantities(values)
+            objectives = result.profit(values, default=np.nan)
+            status = np.where(np.isnan(objectives), NOT_SOLVED, OPTIMAL).astype(np.int8)
+            solves = result.solves
+        else:
+            result = sweep([make_scenario(fixed, **{parameter: value}) for value in values], self.model)
+            status, objectives, quantities = _arrays(result.solutions)
+            solves = result.solves
+        return {
+            "parameters": [parameter], "axes": [values], "status": status,
+            "objectives": objectives, "quantities": quantities, "solves": solves,
+        }
+
+
+def save(name, results, directory):
+    """Grava os resultados de uma análise em ``<directory>/<name>.npz``."""
+    path = os.path.join(directory, f"{name}.npz")
+    axes = {f"axis_{n}": axis for n, axis in enumerate(results["axes"])}
+    sensitivity = {field: results[field] for field in Sensitivity._fields if field in results}
+    np.savez(
+        path, parameters=np.array(results["parameters"]), status=results["status"],
+        objectives=results["objectives"], quantities=results["quantities"], **axes, **sensitivity,
+    )
+    return path
+
+
+def render(name, results, output):
+    """Desenha o lucro de uma análise (linha em 1D, mapa de cores em 2D) e grava em ``output``."""
+    plt = pyplot(output)
+    profits = np.where(results["status"] == OPTIMAL, results["objectives"], 0)
+    axes, parameters = results["axes"], results["parameters"]
+    plt.figure(figsize=(10, 6))
+    if len(axes) == 1:
+        plt.plot(axes[0], profits, marker="o")
+        plt.xlabel(parameters[0])
+        plt.ylabel("Lucro Máximo")
+    else:
+        # Grades com mais de dois eixos mostram o corte no primeiro valor dos demais
+        plane = profits.reshape(len(axes[0]), len(axes[1]), -1)[:, :, 0]
+        plt.pcolormesh(axes[0], axes[1], plane.T, shading="nearest", cmap="viridis")
+        plt.colorbar(label="Lucro Máximo")
+        plt.xlabel(parameters[0])
+        plt.ylabel(parameters[1])
+    plt.title(name)
+    finish(plt, output)
+
+
+def run_file(path, directory, plot=False, workers=None, time_limit=None, cache=None):
+    """Executa todas as análises do arquivo ``path``; retorna ``{nome: resultados}``."""
+    with open(path, encoding="utf-8") as handle:
+        definitions = json.load(handle)
+    os.makedirs(directory, exist_ok=True)
+    results = {}
+    with ScenarioRunner(cache, workers, time_limit, definitions.get("defaults")) as runner:
+        for analysis in definitions["analyses"]:
+            name = analysis["name"]
+            start = time.perf_counter()
+            results[name] = runner.run(analysis)
+            elapsed = time.perf_counter() - start
+            save(name, results[name], directory)
+            if plot:
+                render(name, results[name], os.path.join(directory, f"{name}.png"))
+            optimal = np.count_nonzero(results[name]["status"] == OPTIMAL)
+            print(
+                f"{name}: {results[name]['status'].size} pontos, {optimal} ótimos, "
+                f"{results[name]['solves']} resoluções, {elapsed:.3f} s"
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa as análises de um arquivo JSON num único processo")
+    parser.add_argument("path", help="arquivo JSON com as análises")
+    parser.add_argument("--output", default="resultados", help="diretório dos arquivos .npz (e .png)")
+    parser.add_argument("--plot", action="store_true", help="grava também um gráfico PNG por análise")
+    parser.add_argument("--workers", type=int, help="processos do pool das grades (padrão: um por núcleo)")
+    parser.add_argument("--time-limit", type=float, help="tempo máximo de cada resolução do CBC nas grades (s)")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    results = run_file(args.path, args.output, args.plot, args.workers, args.time_limit)
+    print(f"{len(results)} análises em {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
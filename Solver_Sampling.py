@@ -0,0 +1,175 @@
+"""Amostragem quase aleatória (Sobol / hipercubo latino) com um modelo substituto do lucro.
+
+As grades completas dos scripts (o cubo de preços da Precificação, o cubo de
+horas do Processamento) crescem exponencialmente com o número de parâmetros.
+``sampling_study`` sorteia pontos de baixa discrepância em qualquer conjunto
+de parâmetros do modelo (``scipy.stats.qmc``), resolve-os em lotes com um
+backend de ``Solver_Backends`` e ajusta um substituto rápido do lucro ótimo:
+interpolação por funções de base radial (``scipy.interpolate.RBFInterpolator``,
+spline de placa fina com termo linear) nas coordenadas normalizadas para
+[0, 1]. Uma parte das resoluções fica de fora do ajuste para medir o erro do
+substituto; depois ele é reajustado com todos os pontos.
+
+Os parâmetros usam os nomes de ``Solver_Model.make_scenario`` (campos de
+``Scenario``, ``base_price``, ``base_hours`` e um pacote por vez, como
+``prices.premium``), os mesmos do ``Solver_Runner``::
+
+    study = sampling_study({"prices.basic": (50, 200), "process.premium": (3, 30), ...}, count=1024)
+    study.errors          # erro do substituto nas resoluções separadas
+    study.predict(points) # lucro estimado em pontos não resolvidos
+
+O SciPy é necessário (amostradores e substituto).
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Backends import get_backend
+from Solver_Model import OPTIMAL, make_scenario
+
+try:
+    from scipy.interpolate import RBFInterpolator
+    from scipy.stats import qmc
+except ImportError:  # SciPy não instalado
+    qmc = None
+
+SAMPLERS = ("sobol", "lhs", "random")
+
+
+def sample_points(bounds, count, method="sobol", seed=None):
+    """``count`` pontos em ``bounds`` (forma (parâmetros, 2): mínimo e máximo de cada um).
+
+    ``"sobol"`` (com embaralhamento; potências de 2 preservam o equilíbrio da
+    sequência), ``"lhs"`` (hipercubo latino) ou ``"random"`` (uniforme).
+    """
+    if method not in SAMPLERS:
+        raise ValueError(f"Amostrador desconhecido: {method!r} (opções: {', '.join(SAMPLERS)})")
+    bounds = np.asarray(bounds, dtype=float)
+    dimensions = len(bounds)
+    if method == "random":
+        unit = np.random.default_rng(seed).random((count, dimensions))
+    elif qmc is None:
+        raise ImportError("A amostragem quase aleatória precisa do SciPy (scipy.stats.qmc)")
+    elif method == "sobol":
+        unit = qmc.Sobol(dimensions, seed=seed).random(count)
+    else:
+        unit = qmc.LatinHypercube(dimensions, seed=seed).random(count)
+    return bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0])
+
+
+class Surrogate:
+    """Lucro ótimo estimado por funções de base radial, nas coordenadas normalizadas pelos limites."""
+
+    def __init__(self, points, values, bounds, neighbors=None):
+        if qmc is None:
+            raise ImportError("O substituto precisa do SciPy (scipy.interpolate.RBFInterpolator)")
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.interpolator = RBFInterpolator(self._unit(points), values, degree=1, neighbors=neighbors)
+
+    def _unit(self, points):
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return (np.asarray(points, dtype=float) - low) / np.where(high > low, high - low, 1)
+
+    def __call__(self, points):
+        return self.interpolator(self._unit(np.atleast_2d(points)))
+
+
+class SamplingStudy(namedtuple("SamplingStudy", ["names", "bounds", "points", "status", "objectives", "surrogate", "errors"])):
+    """Pontos sorteados, resultados das resoluções e substituto ajustado.
+
+    ``errors`` traz o erro do substituto nas resoluções separadas (``mae``,
+    ``rmse``, ``max`` e ``relative``, o erro médio sobre a amplitude do lucro)
+    e ``holdout``, o número delas.
+    """
+
+    __slots__ = ()
+
+    def predict(self, points):
+        """Lucro estimado em ``points`` (forma (N, parâmetros), na ordem de ``names``)."""
+        return self.surrogate(points)
+
+    def summary(self):
+        optimal = int(np.count_nonzero(self.status == OPTIMAL))
+        errors = self.errors
+        return (
+            f"{len(self.points)} pontos em {len(self.names)} parâmetros, {optimal} ótimos; "
+            f"substituto em {errors['holdout']} resoluções separadas: erro médio {errors['mae']:.1f} "
+            f"({errors['relative']:.2%} da amplitude), RMS {errors['rmse']:.1f}, máximo {errors['max']:.1f}"
+        )
+
+
+def _solve(points, names, fixed, backend, batch_size):
+    status = np.empty(len(points), dtype=np.int8)
+    objectives = np.full(len(points), np.nan)
+    for start in range(0, len(points), batch_size):
+        scenarios = [
+            make_scenario(fixed, **dict(zip(names, values))) for values in points[start:start + batch_size].tolist()
+        ]
+        result = backend.solve_batch(scenarios)
+        status[start:start + len(scenarios)] = result.status
+        objectives[start:start + len(scenarios)] = result.objectives
+    return status, objectives
+
+
+def sampling_study(parameters, count=512, method="sobol", fixed=None, backend=None, holdout=0.2, seed=None,
+                   batch_size=256, neighbors=None):
+    """Sorteia ``count`` pontos nos ``parameters``, resolve e ajusta o substituto; retorna um ``SamplingStudy``.
+
+    ``parameters`` associa cada nome a ``(mínimo, máximo)``; ``fixed`` fixa os
+    demais (como ``defaults`` do ``Solver_Runner``). ``backend`` resolve os
+    lotes (por padrão, HiGHS com o CBC como reserva). ``holdout`` é a fração
+    das soluções ótimas separada para medir o erro; ``neighbors`` limita o
+    substituto aos vizinhos mais próximos (para muitos pontos).
+    """
+    names = list(parameters)
+    bounds = np.array([parameters[name] for name in names], dtype=float)
+    fixed = dict(fixed or {})
+    backend = backend if backend is not None else get_backend("highs", fallback="cbc")
+
+    points = sample_points(bounds, count, method, seed)
+    status, objectives = _solve(points, names, fixed, backend, batch_size)
+
+    # Erro medido com um substituto ajustado sem as resoluções separadas; o final usa todas
+    optimal = np.flatnonzero(status == OPTIMAL)
+    order = np.random.default_rng(seed).permutation(optimal)
+    tested, trained = order[:int(round(holdout * len(order)))], order[int(round(holdout * len(order))):]
+    errors = {"holdout": len(tested), "mae": np.nan, "rmse": np.nan, "max": np.nan, "relative": np.nan}
+    if len(tested) and len(trained):
+        residuals = Surrogate(points[trained], objectives[trained], bounds, neighbors)(points[tested]) - objectives[tested]
+        spread = np.ptp(objectives[optimal]) or 1.0
+        errors.update(
+            mae=float(np.abs(residuals).mean()), rmse=float(np.sqrt((residuals ** 2).mean())),
+            max=float(np.abs(residuals).max()), relative=float(np.abs(residuals).mean() / spread),
+        )
+    surrogate = Surrogate(points[optimal], objectives[optimal], bounds, neighbors)
+    return SamplingStudy(names, bounds, points, status, objectives, surrogate, errors)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    import warnings
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    parser = argparse.ArgumentParser(description="Amostragem quase aleatória com substituto do lucro")
+    parser.add_argument("--samples", type=int, default=1024, help="número de pontos resolvidos")
+    parser.add_argument("--method", choices=SAMPLERS, default="sobol", help="amostrador")
+    parser.add_argument("--seed", type=int, default=0, help="semente dos sorteios")
+    args = parser.parse_args()
+
+    # Dez parâmetros do modelo de Find_Best_Solution_BF.py variando juntos
+    parameters = {
+        "prices.basic": (50, 200), "prices.standard": (100, 400), "prices.premium": (150, 600),
+        "infrastructure_costs.basic": (50, 150), "infrastructure_costs.standard": (75, 225),
+        "infrastructure_costs.premium": (100, 300), "process.premium": (2, 6), "drive.premium": (3, 6),
+        "processing_capacity": (200, 400), "storage_capacity": (300, 600),
+    }
+    start = time.perf_counter()
+    study = sampling_study(parameters, args.samples, args.method, seed=args.seed)
+    print(f"{study.summary()} ({time.perf_counter() - start:.2f} s)")
+
+    # Comparação com uma amostra uniforme do mesmo tamanho
+    if args.method != "random":
+        baseline = sampling_study(parameters, args.samples, "random", seed=args.seed)
+        print(f"Amostra uniforme: {baseline.summary()}")
@@ -0,0 +1,182 @@
+"""Sensibilidade do lucro às capacidades: preços-sombra, folgas e faixas.
+
+Para saber como o lucro reage ao limite de 300 horas de processamento ou de
+450 de armazenamento, os scripts eram copiados e a varredura inteira rodava
+de novo com as constantes editadas. ``sensitivity`` calcula, para um ponto já
+resolvido, em duas resoluções lineares baratas (HiGHS, pelo SciPy):
+
+- ``duals`` e ``ranges``: preço-sombra de cada restrição na relaxação linear
+  e a faixa do lado direito em que esse preço vale (pela base ótima);
+- ``slacks``: folga de cada restrição na solução inteira;
+- ``fixed_duals`` e ``fixed_ranges``: o mesmo numa nova resolução linear com
+  os pacotes que estão num limite na solução inteira fixados nesse valor.
+  Como todas as variáveis do modelo são inteiras, fixar todas zeraria os
+  duais; fixar apenas as que estão no limite mede o valor marginal da
+  capacidade em torno do plano inteiro.
+
+As restrições seguem ``CONSTRAINTS``; sem orçamento, a terceira posição fica
+com NaN. ``sensitivity_arrays`` empilha os valores de uma varredura inteira
+para serem gravados junto com os resultados (ver ``Solver_Runner``)::
+
+    solution = PricingModel().solve(scenario)
+    result = sensitivity(scenario, solution)
+    result.duals[0]  # lucro por hora de processamento a mais (relaxação linear)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import OPTIMAL, Solution
+from Solver_Vectorized import scenario_arrays
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # SciPy não instalado
+    linprog = None
+
+CONSTRAINTS = ("processing", "storage", "infrastructure_budget")
+
+_EPS = 1e-7
+
+# Valores por restrição (na ordem de ``CONSTRAINTS``); as faixas têm forma (3, 2) com (mínimo, máximo)
+Sensitivity = namedtuple("Sensitivity", ["duals", "ranges", "slacks", "fixed_duals", "fixed_ranges"])
+
+
+def _linear(objective, rows, rhs, lower, upper):
+    # Relaxação linear: ponto ótimo e duais das restrições (None se não há ótimo)
+    bounds = [(None if np.isinf(low) else low, None if np.isinf(up) else up) for low, up in zip(lower, upper)]
+    result = linprog(-objective, A_ub=rows, b_ub=rhs, bounds=bounds, method="highs")
+    if result.status != 0:
+        return None, None
+    return result.x, np.maximum(-result.ineqlin.marginals, 0)
+
+
+def _ranges(x, duals, rows, rhs, lower, upper):
+    # Faixa do lado direito de cada restrição em que a base ótima (e o dual) continua valendo
+    count = len(rhs)
+    slack = rhs - rows @ x
+    # Linhas candidatas à base: restrições (as de dual positivo primeiro) e limites ativos
+    tight = [r for r in np.argsort(-duals) if slack[r] <= _EPS * max(1, abs(rhs[r]))]
+    candidates = [(rows[r], r) for r in tight]
+    for j in range(3):
+        unit = np.eye(3)[j]
+        if x[j] - lower[j] <= _EPS:
+            candidates.append((-unit, None))
+        if np.isfinite(upper[j]) and upper[j] - x[j] <= _EPS:
+            candidates.append((unit, None))
+    basis, members = [], []
+    for row, r in candidates:
+        if np.linalg.matrix_rank(np.array(basis + [row])) > len(basis):
+            basis.append(row)
+            members.append(r)
+        if len(basis) == 3:
+            break
+
+    # Todas as desigualdades (restrições e limites) na forma a·x <= b, para o teste de razão
+    inequalities = [(rows[r], rhs[r], r) for r in range(count)]
+    inequalities += [(-np.eye(3)[j], -lower[j], None) for j in range(3) if np.isfinite(lower[j])]
+    inequalities += [(np.eye(3)[j], upper[j], None) for j in range(3) if np.isfinite(upper[j])]
+
+    ranges = np.full((count, 2), np.nan)
+    for r in range(count):
+        if r not in members:
+            # Fora da base o dual é zero enquanto a restrição não passa a limitar
+            ranges[r] = (rhs[r] - max(slack[r], 0), np.inf)
+            continue
+        if len(basis) < 3:
+            continue  # Base incompleta (ótimos alternativos): faixa indeterminada
+        direction = np.linalg.solve(np.array(basis), np.eye(3)[members.index(r)])
+        low, high = -np.inf, np.inf
+        for a, b, k in inequalities:
+            if k == r:
+                continue  # A própria restrição acompanha o novo lado direito
+            rate = a @ direction
+            room = b - a @ x
+            if rate > _EPS:
+                high = min(high, room / rate)
+            elif rate < -_EPS:
+                low = max(low, room / rate)
+        ranges[r] = (rhs[r] + low, rhs[r] + high)
+    return ranges
+
+
+def _padded(values, active, shape):
+    full = np.full(shape, np.nan)
+    full[active] = values
+    return full
+
+
+def sensitivity(scenario, solution):
+    """Preços-sombra, faixas e folgas do ``scenario`` resolvido; retorna um ``Sensitivity``.
+
+    Sem solução ótima (ou sem o SciPy), todos os valores ficam com NaN.
+    """
+    empty = Sensitivity(*(np.full(shape, np.nan) for shape in [(3,), (3, 2), (3,), (3,), (3, 2)]))
+    if linprog is None or solution.status != OPTIMAL:
+        return empty
+    objective, rows, rhs, lower, upper = (array[0] for array in scenario_arrays([scenario]))
+    active = np.isfinite(rhs)
+    rows, rhs = rows[active], rhs[active]
+    quantities = np.array(solution.quantities, dtype=float)
+
+    x, duals = _linear(objective, rows, rhs, lower, upper)
+    if x is None:
+        return empty
+    ranges = _ranges(x, duals, rows, rhs, lower, upper)
+
+    # Nova resolução com os pacotes que estão num limite na solução inteira fixados
+    at_bound = (np.abs(quantities - lower) <= _EPS) | (np.abs(quantities - upper) <= _EPS)
+    fixed_lower = np.where(at_bound, quantities, lower)
+    fixed_upper = np.where(at_bound, quantities, upper)
+    fixed_x, fixed_duals = _linear(objective, rows, rhs, fixed_lower, fixed_upper)
+    if fixed_x is None:
+        fixed_duals, fixed_ranges = np.full(len(rhs), np.nan), np.full((len(rhs), 2), np.nan)
+    else:
+        fixed_ranges = _ranges(fixed_x, fixed_duals, rows, rhs, fixed_lower, fixed_upper)
+
+    return Sensitivity(
+        _padded(duals, active, 3),
+        _padded(ranges, active, (3, 2)),
+        _padded(rhs - rows @ quantities, active, 3),
+        _padded(fixed_duals, active, 3),
+        _padded(fixed_ranges, active, (3, 2)),
+    )
+
+
+def sensitivity_arrays(scenarios, status, quantities):
+    """Sensibilidade de todos os pontos de uma varredura, como arrays ``(N, 3)`` e ``(N, 3, 2)``.
+
+    ``status`` e ``quantities`` são os resultados da varredura, na ordem de
+    ``scenarios``. Retorna um dicionário com um array por campo de ``Sensitivity``.
+    """
+    results = [
+        sensitivity(scenario, Solution(int(code), None, tuple(q)))
+        for scenario, code, q in zip(scenarios, np.ravel(status), np.reshape(quantities, (-1, 3)))
+    ]
+    return {field: np.array([getattr(result, field) for result in results]) for field in Sensitivity._fields}
+
+
+if __name__ == "__main__":
+    import warnings
+
+    from Find_Best_Solution_BF import scenario
+    from Solver_Model import PricingModel
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    # Cenário de Find_Best_Solution_BF.py e conferência dos preços-sombra com o lucro inteiro
+    # ao mudar cada capacidade dentro da faixa do plano fixado
+    model = PricingModel()
+    solution = model.solve(scenario)
+    result = sensitivity(scenario, solution)
+    fields = {"processing": "processing_capacity", "storage": "storage_capacity",
+              "infrastructure_budget": "infrastructure_budget"}
+    print(f"Lucro: {solution.objective}, quantidades {solution.quantities}")
+    for n, name in enumerate(CONSTRAINTS):
+        low, high = result.fixed_ranges[n]
+        print(f"{name}: dual LP {result.duals[n]:.3f} (faixa {result.ranges[n][0]:.1f} a {result.ranges[n][1]:.1f}), "
+              f"folga {result.slacks[n]:.1f}, dual fixado {result.fixed_duals[n]:.3f} (faixa {low:.1f} a {high:.1f})")
+        capacity = getattr(scenario, fields[name])
+        change = np.floor(min(30, high - capacity)) if np.isfinite(high) else 30
+        changed = model.solve(scenario.replace(**{fields[name]: capacity + change}))
+        print(f"  +{change:g}: lucro inteiro {changed.objective}, estimado {solution.objective + change * result.fixed_duals[n]:.1f}")
@@ -0,0 +1,135 @@
+"""Varreduras 1D que reaproveitam a solução dos pontos vizinhos.
+
+Pontos vizinhos de uma varredura quase sempre têm as mesmas quantidades
+ótimas. ``sweep`` resolve os extremos da varredura e bisseciona os intervalos:
+
+- se os dois extremos de um intervalo têm a mesma região viável (restrições
+  e limites, ignorando o orçamento quando ele nunca limita) e a mesma solução
+  ótima, e os objetivos dos pontos internos estão no segmento entre os dois,
+  essa solução é ótima em todos os pontos internos (o lucro ótimo é convexo no
+  objetivo), que são preenchidos sem chamar o solver;
+- caso contrário, o ponto do meio é resolvido com a solução do extremo mais
+  próximo como solução inicial (warm start), desde que ela continue viável
+  com os novos coeficientes.
+"""
+from collections import namedtuple
+
+import numpy as np
+from pulp import PULP_CBC_CMD
+
+from Solver_Model import INFEASIBLE, OPTIMAL, PricingModel, Solution
+from Solver_Parametric import budget_is_redundant
+
+_EPS = 1e-9
+
+
+class SweepResult(namedtuple("SweepResult", ["solutions", "solves", "skipped", "warm_started"])):
+    """Soluções da varredura (na ordem dos cenários) e contadores.
+
+    ``solves`` conta as chamadas ao modelo, ``skipped`` os pontos preenchidos
+    sem resolver e ``warm_started`` as resoluções que partiram da solução vizinha.
+    """
+
+    __slots__ = ()
+
+    def profits(self, default=0):
+        """Lucro ótimo por ponto, com ``default`` onde não há solução ótima."""
+        return [s.objective if s.status == OPTIMAL else default for s in self.solutions]
+
+    def summary(self):
+        return (f"{len(self.solutions)} pontos: {self.solves} resolvidos "
+                f"({self.warm_started} com solução inicial), {self.skipped} sem resolver")
+
+
+def feasible_region(scenario):
+    """Restrições e limites do cenário, sem o orçamento quando ele nunca limita."""
+    rows = scenario.constraint_rows()
+    if budget_is_redundant(scenario):
+        rows = [row for row in rows if row[0] != "infrastructure_budget"]
+    return rows, tuple(scenario.lower_bounds), tuple(scenario.upper_bounds)
+
+
+def is_feasible(scenario, quantities):
+    """Verifica se as quantidades respeitam os limites e as restrições do cenário."""
+    for quantity, low, up in zip(quantities, scenario.lower_bounds, scenario.upper_bounds):
+        if (low is not None and quantity < low - _EPS) or (up is not None and quantity > up + _EPS):
+            return False
+    return all(
+        sum(a * q for a, q in zip(row, quantities)) <= rhs + _EPS
+        for _, row, rhs in scenario.constraint_rows()
+    )
+
+
+def _between(coefficients, first, last):
+    # O objetivo está no segmento entre os objetivos dos extremos?
+    direction = last - first
+    span = np.dot(direction, direction)
+    if span == 0:
+        return np.allclose(coefficients, first)
+    t = np.dot(coefficients - first, direction) / span
+    return -_EPS <= t <= 1 + _EPS and np.allclose(coefficients, first + t * direction)
+
+
+def _objective(scenario, quantities):
+    return float(sum(c * q for c, q in zip(scenario.objective_coefficients(), quantities)))
+
+
+def sweep(scenarios, model=None):
+    """Resolve a sequência de cenários de uma varredura; retorna um ``SweepResult``.
+
+    ``model`` é um ``PricingModel`` (por padrão, com o CBC); o warm start só é
+    usado se o solver do modelo aceitar a opção ``warmStart``.
+    """
+    model = model if model is not None else PricingModel(solver=PULP_CBC_CMD(msg=False))
+    count = len(scenarios)
+    solutions = [None] * count
+    regions = [feasible_region(scenario) for scenario in scenarios]
+    objectives = [np.array(scenario.objective_coefficients()) for scenario in scenarios]
+    solves = skipped = warm_started = 0
+
+    def solve_at(index, neighbour):
+        nonlocal solves, warm_started
+        initial = None
+        if neighbour is not None and solutions[neighbour].status == OPTIMAL:
+            if is_feasible(scenarios[index], solutions[neighbour].quantities):
+                initial = solutions[neighbour].quantities
+                warm_started += 1
+        solutions[index] = model.solve(scenarios[index], initial=initial)
+        solves += 1
+
+    if count == 0:
+        return SweepResult(solutions, 0, 0, 0)
+    solve_at(0, None)
+    if count > 1:
+        solve_at(count - 1, 0)
+
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        at_first, at_last = solutions[first], solutions[last]
+        inside = range(first + 1, last)
+        same_region = all(regions[k] == regions[first] for k in (*inside, last))
+        if same_region and at_first.status == at_last.status == INFEASIBLE:
+            # A viabilidade não depende do objetivo
+            for k in inside:
+                solutions[k] = Solution(INFEASIBLE, None, None)
+            skipped += len(inside)
+            continue
+        if (
+            same_region
+            and at_first.status == at_last.status == OPTIMAL
+            and at_first.quantities == at_last.quantities
+            and all(_between(objectives[k], objectives[first], objectives[last]) for k in inside)
+        ):
+            for k in inside:
+                solutions[k] = Solution(OPTIMAL, _objective(scenarios[k], at_first.quantities), at_first.quantities)
+            skipped += len(inside)
+            continue
+        middle = (first + last) // 2
+        solve_at(middle, first if middle - first <= last - middle else last)
+        stack.append((middle, last))
+        stack.append((first, middle))
+
+    return SweepResult(solutions, solves, skipped, warm_started)
@@ -0,0 +1,218 @@
+"""Solver exato em NumPy para o modelo de três pacotes, sem chamar o CBC.
+
+Como as restrições têm coeficientes não negativos, cada variável fica limitada
+pela capacidade restante. Duas variáveis são enumeradas na rede de inteiros
+viáveis e a terceira é resolvida em forma fechada (no limite superior
+implícito se o coeficiente do objetivo for positivo, senão no limite inferior).
+Todos os cenários de um lote são avaliados de uma vez com broadcasting.
+
+O valor ótimo coincide com o do CBC; em caso de empate entre soluções com o
+mesmo lucro, as quantidades podem ser outra solução ótima.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from Solver_Model import INFEASIBLE, OPTIMAL, UNBOUNDED, Solution
+
+# Resultado de um lote: status (PuLP), objetivo (NaN sem solução ótima) e quantidades
+BatchResult = namedtuple("BatchResult", ["status", "objectives", "quantities"])
+
+_EPS = 1e-9
+
+
+def scenario_arrays(scenarios):
+    """Empilha os cenários em arrays (objetivo, linhas, lado direito, limite inferior, limite superior).
+
+    Sem orçamento de infraestrutura a terceira linha fica zerada com lado direito infinito.
+    """
+    count = len(scenarios)
+    objective = np.empty((count, 3))
+    rows = np.zeros((count, 3, 3))
+    rhs = np.full((count, 3), np.inf)
+    lower = np.empty((count, 3))
+    upper = np.empty((count, 3))
+    for n, scenario in enumerate(scenarios):
+        objective[n] = scenario.objective_coefficients()
+        for r, (_, row, capacity) in enumerate(scenario.constraint_rows()):
+            rows[n, r] = row
+            rhs[n, r] = capacity
+        lower[n] = [-np.inf if low is None else low for low in scenario.lower_bounds]
+        upper[n] = [np.inf if up is None else up for up in scenario.upper_bounds]
+    return objective, rows, rhs, lower, upper
+
+
+def implied_upper(rows, rhs, lower, upper):
+    """Limite superior de cada variável dado que as outras ficam no limite inferior."""
+    upper = upper.copy()
+    for j in range(3):
+        others = np.delete(np.arange(3), j)
+        used = np.einsum("nrk,nk->nr", rows[:, :, others], lower[:, others])
+        coefficient = rows[:, :, j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            room = np.where(coefficient > 0, (rhs - used) / coefficient, np.inf)
+        upper[:, j] = np.minimum(upper[:, j], np.floor(room.min(axis=1) + _EPS))
+    return upper
+
+
+def _solve_chunk(objective, rows, rhs, lower, upper, free):
+    count = len(objective)
+    status = np.full(count, OPTIMAL, dtype=np.int8)
+    objectives = np.full(count, np.nan)
+    quantities = np.full((count, 3), np.nan)
+
+    # Inviável quando os limites se cruzam ou o canto inferior já estoura alguma capacidade
+    infeasible = (lower > upper).any(axis=1)
+    infeasible |= (np.einsum("nrk,nk->nr", rows, lower) > rhs + _EPS).any(axis=1)
+    unbounded = ((objective > 0) & np.isinf(upper)).any(axis=1) & ~infeasible
+    status[infeasible] = INFEASIBLE
+    status[unbounded] = UNBOUNDED
+    active = ~(infeasible | unbounded)
+    if not active.any():
+        return BatchResult(status, objectives, quantities)
+
+    objective, rows, rhs = objective[active], rows[active], rhs[active]
+    lower, upper = lower[active], upper[active]
+
+    # Variáveis com coeficiente não positivo ficam no limite inferior (aumentá-las só consome capacidade)
+    upper = np.where(objective > 0, upper, lower)
+    first, second = [j for j in range(3) if j != free]
+    size_first = int((upper[:, first] - lower[:, first]).max()) + 1
+    size_second = int((upper[:, second] - lower[:, second]).max()) + 1
+
+    x_first = lower[:, first, None, None] + np.arange(size_first)[None, :, None]
+    x_second = lower[:, second, None, None] + np.arange(size_second)[None, None, :]
+    valid = (x_first <= upper[:, first, None, None]) & (x_second <= upper[:, second, None, None])
+
+    # Capacidade restante para a variável resolvida em forma fechada
+    room = rhs[:, :, None, None] - rows[:, :, first, None, None] * x_first[:, None] - rows[:, :, second, None, None] * x_second[:, None]
+    coefficient = rows[:, :, free, None, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limit = np.where(coefficient > 0, room / coefficient, np.where(room >= -_EPS, np.inf, -np.inf))
+    x_free_max = np.minimum(np.floor(limit.min(axis=1) + _EPS), upper[:, free, None, None])
+    x_free = np.where(objective[:, free, None, None] > 0, x_free_max, lower[:, free, None, None])
+    valid &= x_free >= lower[:, free, None, None]
+    valid &= x_free <= x_free_max
+
+    values = np.empty(valid.shape)
+    values[:] = objective[:, first, None, None] * x_first
+    values += objective[:, second, None, None] * x_second
+    values += objective[:, free, None, None] * x_free
+    values = np.where(valid, values, -np.inf).reshape(len(values), -1)
+
+    best = values.argmax(axis=1)
+    best_value = values[np.arange(len(values)), best]
+    found = np.isfinite(best_value)
+    best_first, best_second = np.unravel_index(best, (size_first, size_second))
+    chosen = np.empty((len(values), 3))
+    chosen[:, first] = lower[:, first] + best_first
+    chosen[:, second] = lower[:, second] + best_second
+    chosen[:, free] = x_free.reshape(len(values), -1)[np.arange(len(values)), best]
+
+    index = np.flatnonzero(active)
+    status[index[~found]] = INFEASIBLE
+    objectives[index[found]] = (objective * chosen).sum(axis=1)[found]
+    quantities[index[found]] = chosen[found]
+    return BatchResult(status, objectives, quantities)
+
+
+def solve_arrays(objective, rows, rhs, lower, upper, max_elements=2_000_000):
+    """Resolve um lote descrito por arrays, com broadcasting nas dimensões iniciais.
+
+    Formas: ``objective``, ``lower`` e ``upper`` (..., 3); ``rows`` (..., R, 3);
+    ``rhs`` (..., R). Limites ``-inf``/``inf`` indicam variável sem limite. O
+    resultado tem a forma das dimensões iniciais (mais 3 nas quantidades).
+    """
+    objective = np.asarray(objective, dtype=float)
+    rows = np.asarray(rows, dtype=float)
+    rhs = np.asarray(rhs, dtype=float)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    if (rows < 0).any():
+        raise ValueError("O solver vetorizado exige coeficientes de restrição não negativos")
+    if not np.isfinite(lower).all():
+        raise ValueError("O solver vetorizado exige limites inferiores finitos")
+
+    shape = np.broadcast_shapes(
+        objective.shape[:-1], rows.shape[:-2], rhs.shape[:-1], lower.shape[:-1], upper.shape[:-1]
+    )
+    row_count = rows.shape[-2]
+    objective = np.broadcast_to(objective, shape + (3,)).reshape(-1, 3)
+    rows = np.broadcast_to(rows, shape + (row_count, 3)).reshape(-1, row_count, 3)
+    rhs = np.broadcast_to(rhs, shape + (row_count,)).reshape(-1, row_count)
+    lower = np.ceil(np.broadcast_to(lower, shape + (3,)).reshape(-1, 3) - _EPS)
+    upper = np.floor(np.broadcast_to(upper, shape + (3,)).reshape(-1, 3) + _EPS)
+
+    count = len(objective)
+    status = np.empty(count, dtype=np.int8)
+    objectives = np.empty(count)
+    quantities = np.empty((count, 3))
+    if count == 0:
+        return BatchResult(status.reshape(shape), objectives.reshape(shape), quantities.reshape(shape + (3,)))
+
+    # Enumera as duas variáveis de menor faixa; a de maior faixa é resolvida em forma fechada
+    implied = implied_upper(rows, rhs, lower, upper)
+    bounded = np.isfinite(implied) & np.isfinite(lower) & (implied >= lower)
+    span = np.where(bounded & (objective > 0), implied - lower + 1, 1)
+    free = int(np.argmax(span.max(axis=0)))
+    enumerated = np.prod(np.delete(span, free, axis=1).max(axis=0))
+    chunk = max(1, int(max_elements // max(enumerated, 1)))
+
+    for start in range(0, count, chunk):
+        part = slice(start, start + chunk)
+        result = _solve_chunk(objective[part], rows[part], rhs[part], lower[part], implied[part], free)
+        status[part], objectives[part], quantities[part] = result
+
+    return BatchResult(status.reshape(shape), objectives.reshape(shape), quantities.reshape(shape + (3,)))
+
+
+def solve_batch(scenarios, max_elements=2_000_000):
+    """Resolve uma lista de ``Scenario`` de uma vez; retorna um ``BatchResult``."""
+    return solve_arrays(*scenario_arrays(scenarios), max_elements=max_elements)
+
+
+def solve(scenario):
+    """Resolve um único cenário; mesma interface de ``PricingModel.solve``."""
+    result = solve_batch([scenario])
+    if result.status[0] != OPTIMAL:
+        return Solution(int(result.status[0]), None, None)
+    return Solution(OPTIMAL, float(result.objectives[0]), tuple(float(q) for q in result.quantities[0]))
+
+
+if __name__ == "__main__":
+    import time
+
+    from Solver_Model import PricingModel, Scenario
+
+    # Grade preço base x custo de infraestrutura base (Find_Best_Solution_Multiplot_compare.py)
+    # resolvida por broadcasting e conferida ponto a ponto com o CBC
+    base_prices = np.arange(50, 201, 10)
+    infrastructure_costs = np.arange(50, 201, 10)
+    scenario = Scenario()
+    price_factors = np.array([1, 2, 3])
+    cost_factors = np.array([1, 1.5, 2])
+    prices = base_prices[:, None, None] * price_factors
+    costs = infrastructure_costs[None, :, None] * cost_factors
+    rows = np.array([scenario.process, scenario.drive, np.zeros(3)])
+    rows = np.broadcast_to(rows, costs.shape[:2] + (3, 3)).copy()
+    rows[..., 2, :] = costs
+    rhs = [scenario.processing_capacity, scenario.storage_capacity, scenario.infrastructure_budget]
+
+    start = time.perf_counter()
+    grid = solve_arrays(prices - costs, rows, rhs, [30, 0, 0], [np.inf, np.inf, 15])
+    vectorized_time = time.perf_counter() - start
+
+    template = PricingModel()
+    start = time.perf_counter()
+    mismatches = 0
+    for i, base_price in enumerate(base_prices):
+        for j, base_infrastructure_cost in enumerate(infrastructure_costs):
+            solution = template.solve(Scenario.from_base(base_price, base_infrastructure_cost))
+            if solution.status != grid.status[i, j] or (
+                solution.status == OPTIMAL and solution.objective != grid.objectives[i, j]
+            ):
+                mismatches += 1
+    cbc_time = time.perf_counter() - start
+
+    print(f"Pontos: {grid.status.size}, divergências em relação ao CBC: {mismatches}")
+    print(f"NumPy: {vectorized_time:.4f} s, CBC: {cbc_time:.4f} s")